@@ -9,13 +9,9 @@ This example demonstrates how to:
 4. Get remediation recommendations
 """
 
-import asyncio
 from datetime import datetime
 
-# Import Kratos components
-import sys
-sys.path.insert(0, "../src")
-
+# Import Kratos components (install the package first: pip install -e .)
 from core.types import (
     Incident,
     IncidentType,
@@ -26,7 +22,7 @@ from core.types import (
 from core.brain import KratosBrain, KratosMode
 
 
-async def main():
+def main():
     # Initialize Kratos Brain in recommendation mode
     print("Initializing Kratos Brain...")
     brain = KratosBrain(mode=KratosMode.RECOMMEND)
@@ -108,4 +104,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -0,0 +1,130 @@
+"""In-process watch caches for Kubernetes resources
+
+Each cache does one LIST, then follows a long-lived WATCH and applies the
+deltas to a local dict, so handlers can read cluster state without a round
+trip to the apiserver (the informer pattern).
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+import threading
+
+import orjson
+
+try:
+    from kubernetes import watch
+    from kubernetes.client.rest import ApiException
+except ImportError:  # only needed once a cache is started
+    watch = ApiException = None
+
+logger = logging.getLogger(__name__)
+
+
+def list_raw(list_fn: Callable, **kwargs) -> Dict[str, Any]:
+    """Call a kubernetes list API and decode the JSON body as plain dicts.
+    
+    Skips building a V1Pod/V1Event model tree for every item, which dominates
+    CPU on large clusters when handlers only read a few fields.
+    """
+    response = list_fn(_preload_content=False, **kwargs)
+    return orjson.loads(response.data)
+
+
+def _is_expired(error: Exception) -> bool:
+    """True if a watch failed because its resourceVersion is gone (HTTP 410)"""
+    return isinstance(error, ApiException) and error.status == 410
+
+
+class WatchCache:
+    """LIST + WATCH mirror of one resource kind, keyed by (namespace, name)."""
+    
+    def __init__(
+        self,
+        name: str,
+        list_fn: Callable,
+        watch_timeout_seconds: int = 300,
+        retry_delay_seconds: float = 5.0,
+    ):
+        self.name = name
+        self.list_fn = list_fn
+        self.watch_timeout_seconds = watch_timeout_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        
+        self.synced = False
+        self._items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=f"watch-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self.synced = False
+    
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Return the cached objects as a list, safe to iterate from another thread"""
+        with self._lock:
+            return list(self._items.values())
+    
+    @staticmethod
+    def _key(obj: Dict[str, Any]) -> Tuple[str, str]:
+        metadata = obj["metadata"]
+        return metadata.get("namespace", ""), metadata["name"]
+    
+    def _relist(self) -> str:
+        """Replace the cache contents with a fresh LIST; returns its resourceVersion"""
+        data = list_raw(self.list_fn)
+        items = {self._key(obj): obj for obj in data["items"]}
+        with self._lock:
+            self._items = items
+        self.synced = True
+        return data["metadata"]["resourceVersion"]
+    
+    def _apply(self, event_type: str, obj: Dict[str, Any]):
+        key = self._key(obj)
+        with self._lock:
+            if event_type == "DELETED":
+                self._items.pop(key, None)
+            else:
+                self._items[key] = obj
+    
+    def _run(self):
+        resource_version = None
+        while not self._stop.is_set():
+            try:
+                if resource_version is None:
+                    resource_version = self._relist()
+                
+                stream = watch.Watch()
+                for event in stream.stream(
+                    self.list_fn,
+                    resource_version=resource_version,
+                    timeout_seconds=self.watch_timeout_seconds,
+                    allow_watch_bookmarks=True,
+                    deserialize=False,
+                ):
+                    if self._stop.is_set():
+                        stream.stop()
+                        break
+                    obj = event["object"]
+                    if event["type"] == "ERROR":
+                        # obj is a Status, not a resource; it has no resourceVersion.
+                        # 410 Gone means the version was compacted away: relist
+                        raise ApiException(status=obj.get("code"), reason=obj.get("message"))
+                    resource_version = obj["metadata"]["resourceVersion"]
+                    if event["type"] != "BOOKMARK":
+                        self._apply(event["type"], obj)
+            except Exception as e:
+                # Any failure, expected or not, restarts from a fresh LIST
+                resource_version = None
+                if _is_expired(e):
+                    logger.info(f"Watch for {self.name} expired, relisting")
+                    continue
+                logger.warning(f"Watch for {self.name} failed, relisting: {e}")
+                self.synced = False
+                self._stop.wait(self.retry_delay_seconds)
@@ -0,0 +1,34 @@
+"""Client-side rate limiting for calls to the Kubernetes API"""
+
+import asyncio
+import time
+
+
+class AsyncRateLimiter:
+    """Token bucket allowing `rate` acquisitions per second and bursts up to `burst`.
+    
+    Meant to be used from a single event loop: `async with limiter: ...`
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+    
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
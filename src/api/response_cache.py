@@ -0,0 +1,47 @@
+"""Short-TTL response cache for polled API endpoints"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import asyncio
+import time
+
+
+class ResponseCache:
+    """Caches handler results for a few seconds and collapses concurrent misses.
+    
+    While a fetch for a key is in flight, other callers await the same task
+    instead of starting their own (singleflight). Failures are not cached.
+    """
+    
+    def __init__(self, ttl_seconds: float = 2.0, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+    
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._store(key, t))
+        # shield: one caller disconnecting must not cancel the shared fetch
+        return await asyncio.shield(task)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def _store(self, key: Hashable, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            if len(self._entries) >= self.max_entries:
+                return
+        self._entries[key] = (now + self.ttl_seconds, task.result())
@@ -1,15 +1,55 @@
 """FastAPI routes for Kratos AI"""
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 from typing import Any, Dict, List, Optional
+from collections import Counter, deque
 from datetime import datetime
+from itertools import islice
+from pathlib import Path
+import asyncio
+import functools
+import heapq
 import logging
+import operator
+import os
+import re
+import threading
+import time
+
+import orjson
+
+try:
+    from kubernetes import client, config
+    from urllib3.util.retry import Retry
+    _KUBE_AVAILABLE = True
+except ImportError:  # prediction and learning routes work without a cluster client
+    _KUBE_AVAILABLE = False
+
+from api.kube_cache import WatchCache, list_raw
+from api.rate_limit import AsyncRateLimiter
+from api.response_cache import ResponseCache
+from core.brain import KratosBrain, KratosMode
+from core.types import (
+    Incident,
+    IncidentSeverity,
+    IncidentType,
+    KubernetesResource,
+    ResourceMetrics,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/kratos", tags=["Kratos AI"])
 
+# Value -> member lookups so unknown inputs fall back without raising
+_INCIDENT_TYPE_MAP = {m.value: m for m in IncidentType}
+_SEVERITY_MAP = {m.value: m for m in IncidentSeverity}
+
+# Fetches the fields /predictions/active needs in one C-level call per item
+_PRED_GETTER = operator.attrgetter("id", "incident_type", "probability", "target_resource", "eta_minutes")
+
 
 class MetricsInput(BaseModel):
     resource_name: str
@@ -20,7 +60,12 @@ class MetricsInput(BaseModel):
     memory_limit_bytes: int
 
 
+# Response models are filled from trusted server-side values, so handlers
+# build them with model_construct() and skip a redundant validation pass.
+# strict=True keeps the response-side check to plain type tests, no coercion.
 class PredictionResponse(BaseModel):
+    model_config = ConfigDict(strict=True)
+    
     predicted: bool
     probability: float
     incident_type: str
@@ -47,6 +92,8 @@ class RemediationApproval(BaseModel):
 
 
 class StatusResponse(BaseModel):
+    model_config = ConfigDict(strict=True)
+    
     mode: str
     is_running: bool
     total_incidents: int
@@ -57,6 +104,8 @@ class StatusResponse(BaseModel):
 
 
 class ClusterHealthResponse(BaseModel):
+    model_config = ConfigDict(strict=True)
+    
     total_nodes: int
     ready_nodes: int
     total_pods: int
@@ -66,42 +115,139 @@ class ClusterHealthResponse(BaseModel):
     namespaces: List[str]
 
 
-# Global brain instance
-_brain = None
-_k8s_client = None
+class IncidentRecordedResponse(BaseModel):
+    model_config = ConfigDict(strict=True)
+    
+    status: str
+    incident_id: str
+
+
+@functools.lru_cache(maxsize=1)
+def get_kube_apis():
+    """Load kubeconfig once and return (CoreV1Api, AppsV1Api) sharing one connection pool.
+    
+    Failures are not cached, so a missing kubeconfig is retried on the next call.
+    """
+    if not _KUBE_AVAILABLE:
+        raise RuntimeError("kubernetes package is not installed")
+    # Load kubeconfig from default location
+    config.load_kube_config()
+    configuration = client.Configuration.get_default_copy()
+    # Back off on apiserver throttling (429) and brief unavailability (503),
+    # honouring Retry-After; the final response still surfaces as ApiException.
+    configuration.retries = Retry(
+        total=5,
+        backoff_factor=0.3,
+        status_forcelist=[429, 503],
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    api_client = client.ApiClient(configuration)
+    logger.info("Kubernetes client initialized successfully")
+    return client.CoreV1Api(api_client), client.AppsV1Api(api_client)
+
+
+# Cap the request rate this process puts on the apiserver, independent of how
+# many handlers are calling it concurrently.
+_K8S_QPS = 20
+_K8S_BURST = 40
+_k8s_limiter = AsyncRateLimiter(rate=_K8S_QPS, burst=_K8S_BURST)
+
+
+async def _kube_call(fn, *args, **kwargs):
+    """Run a blocking kubernetes client call in a worker thread, rate limited"""
+    async with _k8s_limiter:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+def _require_kube():
+    """Fail cluster endpoints with 503 up front when the kubernetes package is missing"""
+    if not _KUBE_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Kubernetes client is not available")
 
 
 def get_k8s_client():
-    global _k8s_client
-    if _k8s_client is None:
-        try:
-            from kubernetes import client, config
-            # Load kubeconfig from default location
-            config.load_kube_config()
-            _k8s_client = client.AppsV1Api()
-            logger.info("Kubernetes client initialized successfully")
-        except Exception as e:
-            logger.warning(f"Failed to initialize K8s client: {e}")
-            _k8s_client = None
-    return _k8s_client
+    if not _KUBE_AVAILABLE:
+        return None
+    try:
+        return get_kube_apis()[1]
+    except Exception as e:
+        logger.warning(f"Failed to initialize K8s client: {e}")
+        return None
+
+
+# Dashboards poll these endpoints from many tabs; identical requests within
+# the TTL share one result, and concurrent misses share one fetch.
+_response_cache = ResponseCache(ttl_seconds=2.0)
+
+# Watch-backed caches for the read-only cluster endpoints, keyed by kind
+_watch_caches: Dict[str, WatchCache] = {}
+
+
+def start_watch_caches():
+    """Start LIST+WATCH caches for nodes, pods, namespaces and events"""
+    if _watch_caches or not _KUBE_AVAILABLE:
+        return
+    try:
+        v1, _ = get_kube_apis()
+    except Exception as e:
+        logger.warning(f"Watch caches disabled, cluster endpoints will list on demand: {e}")
+        return
+    for kind, list_fn in (
+        ("nodes", v1.list_node),
+        ("pods", v1.list_pod_for_all_namespaces),
+        ("namespaces", v1.list_namespace),
+        ("events", v1.list_event_for_all_namespaces),
+    ):
+        cache = WatchCache(kind, list_fn)
+        cache.start()
+        _watch_caches[kind] = cache
+
+
+def stop_watch_caches():
+    for cache in _watch_caches.values():
+        cache.stop()
+    _watch_caches.clear()
+
+
+async def _list_items(kind: str, list_fn, **kwargs) -> List[Dict[str, Any]]:
+    """Raw items from the watch cache once it has synced, else from a direct LIST.
+    
+    A namespace kwarg also filters cached items; other kwargs (e.g. limit)
+    only apply to the direct LIST.
+    """
+    cache = _watch_caches.get(kind)
+    if cache is not None and cache.synced:
+        items = cache.snapshot()
+        namespace = kwargs.get("namespace")
+        if namespace:
+            items = [item for item in items if item["metadata"].get("namespace") == namespace]
+        return items
+    return (await _kube_call(list_raw, list_fn, **kwargs))["items"]
+
+
+def build_brain() -> KratosBrain:
+    """Construct the KratosBrain; called once from the app lifespan."""
+    k8s_client = get_k8s_client()
+    brain = KratosBrain(k8s_client=k8s_client, mode=KratosMode.RECOMMEND)
+    logger.info(f"KratosBrain initialized with k8s_client={k8s_client is not None}")
+    return brain
 
 
-def get_brain():
-    global _brain
-    if _brain is None:
-        from core.brain import KratosBrain, KratosMode
-        k8s_client = get_k8s_client()
-        _brain = KratosBrain(k8s_client=k8s_client, mode=KratosMode.RECOMMEND)
-        logger.info(f"KratosBrain initialized with k8s_client={k8s_client is not None}")
-    return _brain
+def get_brain(request: Request) -> KratosBrain:
+    """FastAPI dependency returning the brain built at startup."""
+    return request.app.state.brain
 
 
 @router.get("/status", response_model=StatusResponse)
-async def get_status():
+async def get_status(brain=Depends(get_brain)):
     """Get Kratos AI system status"""
-    brain = get_brain()
+    return await _response_cache.get_or_fetch("status", functools.partial(_fetch_status, brain))
+
+
+async def _fetch_status(brain) -> StatusResponse:
     status = brain.get_status()
-    return StatusResponse(
+    return StatusResponse.model_construct(
         mode=status.mode.value,
         is_running=status.is_running,
         total_incidents=status.knowledge_stats.get("total_incidents", 0),
@@ -115,33 +261,42 @@ async def get_status():
 @router.get("/cluster/health", response_model=ClusterHealthResponse)
 async def get_cluster_health():
     """Get Kubernetes cluster health"""
+    _require_kube()
+    return await _response_cache.get_or_fetch("cluster/health", _fetch_cluster_health)
+
+
+async def _fetch_cluster_health() -> ClusterHealthResponse:
+    # The kubernetes client is synchronous; its calls run in worker threads so
+    # the event loop keeps serving other requests while they are in flight.
     try:
-        from kubernetes import client, config
-        config.load_kube_config()
+        v1, _ = get_kube_apis()
         
-        v1 = client.CoreV1Api()
-        
-        # Get nodes
-        nodes = v1.list_node()
-        total_nodes = len(nodes.items)
-        ready_nodes = sum(
-            1 for node in nodes.items
-            for condition in node.status.conditions
-            if condition.type == "Ready" and condition.status == "True"
+        # The three lists are independent; fetch them concurrently
+        nodes, pods, namespaces = await asyncio.gather(
+            _list_items("nodes", v1.list_node),
+            _list_items("pods", v1.list_pod_for_all_namespaces),
+            _list_items("namespaces", v1.list_namespace),
         )
         
-        # Get pods
-        pods = v1.list_pod_for_all_namespaces()
-        total_pods = len(pods.items)
-        running_pods = sum(1 for pod in pods.items if pod.status.phase == "Running")
-        pending_pods = sum(1 for pod in pods.items if pod.status.phase == "Pending")
-        failed_pods = sum(1 for pod in pods.items if pod.status.phase == "Failed")
+        total_nodes = len(nodes)
+        ready_nodes = 0
+        for node in nodes:
+            for condition in node["status"].get("conditions") or ():
+                if condition["type"] == "Ready":
+                    if condition["status"] == "True":
+                        ready_nodes += 1
+                    break
+        
+        # Count every pod phase in a single pass
+        total_pods = len(pods)
+        phase_counts = Counter(pod["status"].get("phase") for pod in pods)
+        running_pods = phase_counts["Running"]
+        pending_pods = phase_counts["Pending"]
+        failed_pods = phase_counts["Failed"]
         
-        # Get namespaces
-        namespaces = v1.list_namespace()
-        namespace_names = [ns.metadata.name for ns in namespaces.items]
+        namespace_names = [ns["metadata"]["name"] for ns in namespaces]
         
-        return ClusterHealthResponse(
+        return ClusterHealthResponse.model_construct(
             total_nodes=total_nodes,
             ready_nodes=ready_nodes,
             total_pods=total_pods,
@@ -158,33 +313,39 @@ async def get_cluster_health():
 @router.get("/cluster/pods")
 async def get_cluster_pods(namespace: Optional[str] = None):
     """Get pods with their status"""
+    _require_kube()
+    return await _response_cache.get_or_fetch(
+        ("cluster/pods", namespace), functools.partial(_fetch_cluster_pods, namespace)
+    )
+
+
+async def _fetch_cluster_pods(namespace: Optional[str]) -> ORJSONResponse:
     try:
-        from kubernetes import client, config
-        config.load_kube_config()
-        
-        v1 = client.CoreV1Api()
+        v1, _ = get_kube_apis()
         
         if namespace:
-            pods = v1.list_namespaced_pod(namespace=namespace)
+            pods = await _list_items("pods", v1.list_namespaced_pod, namespace=namespace)
         else:
-            pods = v1.list_pod_for_all_namespaces()
+            pods = await _list_items("pods", v1.list_pod_for_all_namespaces)
         
         pod_list = []
-        for pod in pods.items:
-            restart_count = 0
-            if pod.status.container_statuses:
-                restart_count = sum(cs.restart_count for cs in pod.status.container_statuses)
+        for pod in pods:
+            metadata = pod["metadata"]
+            status = pod["status"]
+            restart_count = sum(cs.get("restartCount", 0) for cs in status.get("containerStatuses") or ())
             
             pod_list.append({
-                "name": pod.metadata.name,
-                "namespace": pod.metadata.namespace,
-                "status": pod.status.phase,
+                "name": metadata["name"],
+                "namespace": metadata["namespace"],
+                "status": status.get("phase"),
                 "restarts": restart_count,
-                "age": pod.metadata.creation_timestamp.isoformat() if pod.metadata.creation_timestamp else None,
-                "node": pod.spec.node_name,
+                "age": metadata.get("creationTimestamp"),
+                "node": pod["spec"].get("nodeName"),
             })
         
-        return {"count": len(pod_list), "pods": pod_list}
+        # Large list payloads go out as ORJSONResponse so FastAPI skips its
+        # jsonable_encoder walk; cached responses are reused already rendered
+        return ORJSONResponse({"count": len(pod_list), "pods": pod_list})
     except Exception as e:
         logger.error(f"Failed to get pods: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -193,66 +354,76 @@ async def get_cluster_pods(namespace: Optional[str] = None):
 @router.get("/cluster/events")
 async def get_cluster_events(limit: int = 50):
     """Get recent cluster events (warnings, errors)"""
+    _require_kube()
+    return await _response_cache.get_or_fetch(
+        ("cluster/events", limit), functools.partial(_fetch_cluster_events, limit)
+    )
+
+
+async def _fetch_cluster_events(limit: int) -> ORJSONResponse:
     try:
-        from kubernetes import client, config
-        config.load_kube_config()
+        v1, _ = get_kube_apis()
+        events = await _list_items("events", v1.list_event_for_all_namespaces, limit=limit)
         
-        v1 = client.CoreV1Api()
-        events = v1.list_event_for_all_namespaces(limit=limit)
+        # Compute each sort key once, then take the newest `limit` in O(N log limit)
+        keyed = [(event.get("lastTimestamp") or event.get("eventTime") or "", event) for event in events]
         
         event_list = []
-        for event in sorted(events.items, key=lambda x: x.last_timestamp or x.event_time or datetime.min, reverse=True):
+        for last_seen, event in heapq.nlargest(limit, keyed, key=operator.itemgetter(0)):
+            involved_object = event.get("involvedObject") or {}
             event_list.append({
-                "type": event.type,
-                "reason": event.reason,
-                "message": event.message,
-                "namespace": event.metadata.namespace,
-                "object": f"{event.involved_object.kind}/{event.involved_object.name}",
-                "count": event.count,
-                "last_seen": (event.last_timestamp or event.event_time).isoformat() if (event.last_timestamp or event.event_time) else None,
+                "type": event.get("type"),
+                "reason": event.get("reason"),
+                "message": event.get("message"),
+                "namespace": event["metadata"].get("namespace"),
+                "object": f"{involved_object.get('kind')}/{involved_object.get('name')}",
+                "count": event.get("count"),
+                "last_seen": last_seen or None,
             })
         
-        return {"count": len(event_list), "events": event_list[:limit]}
+        return ORJSONResponse({"count": len(event_list), "events": event_list})
     except Exception as e:
         logger.error(f"Failed to get events: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/predict", response_model=PredictionResponse)
-async def predict_failure(metrics: MetricsInput):
-    """Predict potential failures based on current metrics"""
-    brain = get_brain()
-    
-    from core.types import KubernetesResource, ResourceMetrics
-    
+def _to_resource_and_metrics(metrics: MetricsInput):
+    """Map a MetricsInput payload onto core resource/metrics types"""
     resource = KubernetesResource(
         kind="Pod",
         name=metrics.resource_name,
         namespace=metrics.namespace,
     )
     
+    # Requests are assumed to be half the limits
+    cpu_limit = metrics.cpu_limit_cores
+    memory_limit = metrics.memory_limit_bytes
     resource_metrics = ResourceMetrics(
         cpu_usage_cores=metrics.cpu_usage_cores,
-        cpu_limit_cores=metrics.cpu_limit_cores,
-        cpu_request_cores=metrics.cpu_limit_cores * 0.5,
+        cpu_limit_cores=cpu_limit,
+        cpu_request_cores=cpu_limit * 0.5,
         memory_usage_bytes=metrics.memory_usage_bytes,
-        memory_limit_bytes=metrics.memory_limit_bytes,
-        memory_request_bytes=int(metrics.memory_limit_bytes * 0.5),
+        memory_limit_bytes=memory_limit,
+        memory_request_bytes=memory_limit >> 1,
     )
-    
-    prediction = brain.predict_for_resource(resource, resource_metrics)
+    return resource, resource_metrics
+
+
+def _build_prediction_response(brain, resource, prediction) -> PredictionResponse:
+    """Attach a recommendation to positive predictions and build the response"""
+    predicted = prediction.probability > 0.5
     
     recommended_action = None
     explanation = None
     
-    if prediction.probability > 0.5:
+    if predicted:
         plan = brain.get_recommendations(resource, prediction)
         recommended_action = plan.remediation.action.value
         if plan.remediation.explanation:
             explanation = plan.remediation.explanation.to_human_readable()
     
-    return PredictionResponse(
-        predicted=prediction.probability > 0.5,
+    return PredictionResponse.model_construct(
+        predicted=predicted,
         probability=prediction.probability,
         incident_type=prediction.incident_type.value,
         eta_minutes=prediction.eta_minutes,
@@ -263,22 +434,34 @@ async def predict_failure(metrics: MetricsInput):
     )
 
 
-@router.post("/incidents")
-async def record_incident(incident: IncidentInput, background_tasks: BackgroundTasks):
+@router.post("/predict", response_model=PredictionResponse)
+async def predict_failure(metrics: MetricsInput, brain=Depends(get_brain)):
+    """Predict potential failures based on current metrics"""
+    resource, resource_metrics = _to_resource_and_metrics(metrics)
+    prediction = await brain.predict(resource, resource_metrics)
+    return _build_prediction_response(brain, resource, prediction)
+
+
+@router.post("/predict/batch", response_model=List[PredictionResponse])
+async def predict_failure_batch(batch: List[MetricsInput], brain=Depends(get_brain)):
+    """Predict potential failures for many resources in one request"""
+    items = [_to_resource_and_metrics(metrics) for metrics in batch]
+    predictions = brain.predict_for_resources(items)
+    return [
+        _build_prediction_response(brain, resource, prediction)
+        for (resource, _), prediction in zip(items, predictions)
+    ]
+
+
+@router.post("/incidents", response_model=IncidentRecordedResponse)
+async def record_incident(
+    incident: IncidentInput,
+    background_tasks: BackgroundTasks,
+    brain=Depends(get_brain),
+):
     """Record a new incident for learning"""
-    brain = get_brain()
-    
-    from core.types import Incident, IncidentType, IncidentSeverity, KubernetesResource
-    
-    try:
-        incident_type = IncidentType(incident.type)
-    except ValueError:
-        incident_type = IncidentType.UNKNOWN
-    
-    try:
-        severity = IncidentSeverity(incident.severity)
-    except ValueError:
-        severity = IncidentSeverity.MEDIUM
+    incident_type = _INCIDENT_TYPE_MAP.get(incident.type, IncidentType.UNKNOWN)
+    severity = _SEVERITY_MAP.get(incident.severity, IncidentSeverity.MEDIUM)
     
     resource = KubernetesResource(
         kind=incident.resource_kind,
@@ -295,18 +478,33 @@ async def record_incident(incident: IncidentInput, background_tasks: BackgroundT
     )
     
     incident_id = brain.knowledge_base.record_incident(inc)
+    # Similarity search runs after the response; fetch it via /incidents/{id}/similar.
+    # It is a coroutine, so it runs on the loop with the writers of the same indexes
+    background_tasks.add_task(brain.compute_and_store_similar, incident_id)
+    
+    return IncidentRecordedResponse.model_construct(status="recorded", incident_id=incident_id)
+
+
+@router.get("/incidents/{incident_id}/similar")
+async def get_similar_incidents(incident_id: str, brain=Depends(get_brain)):
+    """Get past incidents similar to a recorded one"""
+    similar_ids = brain.similar_incidents.get(incident_id)
+    if similar_ids is None:
+        # Background task has not run yet (or the brain was restarted): compute now
+        similar_ids = await brain.compute_and_store_similar(incident_id)
+        if similar_ids is None:
+            raise HTTPException(status_code=404, detail="Incident not found")
     
     return {
-        "status": "recorded",
         "incident_id": incident_id,
-        "similar_incidents": len(brain.get_similar_incidents(inc)),
+        "similar_incidents": similar_ids,
+        "count": len(similar_ids),
     }
 
 
 @router.get("/patterns")
-async def get_patterns():
+async def get_patterns(brain=Depends(get_brain)):
     """Get learned patterns"""
-    brain = get_brain()
     stats = brain.knowledge_base.get_stats()
     
     return {
@@ -316,17 +514,14 @@ async def get_patterns():
 
 
 @router.get("/knowledge/stats")
-async def get_knowledge_stats():
+async def get_knowledge_stats(brain=Depends(get_brain)):
     """Get knowledge base statistics"""
-    brain = get_brain()
     return brain.knowledge_base.get_stats()
 
 
 @router.post("/remediation/approve")
-async def approve_remediation(approval: RemediationApproval):
+async def approve_remediation(approval: RemediationApproval, brain=Depends(get_brain)):
     """Approve a pending remediation"""
-    brain = get_brain()
-    
     if approval.remediation_id not in brain.remediation_engine.pending_approvals:
         raise HTTPException(status_code=404, detail="Remediation not found or not pending")
     
@@ -341,30 +536,40 @@ async def approve_remediation(approval: RemediationApproval):
 
 
 @router.get("/predictions/active")
-async def get_active_predictions():
+async def get_active_predictions(brain=Depends(get_brain)):
     """Get all active predictions"""
-    brain = get_brain()
     predictions = brain.get_active_predictions()
     
-    return {
+    return ORJSONResponse({
         "count": len(predictions),
         "predictions": [
             {
-                "id": p.id,
-                "type": p.incident_type.value,
-                "probability": p.probability,
-                "target": p.target_resource.name if p.target_resource else None,
-                "eta_minutes": p.eta_minutes,
+                "id": pred_id,
+                "type": incident_type.value,
+                "probability": probability,
+                "target": target.name if target else None,
+                "eta_minutes": eta_minutes,
             }
-            for p in predictions
+            for pred_id, incident_type, probability, target, eta_minutes in map(_PRED_GETTER, predictions)
         ],
-    }
+    })
+
+
+# Liveness probes hit /health several times a second; the timestamp only
+# needs one-second resolution, so the formatted string is reused.
+_health_ts_sec = 0
+_health_ts_str = ""
 
 
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
+    global _health_ts_sec, _health_ts_str
+    now = int(time.time())
+    if now != _health_ts_sec:
+        _health_ts_sec = now
+        _health_ts_str = datetime.utcfromtimestamp(now).isoformat()
+    return {"status": "healthy", "timestamp": _health_ts_str}
 
 
 # ============= NEW ENDPOINTS FOR REMEDIATION & LEARNING =============
@@ -376,21 +581,31 @@ class RemediationAction(BaseModel):
     parameters: Dict[str, Any] = {}
 
 
+async def _owning_deployment(apps_v1, pod, namespace: str) -> Optional[str]:
+    """Name of the Deployment that owns a pod through its ReplicaSet, if any"""
+    for owner in pod.metadata.owner_references or ():
+        if owner.kind != "ReplicaSet":
+            continue
+        rs = await _kube_call(apps_v1.read_namespaced_replica_set, owner.name, namespace)
+        for rs_owner in rs.metadata.owner_references or ():
+            if rs_owner.kind == "Deployment":
+                return rs_owner.name
+    return None
+
+
 @router.post("/remediation/execute")
 async def execute_remediation(action: RemediationAction):
     """Execute a remediation action on a pod/deployment"""
+    _require_kube()
     try:
-        from kubernetes import client, config
-        config.load_kube_config()
-        
-        v1 = client.CoreV1Api()
-        apps_v1 = client.AppsV1Api()
+        v1, apps_v1 = get_kube_apis()
         
         result = {"status": "pending", "action": action.action, "target": action.pod_name}
         
         if action.action == "restart_pod":
             # Delete the pod to trigger a restart
-            v1.delete_namespaced_pod(
+            await _kube_call(
+                v1.delete_namespaced_pod,
                 name=action.pod_name,
                 namespace=action.namespace
             )
@@ -402,48 +617,36 @@ async def execute_remediation(action: RemediationAction):
             
         elif action.action == "scale_memory_up":
             # Find the deployment for this pod
-            pods = v1.list_namespaced_pod(namespace=action.namespace)
-            target_pod = None
-            for pod in pods.items:
-                if pod.metadata.name == action.pod_name:
-                    target_pod = pod
-                    break
+            target_pod = await _kube_call(v1.read_namespaced_pod, action.pod_name, action.namespace)
+            deployment_name = await _owning_deployment(apps_v1, target_pod, action.namespace)
             
-            if target_pod and target_pod.metadata.owner_references:
-                # Get deployment name from ReplicaSet owner
-                for owner in target_pod.metadata.owner_references:
-                    if owner.kind == "ReplicaSet":
-                        rs = apps_v1.read_namespaced_replica_set(owner.name, action.namespace)
-                        if rs.metadata.owner_references:
-                            for rs_owner in rs.metadata.owner_references:
-                                if rs_owner.kind == "Deployment":
-                                    # Patch deployment with increased memory
-                                    patch = {
-                                        "spec": {
-                                            "template": {
-                                                "spec": {
-                                                    "containers": [{
-                                                        "name": target_pod.spec.containers[0].name,
-                                                        "resources": {
-                                                            "limits": {"memory": "256Mi"},
-                                                            "requests": {"memory": "128Mi"}
-                                                        }
-                                                    }]
-                                                }
-                                            }
-                                        }
+            if deployment_name:
+                # Patch deployment with increased memory
+                patch = {
+                    "spec": {
+                        "template": {
+                            "spec": {
+                                "containers": [{
+                                    "name": target_pod.spec.containers[0].name,
+                                    "resources": {
+                                        "limits": {"memory": "256Mi"},
+                                        "requests": {"memory": "128Mi"}
                                     }
-                                    apps_v1.patch_namespaced_deployment(
-                                        rs_owner.name, action.namespace, patch
-                                    )
-                                    result["status"] = "success"
-                                    result["message"] = f"Scaled memory for deployment {rs_owner.name}"
-                                    _record_remediation(action.action, rs_owner.name, action.namespace, "success")
-                                    break
-            
-            if result["status"] == "pending":
+                                }]
+                            }
+                        }
+                    }
+                }
+                await _kube_call(
+                    apps_v1.patch_namespaced_deployment,
+                    deployment_name, action.namespace, patch
+                )
+                result["status"] = "success"
+                result["message"] = f"Scaled memory for deployment {deployment_name}"
+                _record_remediation(action.action, deployment_name, action.namespace, "success")
+            else:
                 # For standalone pods, just restart them
-                v1.delete_namespaced_pod(name=action.pod_name, namespace=action.namespace)
+                await _kube_call(v1.delete_namespaced_pod, name=action.pod_name, namespace=action.namespace)
                 result["status"] = "success"
                 result["message"] = f"Restarted pod {action.pod_name} (standalone pod)"
                 _record_remediation("restart_pod", action.pod_name, action.namespace, "success")
@@ -460,125 +663,302 @@ async def execute_remediation(action: RemediationAction):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-# In-memory storage for incidents and remediations (will persist to file)
-_incidents_log = []
-_remediations_log = []
+# In-memory storage for incidents and remediations (will persist to file).
+# The logs keep only the newest _MAX_LOG_ENTRIES records.
+_MAX_LOG_ENTRIES = 1000
+_incidents_log: deque = deque(maxlen=_MAX_LOG_ENTRIES)
+_remediations_log: deque = deque(maxlen=_MAX_LOG_ENTRIES)
 _patterns = {}
+# Handlers, sync background tasks and the flusher all touch the state above;
+# mutate and snapshot it only while holding this lock.
+_state_lock = threading.Lock()
+
+# Incidents and remediations are append-only JSONL logs; patterns are small
+# and rewritten whole. Logs are compacted to the last _MAX_LOG_ENTRIES records
+# once they grow past twice that.
+_DATA_DIR = Path("/var/lib/kratos-ai")
+_INCIDENTS_FILE = _DATA_DIR / "incidents.jsonl"
+_REMEDIATIONS_FILE = _DATA_DIR / "remediations.jsonl"
+_PATTERNS_FILE = _DATA_DIR / "patterns.json"
+_LEGACY_DATA_FILE = _DATA_DIR / "data.json"
+
+# Serialized lines not yet appended, and how many lines each log file holds
+_pending_lines: Dict[Path, List[bytes]] = {_INCIDENTS_FILE: [], _REMEDIATIONS_FILE: []}
+_log_line_counts: Dict[Path, int] = {_INCIDENTS_FILE: 0, _REMEDIATIONS_FILE: 0}
+_save_lock = threading.Lock()
+# Event storms record many items back to back; coalesce them into one write
+_SAVE_DEBOUNCE_SECONDS = 1.0
+# Both are created by start_data_flusher on the serving loop
+_dirty: Optional[asyncio.Event] = None
+_flusher_task: Optional[asyncio.Task] = None
 
 
 def _record_remediation(action: str, target: str, namespace: str, status: str, error: str = None):
     """Record a remediation action"""
     global _remediations_log
-    _remediations_log.append({
+    remediation = {
         "action": action,
         "target": target,
         "namespace": namespace,
         "status": status,
         "error": error,
         "timestamp": datetime.utcnow().isoformat()
-    })
-    _save_data()
-
-
-def _record_incident(incident_type: str, target: str, namespace: str, severity: str, message: str):
-    """Record an incident for learning"""
+    }
+    line = orjson.dumps(remediation) + b"\n"
+    with _state_lock:
+        _remediations_log.append(remediation)
+        _pending_lines[_REMEDIATIONS_FILE].append(line)
+    _mark_dirty()
+
+
+def _record_incident(
+    incident_type: str,
+    target: str,
+    namespace: str,
+    severity: str,
+    message: str,
+    timestamp: Optional[str] = None,
+):
+    """Record an incident for learning; batch callers pass one shared timestamp"""
     global _incidents_log, _patterns
     
+    timestamp = timestamp or datetime.utcnow().isoformat()
     incident = {
         "type": incident_type,
         "target": target,
         "namespace": namespace,
         "severity": severity,
         "message": message,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": timestamp
     }
-    _incidents_log.append(incident)
-    
-    # Update patterns
+    line = orjson.dumps(incident) + b"\n"
     pattern_key = f"{incident_type}:{namespace}"
-    if pattern_key not in _patterns:
-        _patterns[pattern_key] = {"count": 0, "last_seen": None, "targets": set()}
-    _patterns[pattern_key]["count"] += 1
-    _patterns[pattern_key]["last_seen"] = datetime.utcnow().isoformat()
-    _patterns[pattern_key]["targets"].add(target)
     
-    _save_data()
+    with _state_lock:
+        _incidents_log.append(incident)
+        _pending_lines[_INCIDENTS_FILE].append(line)
+        
+        # Update patterns
+        if pattern_key not in _patterns:
+            _patterns[pattern_key] = {"count": 0, "last_seen": None, "targets": set()}
+        _patterns[pattern_key]["count"] += 1
+        _patterns[pattern_key]["last_seen"] = timestamp
+        _patterns[pattern_key]["targets"].add(target)
+    
+    _mark_dirty()
+
+
+def _snapshot_data() -> Dict[str, Any]:
+    """Collect pending writes; they stay pending until _write_data commits them"""
+    appends = {}
+    compactions = {}
+    with _state_lock:
+        for path, log in ((_INCIDENTS_FILE, _incidents_log), (_REMEDIATIONS_FILE, _remediations_log)):
+            lines = _pending_lines[path]
+            if not lines:
+                continue
+            if _log_line_counts[path] + len(lines) > 2 * _MAX_LOG_ENTRIES:
+                # The rewrite already includes the pending lines
+                compactions[path] = (list(log), len(lines))
+            else:
+                appends[path] = list(lines)
+        patterns = {k: {**v, "targets": list(v["targets"])} for k, v in _patterns.items()}
+    
+    # Serialize outside the lock; records are never mutated once logged
+    for path, (records, taken) in compactions.items():
+        compactions[path] = ([orjson.dumps(record) + b"\n" for record in records], taken)
+    
+    return {
+        "appends": appends,
+        "compactions": compactions,
+        "patterns": patterns,
+    }
 
 
-def _save_data():
-    """Save incidents and remediations to file"""
-    import json
-    data = {
-        "incidents": _incidents_log[-1000:],  # Keep last 1000
-        "remediations": _remediations_log[-1000:],
-        "patterns": {k: {**v, "targets": list(v["targets"])} for k, v in _patterns.items()}
-    }
+def _commit_written(path: Path, taken: int, line_count: Optional[int] = None):
+    """Drop lines that reached disk from the pending list and update the file's line count"""
+    with _state_lock:
+        del _pending_lines[path][:taken]
+        _log_line_counts[path] = _log_line_counts[path] + taken if line_count is None else line_count
+
+
+def _write_data(data: Dict[str, Any]):
+    """Write a snapshot; lines from a failed write stay pending for the next save"""
+    for path, (lines, taken) in data["compactions"].items():
+        try:
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(b"".join(lines))
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"Failed to compact {path}: {e}")
+        else:
+            _commit_written(path, taken, len(lines))
+    for path, lines in data["appends"].items():
+        try:
+            with open(path, "ab") as f:
+                f.write(b"".join(lines))
+        except Exception as e:
+            logger.error(f"Failed to append to {path}: {e}")
+        else:
+            _commit_written(path, len(lines))
     try:
-        with open("/var/lib/kratos-ai/data.json", "w") as f:
-            json.dump(data, f)
+        _PATTERNS_FILE.write_bytes(orjson.dumps(data["patterns"]))
     except Exception as e:
-        logger.error(f"Failed to save data: {e}")
+        logger.error(f"Failed to save patterns: {e}")
+
+
+def _save_data():
+    """Save incidents and remediations to file"""
+    # One save at a time, so two snapshots never hold the same pending lines
+    with _save_lock:
+        _write_data(_snapshot_data())
+
+
+def _mark_dirty():
+    """Schedule a save; the flusher task coalesces writes, else save right away"""
+    if _flusher_task is None:
+        _save_data()
+    else:
+        # Records may come from threadpool threads; asyncio.Event is not thread-safe
+        _flusher_task.get_loop().call_soon_threadsafe(_dirty.set)
+
+
+async def _flush_loop():
+    while True:
+        await _dirty.wait()
+        await asyncio.sleep(_SAVE_DEBOUNCE_SECONDS)
+        _dirty.clear()
+        # Snapshot, serialize and write in a worker thread
+        await asyncio.to_thread(_save_data)
+
+
+def _log_flusher_exit(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Data flusher stopped: {task.exception()!r}")
+
+
+def start_data_flusher():
+    """Start the background task that persists recorded data (call from the running loop)"""
+    global _dirty, _flusher_task
+    if _flusher_task is None:
+        # asyncio.Event binds to the loop that first waits on it; make one per lifespan
+        _dirty = asyncio.Event()
+        _flusher_task = asyncio.get_running_loop().create_task(_flush_loop())
+        _flusher_task.add_done_callback(_log_flusher_exit)
+
+
+async def stop_data_flusher():
+    """Stop the flusher and write any pending changes"""
+    global _dirty, _flusher_task
+    if _flusher_task is not None:
+        _flusher_task.cancel()
+        _flusher_task = None
+    if _dirty is not None and _dirty.is_set():
+        await asyncio.to_thread(_save_data)
+    _dirty = None
+
+
+def _read_log(path: Path) -> deque:
+    """Read the last _MAX_LOG_ENTRIES records of a JSONL log in one pass"""
+    tail = deque(maxlen=_MAX_LOG_ENTRIES)
+    count = 0
+    with open(path, "rb") as f:
+        for count, line in enumerate(f, 1):
+            tail.append(line)
+    _log_line_counts[path] = count
+    
+    records = deque(maxlen=_MAX_LOG_ENTRIES)
+    for line in tail:
+        try:
+            records.append(orjson.loads(line))
+        except orjson.JSONDecodeError:
+            # Torn final line from an interrupted append
+            continue
+    return records
 
 
 def _load_data():
     """Load saved data"""
     global _incidents_log, _remediations_log, _patterns
-    import json
     try:
-        with open("/var/lib/kratos-ai/data.json", "r") as f:
-            data = json.load(f)
-            _incidents_log = data.get("incidents", [])
-            _remediations_log = data.get("remediations", [])
-            _patterns = {k: {**v, "targets": set(v["targets"])} for k, v in data.get("patterns", {}).items()}
-    except FileNotFoundError:
-        pass
+        # patterns.json is written on every save, so its absence means no JSONL data yet
+        if not _PATTERNS_FILE.exists() and _LEGACY_DATA_FILE.exists():
+            _load_legacy_data()
+            return
+        if _INCIDENTS_FILE.exists():
+            _incidents_log = _read_log(_INCIDENTS_FILE)
+        if _REMEDIATIONS_FILE.exists():
+            _remediations_log = _read_log(_REMEDIATIONS_FILE)
+        if _PATTERNS_FILE.exists():
+            patterns = orjson.loads(_PATTERNS_FILE.read_bytes())
+            _patterns = {k: {**v, "targets": set(v["targets"])} for k, v in patterns.items()}
     except Exception as e:
         logger.error(f"Failed to load data: {e}")
 
 
+def _load_legacy_data():
+    """Import a data.json written by older versions into the JSONL logs"""
+    global _incidents_log, _remediations_log, _patterns
+    data = orjson.loads(_LEGACY_DATA_FILE.read_bytes())
+    _incidents_log = deque(data.get("incidents", []), maxlen=_MAX_LOG_ENTRIES)
+    _remediations_log = deque(data.get("remediations", []), maxlen=_MAX_LOG_ENTRIES)
+    _patterns = {k: {**v, "targets": set(v["targets"])} for k, v in data.get("patterns", {}).items()}
+    _pending_lines[_INCIDENTS_FILE] = [orjson.dumps(record) + b"\n" for record in _incidents_log]
+    _pending_lines[_REMEDIATIONS_FILE] = [orjson.dumps(record) + b"\n" for record in _remediations_log]
+    _save_data()
+
+
 # Load data on startup
 _load_data()
 
 
+# Each alternative scans the whole reason before the next is tried, so the
+# first group that matches follows the priority order below.
+_WARNING_REASON_CLASSIFIER = re.compile(
+    r".*?(?P<crash_loop>BackOff)|.*?(?P<oom_kill>Kill)|.*?(?P<failed>Failed)|.*?(?P<unhealthy>Unhealthy)",
+    re.DOTALL,
+)
+_WARNING_SEVERITY = {"crash_loop": "high", "oom_kill": "high", "failed": "medium", "unhealthy": "medium"}
+
+
+def _classify_warning(reason: str, message: str) -> Optional[str]:
+    """Map a Warning event to an incident type, or None if it is not one we learn from"""
+    match = _WARNING_REASON_CLASSIFIER.match(reason)
+    incident_type = match.lastgroup if match else None
+    # An OOM message outranks everything except a BackOff reason
+    if incident_type != "crash_loop" and "OOM" in message:
+        return "oom_kill"
+    return incident_type
+
+
 @router.post("/learn/record-events")
 async def record_events_for_learning():
     """Scan current events and record incidents for learning"""
+    _require_kube()
     try:
-        from kubernetes import client, config
-        config.load_kube_config()
-        
-        v1 = client.CoreV1Api()
-        events = v1.list_event_for_all_namespaces(limit=100)
+        v1, _ = get_kube_apis()
+        # Only Warning events are ever recorded; let the apiserver filter them
+        events = await _kube_call(
+            list_raw, v1.list_event_for_all_namespaces, field_selector="type=Warning", limit=100
+        )
         
         recorded = 0
-        for event in events.items:
-            if event.type == "Warning":
-                incident_type = "unknown"
-                severity = "medium"
-                
-                if "BackOff" in (event.reason or ""):
-                    incident_type = "crash_loop"
-                    severity = "high"
-                elif "OOM" in (event.message or "") or "Kill" in (event.reason or ""):
-                    incident_type = "oom_kill"
-                    severity = "high"
-                elif "Failed" in (event.reason or ""):
-                    incident_type = "failed"
-                    severity = "medium"
-                elif "Unhealthy" in (event.reason or ""):
-                    incident_type = "unhealthy"
-                    severity = "medium"
-                
-                if incident_type != "unknown":
-                    target = event.involved_object.name if event.involved_object else "unknown"
-                    _record_incident(
-                        incident_type,
-                        target,
-                        event.metadata.namespace,
-                        severity,
-                        event.message or "No message"
-                    )
-                    recorded += 1
+        now = datetime.utcnow().isoformat()
+        for event in events["items"]:
+            message = event.get("message") or ""
+            incident_type = _classify_warning(event.get("reason") or "", message)
+            if incident_type is not None:
+                involved_object = event.get("involvedObject")
+                target = involved_object.get("name", "unknown") if involved_object else "unknown"
+                _record_incident(
+                    incident_type,
+                    target,
+                    event["metadata"].get("namespace"),
+                    _WARNING_SEVERITY[incident_type],
+                    message or "No message",
+                    timestamp=now,
+                )
+                recorded += 1
         
         return {"status": "success", "recorded": recorded, "total_incidents": len(_incidents_log)}
     except Exception as e:
@@ -586,32 +966,41 @@ async def record_events_for_learning():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _newest(log: deque, n: int) -> List[Dict[str, Any]]:
+    """Last n records, oldest first, without copying the whole deque"""
+    newest = list(islice(reversed(log), n))
+    newest.reverse()
+    return newest
+
+
 @router.get("/learn/stats")
 async def get_learning_stats():
     """Get learning statistics"""
-    return {
-        "total_incidents": len(_incidents_log),
-        "total_remediations": len(_remediations_log),
-        "total_patterns": len(_patterns),
-        "recent_incidents": _incidents_log[-10:],
-        "recent_remediations": _remediations_log[-10:],
-        "patterns": [
-            {
-                "type": k.split(":")[0],
-                "namespace": k.split(":")[1] if ":" in k else "unknown",
-                "count": v["count"],
-                "last_seen": v["last_seen"],
-                "targets_count": len(v["targets"])
-            }
-            for k, v in _patterns.items()
-        ]
-    }
+    with _state_lock:
+        return ORJSONResponse({
+            "total_incidents": len(_incidents_log),
+            "total_remediations": len(_remediations_log),
+            "total_patterns": len(_patterns),
+            "recent_incidents": _newest(_incidents_log, 10),
+            "recent_remediations": _newest(_remediations_log, 10),
+            "patterns": [
+                {
+                    "type": k.split(":")[0],
+                    "namespace": k.split(":")[1] if ":" in k else "unknown",
+                    "count": v["count"],
+                    "last_seen": v["last_seen"],
+                    "targets_count": len(v["targets"])
+                }
+                for k, v in _patterns.items()
+            ]
+        })
 
 
 @router.get("/remediations/history")
 async def get_remediation_history():
     """Get remediation history"""
-    return {
-        "total": len(_remediations_log),
-        "remediations": _remediations_log[-50:]
-    }
+    with _state_lock:
+        return ORJSONResponse({
+            "total": len(_remediations_log),
+            "remediations": _newest(_remediations_log, 50)
+        })
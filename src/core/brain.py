@@ -2,9 +2,10 @@
 
 import asyncio
 import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from enum import Enum
 
 from core.types import (
@@ -16,9 +17,10 @@ from core.types import (
     Remediation,
     KubernetesResource,
     ResourceMetrics,
+    ingest_tick,
 )
 from core.knowledge_base import KnowledgeBase
-from ml.predictors import FailurePredictor, AnomalyDetector, TimeSeriesForecaster
+from ml.predictors import FailurePredictor, AnomalyDetector, PredictionResult, TimeSeriesForecaster
 from remediation.engine import RemediationEngine, RemediationPlan
 
 logger = logging.getLogger(__name__)
@@ -84,12 +86,21 @@ class KratosBrain:
         self.is_running = False
         self.started_at: Optional[datetime] = None
         self.active_predictions: Dict[str, Prediction] = {}
+        # incident id -> similar incident ids, oldest entries dropped past the cap
+        self.similar_incidents: OrderedDict[str, List[str]] = OrderedDict()
+        self.similar_incidents_max = self.config.get("similar_incidents_max", 10_000)
         self.cluster_state: Optional[ClusterState] = None
         
         self.on_incident: List[callable] = []
         self.on_prediction: List[callable] = []
         self.on_remediation: List[callable] = []
         
+        # Concurrent predict() calls are coalesced into one predictor call per batch
+        self.predict_batch_size = self.config.get("predict_batch_size", 32)
+        self.predict_batch_seconds = self.config.get("predict_batch_ms", 10) / 1000
+        self._predict_queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        
         self.prediction_threshold = self.config.get("prediction_threshold", 0.7)
         self.auto_remediate_threshold = self.config.get("auto_remediate_threshold", 0.85)
         
@@ -102,7 +113,9 @@ class KratosBrain:
         self.is_running = True
         self.started_at = datetime.utcnow()
         
+        self.knowledge_base.start_writer()
         asyncio.create_task(self._observation_loop())
+        asyncio.create_task(self._flush_loop())
         
         if self.mode in (KratosMode.PREDICT, KratosMode.RECOMMEND, KratosMode.SEMI_AUTO, KratosMode.AUTO):
             asyncio.create_task(self._prediction_loop())
@@ -111,6 +124,13 @@ class KratosBrain:
     
     async def stop(self):
         self.is_running = False
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            self._batcher_task = None
+            # A batcher cancelled before its first step never sees its queue
+            self._fail_queued(self._predict_queue, [])
+        await self.knowledge_base.stop_writer()
+        self.knowledge_base.close()
         logger.info("Kratos Brain stopped")
     
     def get_status(self) -> KratosStatus:
@@ -151,6 +171,13 @@ class KratosBrain:
                 logger.error(f"Prediction error: {e}")
                 await asyncio.sleep(10)
     
+    async def _flush_loop(self):
+        interval = self.config.get("flush_interval_seconds", 5)
+        
+        while self.is_running:
+            await asyncio.sleep(interval)
+            self.knowledge_base.flush()
+    
     async def _observe_cluster(self):
         if not self.k8s_client:
             return
@@ -177,11 +204,7 @@ class KratosBrain:
         logger.info(f"Incident: {incident.type.value} - {incident.message}")
         self.knowledge_base.record_incident(incident)
         
-        for callback in self.on_incident:
-            try:
-                callback(incident)
-            except Exception as e:
-                logger.error(f"Callback error: {e}")
+        await self._dispatch(self.on_incident, incident)
         
         if self.mode in (KratosMode.RECOMMEND, KratosMode.SEMI_AUTO, KratosMode.AUTO):
             plan = self.remediation_engine.plan_remediation(incident=incident)
@@ -199,22 +222,100 @@ class KratosBrain:
         
         if should_execute:
             remediation = self.remediation_engine.execute(plan, approved_by="auto")
-            for callback in self.on_remediation:
+            await self._dispatch(self.on_remediation, remediation)
+    
+    async def _dispatch(self, callbacks: List[callable], arg: Any):
+        """Run sync callbacks inline on the loop, then await coroutine callbacks concurrently"""
+        if not callbacks:
+            return
+        
+        coroutines = []
+        for cb in callbacks:
+            if asyncio.iscoroutinefunction(cb):
+                coroutines.append(cb(arg))
+                continue
+            try:
+                cb(arg)
+            except Exception as e:
+                logger.error(f"Callback error: {e}")
+        
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Callback error: {result}")
+    
+    async def predict(self, resource: KubernetesResource, metrics: ResourceMetrics) -> Prediction:
+        """Predict for one resource, batched with other concurrent callers"""
+        loop = asyncio.get_running_loop()
+        # The batcher is bound to the loop it was started on; restart it after stop() or on a new loop
+        if self._batcher_task is None or self._batcher_task.done() or self._batcher_task.get_loop() is not loop:
+            self._predict_queue = asyncio.Queue()
+            self._batcher_task = loop.create_task(self._batcher_loop(self._predict_queue))
+        
+        future = loop.create_future()
+        self._predict_queue.put_nowait((resource, metrics, future))
+        return await future
+    
+    async def _batcher_loop(self, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                # Take whatever is already queued; a lone caller is dispatched at once
+                batch = [await queue.get()]
+                while len(batch) < self.predict_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+                
+                # Under concurrent load, wait up to predict_batch_seconds to fill the batch
+                if len(batch) > 1:
+                    deadline = loop.time() + self.predict_batch_seconds
+                    while len(batch) < self.predict_batch_size:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            batch.append(await asyncio.wait_for(queue.get(), timeout))
+                        except asyncio.TimeoutError:
+                            break
+                
                 try:
-                    callback(remediation)
+                    predictions = self.predict_for_resources([(resource, metrics) for resource, metrics, _ in batch])
                 except Exception as e:
-                    logger.error(f"Callback error: {e}")
+                    for _, _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, _, future), prediction in zip(batch, predictions):
+                    if not future.done():  # caller may have been cancelled
+                        future.set_result(prediction)
+                batch = []
+        except asyncio.CancelledError:
+            # Fail in-flight and queued callers instead of leaving them waiting forever
+            self._fail_queued(queue, batch)
+            raise
     
-    def predict_for_resource(self, resource: KubernetesResource, metrics: ResourceMetrics) -> Prediction:
-        features = {
+    @staticmethod
+    def _fail_queued(queue: asyncio.Queue, batch: List[Tuple[Any, Any, asyncio.Future]]):
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Prediction batcher stopped"))
+    
+    @staticmethod
+    def _features(metrics: ResourceMetrics) -> Dict[str, Any]:
+        return {
             "cpu_usage_cores": metrics.cpu_usage_cores,
             "cpu_limit_cores": metrics.cpu_limit_cores,
             "memory_usage_bytes": metrics.memory_usage_bytes,
             "memory_limit_bytes": metrics.memory_limit_bytes,
         }
-        
-        result = self.failure_predictor.predict(features)
-        
+    
+    def predict_for_resource(self, resource: KubernetesResource, metrics: ResourceMetrics) -> Prediction:
+        result = self.failure_predictor.predict(self._features(metrics))
+        return self._to_prediction(resource, metrics, result)
+    
+    def _to_prediction(self, resource: KubernetesResource, metrics: ResourceMetrics, result: PredictionResult) -> Prediction:
         incident_type = IncidentType.RESOURCE_EXHAUSTION
         if metrics.memory_utilization > metrics.cpu_utilization:
             incident_type = IncidentType.OOM_KILL
@@ -241,6 +342,18 @@ class KratosBrain:
             model_version=result.model_version,
         )
     
+    def predict_for_resources(
+        self,
+        batch: List[Tuple[KubernetesResource, ResourceMetrics]],
+    ) -> List[Prediction]:
+        """Predict for many (resource, metrics) pairs in one call"""
+        with ingest_tick():
+            results = self.failure_predictor.predict_batch([self._features(metrics) for _, metrics in batch])
+            return [
+                self._to_prediction(resource, metrics, result)
+                for (resource, metrics), result in zip(batch, results)
+            ]
+    
     def get_recommendations(self, resource: KubernetesResource, prediction: Prediction) -> RemediationPlan:
         return self.remediation_engine.plan_remediation(prediction=prediction)
     
@@ -250,6 +363,18 @@ class KratosBrain:
     def get_similar_incidents(self, incident: Incident) -> List[Incident]:
         return self.knowledge_base.find_similar_incidents(incident)
     
+    async def compute_and_store_similar(self, incident_id: str) -> Optional[List[str]]:
+        """Run similarity search for a recorded incident and cache the matching IDs"""
+        incident = self.knowledge_base.incidents.get(incident_id)
+        if incident is None:
+            return None
+        similar_ids = [inc.id for inc in self.knowledge_base.find_similar_incidents(incident)]
+        self.similar_incidents[incident_id] = similar_ids
+        self.similar_incidents.move_to_end(incident_id)
+        while len(self.similar_incidents) > self.similar_incidents_max:
+            self.similar_incidents.popitem(last=False)
+        return similar_ids
+    
     def get_active_predictions(self) -> List[Prediction]:
         now = datetime.utcnow()
         active = []
@@ -1,13 +1,20 @@
 """Knowledge Base - Learns from every incident"""
 
-import json
+import asyncio
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import asdict, dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import functools
 import hashlib
+import heapq
+import re
+import time
+
+import numpy as np
+import orjson
 
 from core.types import (
     Incident,
@@ -22,6 +29,111 @@ from core.types import (
 
 logger = logging.getLogger(__name__)
 
+# Variable parts stripped from error messages before fingerprinting, tried in
+# order at each position and replaced in a single scan
+_NORMALIZE_TOKENS = [
+    ("uuid", r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", "<UUID>"),
+    ("ts", r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}", "<TIMESTAMP>"),
+    ("ip", r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", "<IP>"),
+    ("num", r"(?<![A-Z])\d{3,}(?![A-Z])", "<NUM>"),  # keeps error codes like E500
+    ("pod", r"-[a-z0-9]{5,10}(?:-[a-z0-9]{5})?", "-<POD_SUFFIX>"),
+]
+_NORMALIZE_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in _NORMALIZE_TOKENS))
+_NORMALIZE_REPLACEMENTS = {name: token for name, _, token in _NORMALIZE_TOKENS}
+
+# Write-queue markers besides serialized incident lines
+_SAVE_PATTERNS = object()
+_STOP_WRITER = object()
+
+_MISSING = object()
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _epoch_us(dt: datetime) -> int:
+    """Naive-UTC datetime as integer microseconds since the epoch"""
+    return (_naive_utc(dt) - _EPOCH) // _ONE_MICROSECOND
+
+
+def _to_epoch_seconds(dt: Optional[datetime]) -> Optional[float]:
+    return (_naive_utc(dt) - _EPOCH).total_seconds() if dt else None
+
+
+def _from_epoch_seconds(value) -> Optional[datetime]:
+    """Inverse of _to_epoch_seconds; also accepts ISO strings from older incidents.jsonl files"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return _EPOCH + timedelta(seconds=value)
+
+
+# Default remediations for auto-detected patterns, most preferred first
+_ACTIONS_BY_INCIDENT_TYPE: Dict[IncidentType, Tuple[RemediationAction, ...]] = {
+    IncidentType.OOM_KILL: (RemediationAction.SCALE_MEMORY_UP, RemediationAction.RESTART_POD),
+    IncidentType.CRASH_LOOP: (RemediationAction.RESTART_POD, RemediationAction.ROLLBACK_DEPLOYMENT),
+    IncidentType.IMAGE_PULL_FAIL: (RemediationAction.NO_ACTION,),  # Usually needs manual fix
+    IncidentType.READINESS_FAIL: (RemediationAction.RESTART_POD,),
+    IncidentType.LIVENESS_FAIL: (RemediationAction.RESTART_POD,),
+    IncidentType.NODE_NOT_READY: (RemediationAction.CORDON_NODE, RemediationAction.DRAIN_NODE),
+    IncidentType.NODE_MEMORY_PRESSURE: (RemediationAction.DRAIN_NODE,),
+    IncidentType.NODE_DISK_PRESSURE: (RemediationAction.DRAIN_NODE,),
+    IncidentType.RESOURCE_EXHAUSTION: (RemediationAction.SCALE_REPLICAS_UP, RemediationAction.SCALE_CPU_UP),
+    IncidentType.EVICTION: (RemediationAction.SCALE_MEMORY_UP,),
+    IncidentType.PENDING_POD: (RemediationAction.SCALE_REPLICAS_DOWN,),
+    IncidentType.SCALING_ISSUE: (RemediationAction.SCALE_REPLICAS_UP,),
+    IncidentType.DEPLOYMENT_FAIL: (RemediationAction.ROLLBACK_DEPLOYMENT,),
+}
+
+
+# Bulk loads repeat the same few label sets and messages many times, so the
+# pieces of a fingerprint are memoized rather than recomputed per incident
+
+@functools.lru_cache(maxsize=4096)
+def _label_hash(labels: FrozenSet[Tuple[str, str]]) -> str:
+    label_str = "|".join(f"{k}={v}" for k, v in sorted(labels))
+    return hashlib.blake2b(label_str.encode(), digest_size=4).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_message(message: str) -> str:
+    normalized = _NORMALIZE_RE.sub(lambda m: _NORMALIZE_REPLACEMENTS[m.lastgroup], message)
+    return normalized.lower().strip()
+
+
+class _FingerprintBucket:
+    """Incident IDs sharing a fingerprint, with their occurred_at kept in a parallel int64 array"""
+    
+    __slots__ = ("ids", "_times")
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self._times = np.empty(8, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def append(self, incident_id: str, occurred_at: datetime):
+        n = len(self.ids)
+        if n == len(self._times):
+            # Double the capacity so appends stay amortized O(1)
+            grown = np.empty(2 * n, dtype=np.int64)
+            grown[:n] = self._times
+            self._times = grown
+        self._times[n] = _epoch_us(occurred_at)
+        self.ids.append(incident_id)
+    
+    @property
+    def times(self) -> np.ndarray:
+        return self._times[:len(self.ids)]
+
 
 @dataclass
 class IncidentFingerprint:
@@ -34,8 +146,24 @@ class IncidentFingerprint:
     
     def to_hash(self) -> str:
         """Generate unique hash for this fingerprint"""
-        content = f"{self.incident_type}:{self.resource_kind}:{self.namespace}:{self.label_hash}:{self.error_pattern}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Bucket key, and the suffix of auto-detected pattern names in patterns.json;
+        # patterns saved under legacy_hashes() are renamed at load
+        h = hashlib.blake2b(digest_size=8)
+        for part in (self.incident_type.value, self.resource_kind, self.namespace, self.label_hash, self.error_pattern):
+            h.update(part.encode())
+            h.update(b"\x1f")  # field delimiter
+        return h.hexdigest()
+    
+    def legacy_hashes(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Hashes older releases gave this fingerprint (SHA-256 over an MD5 label hash)"""
+        label_str = "|".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        label_hash = hashlib.md5(label_str.encode()).hexdigest()[:8]
+        rest = f"{self.resource_kind}:{self.namespace}:{label_hash}:{self.error_pattern}"
+        # f-strings rendered the str enum by value before Python 3.12, by member name since
+        return tuple(
+            hashlib.sha256(f"{incident_type}:{rest}".encode()).hexdigest()[:16]
+            for incident_type in (self.incident_type.value, f"IncidentType.{self.incident_type.name}")
+        )
 
 
 class KnowledgeBase:
@@ -56,15 +184,42 @@ class KnowledgeBase:
         
         # Indexes for fast lookup
         self._incident_by_type: Dict[IncidentType, List[str]] = defaultdict(list)
-        self._incident_by_resource: Dict[str, List[str]] = defaultdict(list)
-        self._incident_by_fingerprint: Dict[str, List[str]] = defaultdict(list)
-        self._remediation_success_rate: Dict[Tuple[IncidentType, RemediationAction], List[bool]] = defaultdict(list)
+        self._incident_by_fingerprint: Dict[str, _FingerprintBucket] = defaultdict(_FingerprintBucket)
+        self._fingerprint_by_incident: Dict[str, str] = {}
+        self._patterns_by_type_action: Dict[Tuple[IncidentType, RemediationAction], List[Pattern]] = defaultdict(list)
+        
+        # Kept up to date on writes so get_stats does no scanning
+        self._count_by_type: Counter = Counter()
+        self._top_patterns: Optional[List[Dict[str, Any]]] = None  # None = recompute
+        # get_recommended_actions results; an incident type's entry is dropped
+        # whenever its success rates or patterns change
+        self._recommendations: Dict[IncidentType, List[Tuple[RemediationAction, float]]] = {}
+        # (incident type, action) -> [successes, attempts]
+        self._remediation_success_rate: Dict[Tuple[IncidentType, RemediationAction], List[int]] = defaultdict(lambda: [0, 0])
         
         # Pattern detection thresholds
         self.min_occurrences_for_pattern = 3
         self.similarity_threshold = 0.8
         self.pattern_decay_days = 90  # Patterns older than this lose weight
         
+        # incidents.jsonl stays open for appends; writes are buffered and flushed
+        # at most every flush_interval_seconds (and on flush()/close())
+        self.flush_interval_seconds = 1.0
+        self._incidents_file = None
+        self._last_flush = 0.0
+        
+        # Background writer (see start_writer); without it saves happen inline
+        self.write_batch_size = 256
+        self.write_batch_seconds = 0.05
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # Changed patterns not yet on disk; with the writer running, patterns.json
+        # is rewritten at most once per patterns_save_delay_seconds
+        self.patterns_save_delay_seconds = 5.0
+        self._dirty_patterns: Set[str] = set()
+        self._patterns_save_scheduled = False
+        
         self._load_from_storage()
     
     def _load_from_storage(self):
@@ -76,10 +231,10 @@ class KnowledgeBase:
         # Load incidents
         incidents_file = self.storage_path / "incidents.jsonl"
         if incidents_file.exists():
-            with open(incidents_file) as f:
+            with open(incidents_file, "rb") as f:
                 for line in f:
                     try:
-                        data = json.loads(line)
+                        data = orjson.loads(line)
                         incident = self._dict_to_incident(data)
                         self._index_incident(incident)
                     except Exception as e:
@@ -88,44 +243,164 @@ class KnowledgeBase:
         # Load patterns
         patterns_file = self.storage_path / "patterns.json"
         if patterns_file.exists():
-            with open(patterns_file) as f:
-                data = json.load(f)
-                for p_data in data:
-                    pattern = Pattern(**p_data)
-                    self.patterns[pattern.id] = pattern
+            for p_data in orjson.loads(patterns_file.read_bytes()):
+                pattern = Pattern(**p_data)
+                # patterns.json stores enum values and ISO timestamps
+                pattern.incident_types = tuple(IncidentType(t) for t in pattern.incident_types)
+                pattern.recommended_actions = tuple(RemediationAction(a) for a in pattern.recommended_actions)
+                if pattern.last_seen:
+                    pattern.last_seen = datetime.fromisoformat(pattern.last_seen)
+                self._add_pattern(pattern)
+            self._migrate_pattern_names()
         
         logger.info(f"Loaded {len(self.incidents)} incidents, {len(self.patterns)} patterns")
     
+    def _migrate_pattern_names(self):
+        """Rename patterns saved under legacy fingerprint hashes so _detect_patterns finds them again"""
+        first_incidents = {
+            fp_hash: self.incidents[bucket.ids[0]]
+            for fp_hash, bucket in self._incident_by_fingerprint.items()
+            if bucket.ids and bucket.ids[0] in self.incidents
+        }
+        taken = {p.name for p in self.patterns.values()}
+        current_names = {f"{incident.type.value}_{fp_hash}" for fp_hash, incident in first_incidents.items()}
+        stale = [p for p in self.patterns.values() if p.name not in current_names]
+        if not stale:
+            return
+        
+        legacy_names = {}
+        for fp_hash, incident in first_incidents.items():
+            labels = incident.resource.labels if incident.resource else {}
+            for legacy_hash in self._compute_fingerprint(incident).legacy_hashes(labels):
+                legacy_names[f"{incident.type.value}_{legacy_hash}"] = f"{incident.type.value}_{fp_hash}"
+        
+        renamed = []
+        for pattern in stale:
+            new_name = legacy_names.get(pattern.name)
+            if new_name is not None and new_name not in taken:
+                logger.info(f"Renamed pattern {pattern.name} to {new_name}")
+                pattern.name = new_name
+                taken.add(new_name)
+                renamed.append(pattern.id)
+        self._save_patterns(renamed)
+    
     def _save_incident(self, incident: Incident):
         """Append incident to storage"""
-        self.storage_path.mkdir(parents=True, exist_ok=True)
-        incidents_file = self.storage_path / "incidents.jsonl"
+        line = orjson.dumps(self._incident_to_dict(incident), option=orjson.OPT_NON_STR_KEYS) + b"\n"
+        if self._writer_task is None:
+            self._write_incident_lines([line])
+        else:
+            self._enqueue_write(line)
+    
+    def _write_incident_lines(self, lines: List[bytes]):
+        if self._incidents_file is None:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            self._incidents_file = open(self.storage_path / "incidents.jsonl", "ab", buffering=1 << 16)
         
-        with open(incidents_file, "a") as f:
-            f.write(json.dumps(self._incident_to_dict(incident)) + "\n")
+        self._incidents_file.write(b"".join(lines))
+        if time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+            self.flush()
     
-    def _save_patterns(self):
-        """Save all patterns to storage"""
-        self.storage_path.mkdir(parents=True, exist_ok=True)
-        patterns_file = self.storage_path / "patterns.json"
+    def flush(self):
+        """Write buffered incident appends to disk"""
+        if self._incidents_file is not None:
+            self._incidents_file.flush()
+        self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Flush and release the incidents file handle"""
+        if self._incidents_file is not None:
+            self.flush()
+            self._incidents_file.close()
+            self._incidents_file = None
+    
+    def _save_patterns(self, pattern_ids: Iterable[str]):
+        """Mark patterns as changed and schedule a save of patterns.json"""
+        pattern_ids = list(pattern_ids)
+        if pattern_ids:
+            self._top_patterns = None
+            for pattern_id in pattern_ids:
+                for incident_type in self.patterns[pattern_id].incident_types:
+                    self._recommendations.pop(incident_type, None)
+        self._dirty_patterns.update(pattern_ids)
+        if not self._dirty_patterns:
+            return
         
-        patterns_data = []
-        for pattern in self.patterns.values():
-            patterns_data.append({
-                "id": pattern.id,
-                "name": pattern.name,
-                "description": pattern.description,
-                "incident_types": [t.value for t in pattern.incident_types],
-                "indicators": pattern.indicators,
-                "recommended_actions": [a.value for a in pattern.recommended_actions],
-                "success_rate": pattern.success_rate,
-                "occurrence_count": pattern.occurrence_count,
-                "last_seen": pattern.last_seen.isoformat() if pattern.last_seen else None,
-                "confidence": pattern.confidence,
-            })
-        
-        with open(patterns_file, "w") as f:
-            json.dump(patterns_data, f, indent=2)
+        if self._writer_task is None:
+            self._dirty_patterns.clear()
+            self._write_patterns(self._patterns_to_json())
+        elif not self._patterns_save_scheduled:
+            self._patterns_save_scheduled = True
+            loop = self._writer_task.get_loop()
+            loop.call_soon_threadsafe(
+                loop.call_later, self.patterns_save_delay_seconds, self._write_queue.put_nowait, _SAVE_PATTERNS
+            )
+    
+    def _patterns_to_json(self) -> bytes:
+        # orjson serializes the Pattern dataclasses directly: enums as values, datetimes as ISO 8601
+        return orjson.dumps(list(self.patterns.values()), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    
+    def _write_patterns(self, patterns_json: bytes):
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        (self.storage_path / "patterns.json").write_bytes(patterns_json)
+    
+    def start_writer(self):
+        """Move persistence to a background task (call from the running loop)"""
+        if self._writer_task is None:
+            self._write_queue = asyncio.Queue()
+            self._writer_task = asyncio.get_running_loop().create_task(self._writer_loop())
+    
+    async def stop_writer(self):
+        """Write everything queued so far and stop the background writer"""
+        if self._writer_task is not None:
+            # Queued behind any saves still in flight from call_soon_threadsafe
+            if self._dirty_patterns:
+                self._enqueue_write(_SAVE_PATTERNS)
+            self._enqueue_write(_STOP_WRITER)
+            await self._writer_task
+            self._writer_task = None
+            self._patterns_save_scheduled = False
+    
+    def _enqueue_write(self, item):
+        # Saves may come from threadpool threads; asyncio.Queue is not thread-safe
+        self._writer_task.get_loop().call_soon_threadsafe(self._write_queue.put_nowait, item)
+    
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            # Collect up to write_batch_size items or write_batch_seconds, then write once
+            batch = [await self._write_queue.get()]
+            deadline = loop.time() + self.write_batch_seconds
+            while len(batch) < self.write_batch_size and batch[-1] is not _STOP_WRITER:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            stopping = batch[-1] is _STOP_WRITER
+            lines = [item for item in batch if isinstance(item, bytes)]
+            # Snapshot patterns on the loop, where they are mutated; write in a worker thread
+            patterns_json = None
+            if _SAVE_PATTERNS in batch:
+                self._patterns_save_scheduled = False
+                if self._dirty_patterns:
+                    self._dirty_patterns.clear()
+                    patterns_json = self._patterns_to_json()
+            try:
+                await asyncio.to_thread(self._write_batch, lines, patterns_json)
+            except Exception as e:
+                logger.error(f"Failed to persist knowledge base: {e}")
+    
+    def _write_batch(self, lines: List[bytes], patterns_json: Optional[bytes]):
+        if lines:
+            self._write_incident_lines(lines)
+            self.flush()
+        if patterns_json is not None:
+            self._write_patterns(patterns_json)
     
     def _incident_to_dict(self, incident: Incident) -> Dict:
         """Convert incident to serializable dict"""
@@ -141,9 +416,10 @@ class KnowledgeBase:
             } if incident.resource else None,
             "message": incident.message,
             "details": incident.details,
-            "occurred_at": incident.occurred_at.isoformat(),
-            "detected_at": incident.detected_at.isoformat(),
-            "resolved_at": incident.resolved_at.isoformat() if incident.resolved_at else None,
+            # Epoch seconds, so loading skips ISO 8601 parsing
+            "occurred_at": _to_epoch_seconds(incident.occurred_at),
+            "detected_at": _to_epoch_seconds(incident.detected_at),
+            "resolved_at": _to_epoch_seconds(incident.resolved_at),
             "root_cause": incident.root_cause,
             "tags": incident.tags,
         }
@@ -166,9 +442,9 @@ class KnowledgeBase:
             resource=resource,
             message=data["message"],
             details=data.get("details", {}),
-            occurred_at=datetime.fromisoformat(data["occurred_at"]),
-            detected_at=datetime.fromisoformat(data["detected_at"]),
-            resolved_at=datetime.fromisoformat(data["resolved_at"]) if data.get("resolved_at") else None,
+            occurred_at=_from_epoch_seconds(data["occurred_at"]),
+            detected_at=_from_epoch_seconds(data["detected_at"]),
+            resolved_at=_from_epoch_seconds(data.get("resolved_at")),
             root_cause=data.get("root_cause"),
             tags=data.get("tags", []),
         )
@@ -178,9 +454,7 @@ class KnowledgeBase:
         resource = incident.resource or KubernetesResource(kind="Unknown", name="", namespace="default")
         
         # Hash sorted labels
-        label_items = sorted(resource.labels.items())
-        label_str = "|".join(f"{k}={v}" for k, v in label_items)
-        label_hash = hashlib.md5(label_str.encode()).hexdigest()[:8]
+        label_hash = _label_hash(frozenset(resource.labels.items()))
         
         # Normalize error message to pattern
         error_pattern = self._normalize_error_message(incident.message)
@@ -195,40 +469,36 @@ class KnowledgeBase:
     
     def _normalize_error_message(self, message: str) -> str:
         """Normalize error message to a pattern by removing variable parts"""
-        import re
-        
-        # Remove UUIDs
-        normalized = re.sub(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", "<UUID>", message)
-        
-        # Remove timestamps
-        normalized = re.sub(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}", "<TIMESTAMP>", normalized)
-        
-        # Remove IP addresses
-        normalized = re.sub(r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}", "<IP>", normalized)
-        
-        # Remove numbers (but keep error codes)
-        normalized = re.sub(r"(?<![A-Z])\d{3,}(?![A-Z])", "<NUM>", normalized)
-        
-        # Remove pod-specific suffixes
-        normalized = re.sub(r"-[a-z0-9]{5,10}(-[a-z0-9]{5})?", "-<POD_SUFFIX>", normalized)
-        
-        return normalized.lower().strip()
+        return _normalize_message(message)
     
-    def _index_incident(self, incident: Incident):
-        """Add incident to all indexes"""
+    def _index_incident(self, incident: Incident) -> str:
+        """Add incident to all indexes; returns its fingerprint hash"""
         self.incidents[incident.id] = incident
         
         # Index by type
         self._incident_by_type[incident.type].append(incident.id)
-        
-        # Index by resource
-        if incident.resource:
-            resource_key = f"{incident.resource.kind}/{incident.resource.namespace}/{incident.resource.name}"
-            self._incident_by_resource[resource_key].append(incident.id)
+        self._count_by_type[incident.type.value] += 1
         
         # Index by fingerprint
-        fingerprint = self._compute_fingerprint(incident)
-        self._incident_by_fingerprint[fingerprint.to_hash()].append(incident.id)
+        fp_hash = self._compute_fingerprint(incident).to_hash()
+        self._fingerprint_by_incident[incident.id] = fp_hash
+        self._incident_by_fingerprint[fp_hash].append(incident.id, incident.occurred_at)
+        return fp_hash
+    
+    def _add_pattern(self, pattern: Pattern):
+        """Store a pattern and index it by each (incident type, action) it covers"""
+        self.patterns[pattern.id] = pattern
+        self._top_patterns = None
+        for incident_type in pattern.incident_types:
+            for action in pattern.recommended_actions:
+                self._patterns_by_type_action[(incident_type, action)].append(pattern)
+    
+    def _fingerprint_hash(self, incident: Incident) -> str:
+        """Fingerprint hash of an incident, reusing the one computed at indexing"""
+        fp_hash = self._fingerprint_by_incident.get(incident.id)
+        if fp_hash is None:
+            fp_hash = self._compute_fingerprint(incident).to_hash()
+        return fp_hash
     
     def record_incident(self, incident: Incident) -> str:
         """
@@ -236,11 +506,11 @@ class KnowledgeBase:
         
         Returns the incident ID.
         """
-        self._index_incident(incident)
+        fp_hash = self._index_incident(incident)
         self._save_incident(incident)
         
         # Trigger pattern detection
-        self._detect_patterns(incident)
+        self._detect_patterns(incident, fp_hash)
         
         logger.info(f"Recorded incident {incident.id}: {incident.type.value} - {incident.message[:50]}")
         return incident.id
@@ -254,8 +524,12 @@ class KnowledgeBase:
             incident = self.incidents.get(remediation.incident_id)
             if incident:
                 key = (incident.type, remediation.action)
-                success = remediation.outcome in (RemediationOutcome.SUCCESS, RemediationOutcome.PARTIAL_SUCCESS)
-                self._remediation_success_rate[key].append(success)
+                outcome = remediation.outcome
+                success = outcome is RemediationOutcome.SUCCESS or outcome is RemediationOutcome.PARTIAL_SUCCESS
+                stats = self._remediation_success_rate[key]
+                stats[0] += success
+                stats[1] += 1
+                self._recommendations.pop(incident.type, None)
                 
                 # Update pattern success rates
                 self._update_pattern_success_rates(incident.type, remediation.action, success)
@@ -269,22 +543,26 @@ class KnowledgeBase:
         max_age_days: int = 90
     ) -> List[Incident]:
         """Find incidents similar to the given one"""
-        fingerprint = self._compute_fingerprint(incident)
-        similar_ids = self._incident_by_fingerprint.get(fingerprint.to_hash(), [])
+        bucket = self._incident_by_fingerprint.get(self._fingerprint_hash(incident))
+        if not bucket:
+            return []
         
-        cutoff = datetime.utcnow() - timedelta(days=max_age_days)
-        similar = []
+        # Age filter and recency order run over the bucket's timestamp array
+        times = bucket.times
+        rows = np.flatnonzero(times >= _epoch_us(datetime.utcnow() - timedelta(days=max_age_days)))
+        rows = rows[np.argsort(-times[rows], kind="stable")]
         
-        for inc_id in similar_ids:
+        similar = []
+        for row in rows:
+            inc_id = bucket.ids[row]
             if inc_id == incident.id:
                 continue
             inc = self.incidents.get(inc_id)
-            if inc and inc.occurred_at >= cutoff:
+            if inc:
                 similar.append(inc)
-        
-        # Sort by recency
-        similar.sort(key=lambda x: x.occurred_at, reverse=True)
-        return similar[:max_results]
+                if len(similar) == max_results:
+                    break
+        return similar
     
     def get_recommended_actions(
         self, 
@@ -293,35 +571,44 @@ class KnowledgeBase:
         """
         Get recommended remediation actions for an incident type,
         sorted by historical success rate.
+        
+        The list is cached until the type's statistics change; don't mutate it.
         """
+        recommendations = self._recommendations.get(incident_type)
+        if recommendations is not None:
+            return recommendations
+        
         recommendations = []
         
-        for (inc_type, action), outcomes in self._remediation_success_rate.items():
-            if inc_type == incident_type and len(outcomes) >= 2:
-                success_rate = sum(outcomes) / len(outcomes)
-                recommendations.append((action, success_rate))
+        for (inc_type, action), (successes, attempts) in self._remediation_success_rate.items():
+            if inc_type == incident_type and attempts >= 2:
+                recommendations.append((action, successes / attempts))
+        seen = {action for action, _ in recommendations}
         
         # Also check patterns
         for pattern in self.patterns.values():
             if incident_type in pattern.incident_types:
                 for action in pattern.recommended_actions:
-                    # Check if already in recommendations
-                    existing = [r for r in recommendations if r[0] == action]
-                    if not existing:
+                    # Skip actions already recommended
+                    if action not in seen:
+                        seen.add(action)
                         recommendations.append((action, pattern.success_rate))
         
         # Sort by success rate descending
         recommendations.sort(key=lambda x: x[1], reverse=True)
+        self._recommendations[incident_type] = recommendations
         return recommendations
     
-    def _detect_patterns(self, new_incident: Incident):
+    def _detect_patterns(self, new_incident: Incident, fp_hash: Optional[str] = None):
         """Detect new patterns from accumulated incidents"""
-        fingerprint = self._compute_fingerprint(new_incident)
-        similar_ids = self._incident_by_fingerprint.get(fingerprint.to_hash(), [])
+        if fp_hash is None:
+            fp_hash = self._fingerprint_hash(new_incident)
+        bucket = self._incident_by_fingerprint.get(fp_hash)
+        similar_ids = bucket.ids if bucket else []
         
         if len(similar_ids) >= self.min_occurrences_for_pattern:
             # Check if pattern already exists
-            pattern_name = f"{new_incident.type.value}_{fingerprint.to_hash()}"
+            pattern_name = f"{new_incident.type.value}_{fp_hash}"
             existing_pattern = None
             
             for p in self.patterns.values():
@@ -331,6 +618,7 @@ class KnowledgeBase:
             
             if existing_pattern:
                 # Update existing pattern
+                pattern = existing_pattern
                 existing_pattern.occurrence_count = len(similar_ids)
                 existing_pattern.last_seen = datetime.utcnow()
                 existing_pattern.confidence = min(1.0, len(similar_ids) / 10)  # Max confidence at 10 occurrences
@@ -343,7 +631,7 @@ class KnowledgeBase:
                 pattern = Pattern(
                     name=pattern_name,
                     description=f"Auto-detected pattern for {new_incident.type.value} incidents",
-                    incident_types=[new_incident.type],
+                    incident_types=(new_incident.type,),
                     indicators=indicators,
                     recommended_actions=self._infer_actions(new_incident.type),
                     success_rate=0.5,  # Start with neutral
@@ -352,10 +640,10 @@ class KnowledgeBase:
                     confidence=len(similar_ids) / 10,
                 )
                 
-                self.patterns[pattern.id] = pattern
+                self._add_pattern(pattern)
                 logger.info(f"Detected new pattern: {pattern.name}")
             
-            self._save_patterns()
+            self._save_patterns([pattern.id])
     
     def _extract_indicators(self, incidents: List[Incident]) -> Dict[str, Any]:
         """Extract common indicators from a set of similar incidents"""
@@ -378,15 +666,13 @@ class KnowledgeBase:
         # Find common labels
         all_labels = [i.resource.labels for i in incidents if i.resource]
         if all_labels:
-            common_keys = set.intersection(*[set(l.keys()) for l in all_labels])
-            for key in common_keys:
-                values = [l[key] for l in all_labels]
-                if len(set(values)) == 1:
-                    indicators["common_labels"][key] = values[0]
+            first, rest = all_labels[0], all_labels[1:]
+            for key, value in first.items():
+                if all(l.get(key, _MISSING) == value for l in rest):
+                    indicators["common_labels"][key] = value
         
         # Most common severity
-        severities = [i.severity for i in incidents]
-        indicators["typical_severity"] = max(set(severities), key=severities.count).value
+        indicators["typical_severity"] = Counter(i.severity for i in incidents).most_common(1)[0][0].value
         
         # Average duration
         durations = [i.duration_seconds for i in incidents if i.duration_seconds]
@@ -396,36 +682,13 @@ class KnowledgeBase:
         # Common root causes
         root_causes = [i.root_cause for i in incidents if i.root_cause]
         if root_causes:
-            cause_counts = defaultdict(int)
-            for cause in root_causes:
-                cause_counts[cause] += 1
-            indicators["common_root_causes"] = sorted(
-                cause_counts.keys(), 
-                key=lambda x: cause_counts[x], 
-                reverse=True
-            )[:3]
+            indicators["common_root_causes"] = [cause for cause, _ in Counter(root_causes).most_common(3)]
         
         return indicators
     
-    def _infer_actions(self, incident_type: IncidentType) -> List[RemediationAction]:
+    def _infer_actions(self, incident_type: IncidentType) -> Tuple[RemediationAction, ...]:
         """Infer recommended actions based on incident type"""
-        action_map = {
-            IncidentType.OOM_KILL: [RemediationAction.SCALE_MEMORY_UP, RemediationAction.RESTART_POD],
-            IncidentType.CRASH_LOOP: [RemediationAction.RESTART_POD, RemediationAction.ROLLBACK_DEPLOYMENT],
-            IncidentType.IMAGE_PULL_FAIL: [RemediationAction.NO_ACTION],  # Usually needs manual fix
-            IncidentType.READINESS_FAIL: [RemediationAction.RESTART_POD],
-            IncidentType.LIVENESS_FAIL: [RemediationAction.RESTART_POD],
-            IncidentType.NODE_NOT_READY: [RemediationAction.CORDON_NODE, RemediationAction.DRAIN_NODE],
-            IncidentType.NODE_MEMORY_PRESSURE: [RemediationAction.DRAIN_NODE],
-            IncidentType.NODE_DISK_PRESSURE: [RemediationAction.DRAIN_NODE],
-            IncidentType.RESOURCE_EXHAUSTION: [RemediationAction.SCALE_REPLICAS_UP, RemediationAction.SCALE_CPU_UP],
-            IncidentType.EVICTION: [RemediationAction.SCALE_MEMORY_UP],
-            IncidentType.PENDING_POD: [RemediationAction.SCALE_REPLICAS_DOWN],
-            IncidentType.SCALING_ISSUE: [RemediationAction.SCALE_REPLICAS_UP],
-            IncidentType.DEPLOYMENT_FAIL: [RemediationAction.ROLLBACK_DEPLOYMENT],
-        }
-        
-        return action_map.get(incident_type, [RemediationAction.NOTIFY_ONLY])
+        return _ACTIONS_BY_INCIDENT_TYPE.get(incident_type, (RemediationAction.NOTIFY_ONLY,))
     
     def _update_pattern_success_rates(
         self, 
@@ -434,13 +697,14 @@ class KnowledgeBase:
         success: bool
     ):
         """Update success rates in patterns that match this incident type"""
-        for pattern in self.patterns.values():
-            if incident_type in pattern.incident_types and action in pattern.recommended_actions:
-                # Exponential moving average
-                alpha = 0.1  # Learning rate
-                pattern.success_rate = alpha * (1.0 if success else 0.0) + (1 - alpha) * pattern.success_rate
-        
-        self._save_patterns()
+        # Exponential moving average over just the patterns indexed under this pair
+        alpha = 0.1  # Learning rate
+        target = 1.0 if success else 0.0
+        matching = self._patterns_by_type_action.get((incident_type, action), [])
+        for pattern in matching:
+            pattern.success_rate = alpha * target + (1 - alpha) * pattern.success_rate
+        
+        self._save_patterns([pattern.id for pattern in matching])
     
     def get_stats(self) -> Dict[str, Any]:
         """Get knowledge base statistics"""
@@ -448,11 +712,15 @@ class KnowledgeBase:
             "total_incidents": len(self.incidents),
             "total_patterns": len(self.patterns),
             "total_remediations": len(self.remediations),
-            "incidents_by_type": {
-                t.value: len(ids) for t, ids in self._incident_by_type.items()
-            },
-            "top_patterns": [
-                {"name": p.name, "occurrences": p.occurrence_count, "success_rate": p.success_rate}
-                for p in sorted(self.patterns.values(), key=lambda x: x.occurrence_count, reverse=True)[:5]
-            ],
+            "incidents_by_type": dict(self._count_by_type),
+            "top_patterns": self._get_top_patterns(),
         }
+    
+    def _get_top_patterns(self) -> List[Dict[str, Any]]:
+        # Rebuilt only after a pattern changed (see _save_patterns/_add_pattern)
+        if self._top_patterns is None:
+            self._top_patterns = [
+                {"name": p.name, "occurrences": p.occurrence_count, "success_rate": p.success_rate}
+                for p in heapq.nlargest(5, self.patterns.values(), key=lambda x: x.occurrence_count)
+            ]
+        return self._top_patterns
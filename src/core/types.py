@@ -1,13 +1,64 @@
 """Core data types for Kratos AI"""
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional
-import uuid
+from enum import Enum, EnumMeta
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Tuple
+import bisect
+import os
+import sys
 
 
-class IncidentSeverity(str, Enum):
+_TICK_NOW: ContextVar[Optional[datetime]] = ContextVar("kratos_tick_now", default=None)
+
+
+def utc_now() -> datetime:
+    """Current UTC time, frozen for the duration of an ingest_tick()"""
+    now = _TICK_NOW.get()
+    return now if now is not None else datetime.utcnow()
+
+
+@contextmanager
+def ingest_tick():
+    """Stamp every record created inside the block with the same instant"""
+    token = _TICK_NOW.set(datetime.utcnow())
+    try:
+        yield
+    finally:
+        _TICK_NOW.reset(token)
+
+
+def _new_id() -> str:
+    """Random RFC 4122 version 4 id string, without building a uuid.UUID"""
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40
+    b[8] = (b[8] & 0x3F) | 0x80
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+class FastEnumMeta(EnumMeta):
+    """EnumMeta whose value lookups are a single dict get on the prebuilt value map"""
+    
+    def __call__(cls, value, *args, **kwargs):
+        if not args and not kwargs:
+            try:
+                member = cls._value2member_map_.get(value)
+            except TypeError:  # unhashable value: let Enum raise
+                member = None
+            if member is not None:
+                return member
+        return super().__call__(value, *args, **kwargs)
+
+
+class FastStrEnum(str, Enum, metaclass=FastEnumMeta):
+    """str-valued Enum with fast construction from its wire value"""
+
+
+class IncidentSeverity(FastStrEnum):
     """Severity levels for incidents"""
     CRITICAL = "critical"    # Service down, data loss risk
     HIGH = "high"            # Degraded performance, partial outage
@@ -16,7 +67,7 @@ class IncidentSeverity(str, Enum):
     INFO = "info"            # Normal observations, learning data
 
 
-class IncidentType(str, Enum):
+class IncidentType(FastStrEnum):
     """Types of Kubernetes incidents"""
     OOM_KILL = "oom_kill"
     CRASH_LOOP = "crash_loop"
@@ -38,7 +89,7 @@ class IncidentType(str, Enum):
     UNKNOWN = "unknown"
 
 
-class PredictionConfidence(str, Enum):
+class PredictionConfidence(FastStrEnum):
     """Confidence levels for predictions"""
     VERY_HIGH = "very_high"  # >95% confidence
     HIGH = "high"            # 85-95% confidence
@@ -47,7 +98,7 @@ class PredictionConfidence(str, Enum):
     UNCERTAIN = "uncertain"  # <50% confidence
 
 
-class RemediationAction(str, Enum):
+class RemediationAction(FastStrEnum):
     """Types of remediation actions"""
     # Resource adjustments
     SCALE_MEMORY_UP = "scale_memory_up"
@@ -87,7 +138,7 @@ class RemediationAction(str, Enum):
     NO_ACTION = "no_action"
 
 
-class RemediationOutcome(str, Enum):
+class RemediationOutcome(FastStrEnum):
     """Outcome of a remediation attempt"""
     SUCCESS = "success"
     PARTIAL_SUCCESS = "partial_success"
@@ -98,7 +149,7 @@ class RemediationOutcome(str, Enum):
     DRY_RUN = "dry_run"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResourceMetrics:
     """Resource usage metrics snapshot"""
     cpu_usage_cores: float
@@ -111,24 +162,31 @@ class ResourceMetrics:
     network_tx_bytes: int = 0
     storage_usage_bytes: int = 0
     storage_limit_bytes: int = 0
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp: datetime = field(default_factory=utc_now)
     
-    @property
-    def cpu_utilization(self) -> float:
-        """CPU utilization as percentage of limit"""
-        if self.cpu_limit_cores == 0:
-            return 0.0
-        return (self.cpu_usage_cores / self.cpu_limit_cores) * 100
+    # Percentages of limit, computed once; the snapshot is frozen so they cannot go stale
+    cpu_utilization: float = field(init=False, default=0.0)
+    memory_utilization: float = field(init=False, default=0.0)
     
-    @property
-    def memory_utilization(self) -> float:
-        """Memory utilization as percentage of limit"""
-        if self.memory_limit_bytes == 0:
-            return 0.0
-        return (self.memory_usage_bytes / self.memory_limit_bytes) * 100
+    def __post_init__(self):
+        if self.cpu_limit_cores != 0:
+            object.__setattr__(self, "cpu_utilization", (self.cpu_usage_cores / self.cpu_limit_cores) * 100)
+        if self.memory_limit_bytes != 0:
+            object.__setattr__(self, "memory_utilization", (self.memory_usage_bytes / self.memory_limit_bytes) * 100)
+
+
+def _interned_string_map(mapping: Dict[str, str]) -> Dict[str, str]:
+    """Copy of a label/annotation dict with interned keys and values"""
+    if not mapping:
+        return mapping
+    try:
+        # Each resource keeps its own dict; only the repeated strings are shared
+        return {sys.intern(k): sys.intern(v) for k, v in mapping.items()}
+    except TypeError:  # non-string values: keep as given
+        return mapping
 
 
-@dataclass
+@dataclass(slots=True)
 class KubernetesResource:
     """Represents a Kubernetes resource"""
     kind: str                    # Pod, Deployment, Node, etc.
@@ -138,23 +196,27 @@ class KubernetesResource:
     annotations: Dict[str, str] = field(default_factory=dict)
     uid: str = ""
     created_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        self.labels = _interned_string_map(self.labels)
+        self.annotations = _interned_string_map(self.annotations)
 
 
-@dataclass
+@dataclass(slots=True)
 class Incident:
     """Represents a Kubernetes incident"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     type: IncidentType = IncidentType.UNKNOWN
     severity: IncidentSeverity = IncidentSeverity.MEDIUM
     resource: Optional[KubernetesResource] = None
     message: str = ""
     details: Dict[str, Any] = field(default_factory=dict)
     metrics_snapshot: Optional[ResourceMetrics] = None
-    occurred_at: datetime = field(default_factory=datetime.utcnow)
-    detected_at: datetime = field(default_factory=datetime.utcnow)
+    occurred_at: datetime = field(default_factory=utc_now)
+    detected_at: datetime = field(default_factory=utc_now)
     resolved_at: Optional[datetime] = None
     root_cause: Optional[str] = None
-    related_incidents: List[str] = field(default_factory=list)
+    related_incidents: Tuple[str, ...] = ()
     tags: List[str] = field(default_factory=list)
     
     @property
@@ -168,10 +230,10 @@ class Incident:
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Prediction:
     """A prediction of a future incident"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     incident_type: IncidentType = IncidentType.UNKNOWN
     target_resource: Optional[KubernetesResource] = None
     probability: float = 0.0
@@ -181,7 +243,7 @@ class Prediction:
     similar_incidents: List[str] = field(default_factory=list)  # IDs of similar past incidents
     model_name: str = ""
     model_version: str = ""
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
     expires_at: Optional[datetime] = None
     
     @property
@@ -191,7 +253,7 @@ class Prediction:
         return None
 
 
-@dataclass  
+@dataclass(slots=True)  
 class ExplanationStep:
     """A single step in an explanation chain"""
     step_number: int
@@ -201,27 +263,41 @@ class ExplanationStep:
     confidence: float = 1.0
 
 
-@dataclass
+_STEP_NUMBER = attrgetter("step_number")
+
+
+@dataclass(slots=True)
 class Explanation:
     """Full explanation for a remediation action"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     summary: str = ""  # One-line summary
     steps: List[ExplanationStep] = field(default_factory=list)
     risk_assessment: str = ""
     alternative_actions: List[str] = field(default_factory=list)
     rollback_plan: str = ""
     references: List[str] = field(default_factory=list)  # Links to docs, runbooks
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
+    
+    def add_step(self, step: ExplanationStep):
+        """Add a step, keeping steps ordered by step_number"""
+        steps = self.steps
+        if steps and step.step_number < steps[-1].step_number:
+            bisect.insort(steps, step, key=_STEP_NUMBER)
+        else:
+            steps.append(step)
     
     def to_human_readable(self) -> str:
         """Convert explanation to human-readable text"""
         lines = [f"Summary: {self.summary}", ""]
         
-        for step in sorted(self.steps, key=lambda s: s.step_number):
+        # Steps are normally already in order; only sort when they are not
+        steps = self.steps
+        if any(a.step_number > b.step_number for a, b in zip(steps, steps[1:])):
+            steps = sorted(steps, key=_STEP_NUMBER)
+        
+        for step in steps:
             lines.append(f"{step.step_number}. [{step.category.upper()}] {step.content}")
-            if step.evidence:
-                for ev in step.evidence:
-                    lines.append(f"   - Evidence: {ev}")
+            lines.extend(f"   - Evidence: {ev}" for ev in step.evidence)
         
         if self.risk_assessment:
             lines.extend(["", f"Risk Assessment: {self.risk_assessment}"])
@@ -232,10 +308,10 @@ class Explanation:
         return "\n".join(lines)
 
 
-@dataclass
+@dataclass(slots=True)
 class Remediation:
     """A remediation action taken or planned"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     action: RemediationAction = RemediationAction.NO_ACTION
     target_resource: Optional[KubernetesResource] = None
     incident_id: Optional[str] = None
@@ -257,18 +333,19 @@ class Remediation:
     
     @property
     def is_successful(self) -> bool:
-        return self.outcome in (RemediationOutcome.SUCCESS, RemediationOutcome.DRY_RUN)
+        outcome = self.outcome
+        return outcome is RemediationOutcome.SUCCESS or outcome is RemediationOutcome.DRY_RUN
 
 
-@dataclass
+@dataclass(slots=True)
 class Pattern:
     """A learned pattern from incidents"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=_new_id)
     name: str = ""
     description: str = ""
-    incident_types: List[IncidentType] = field(default_factory=list)
+    incident_types: Tuple[IncidentType, ...] = ()
     indicators: Dict[str, Any] = field(default_factory=dict)  # What to look for
-    recommended_actions: List[RemediationAction] = field(default_factory=list)
+    recommended_actions: Tuple[RemediationAction, ...] = ()
     success_rate: float = 0.0
     occurrence_count: int = 0
     last_seen: Optional[datetime] = None
@@ -1,6 +1,6 @@
 """Kratos AI - Self-Healing Kubernetes Intelligence"""
 
-from .core import (
+from core import (
     KratosBrain,
     KnowledgeBase,
     Incident,
@@ -1,17 +1,23 @@
 """ML Predictors for Failure Prediction"""
 
 import logging
-from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
+import functools
+import math
 import numpy as np
-from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
+# NumPy functions called once or more per prediction, bound once
+_np_array = np.array
+_np_concatenate = np.concatenate
+_np_dot = np.dot
 
-@dataclass
+
+@dataclass(slots=True)
 class PredictionResult:
     """Result from a prediction model"""
     predicted: bool              # Whether an incident is predicted
@@ -22,9 +28,10 @@ class PredictionResult:
     model_name: str
     model_version: str
     computed_at: datetime = field(default_factory=datetime.utcnow)
+    signal_probabilities: Optional[Tuple[float, ...]] = None  # Per-signal inputs of an ensemble
 
 
-class BasePredictor(ABC):
+class BasePredictor:
     """Base class for all predictors"""
     
     def __init__(self, name: str, version: str = "1.0.0"):
@@ -34,15 +41,17 @@ class BasePredictor(ABC):
         self.last_trained_at: Optional[datetime] = None
         self.training_samples = 0
     
-    @abstractmethod
     def train(self, data: List[Dict[str, Any]]) -> None:
         """Train the model on historical data"""
-        pass
+        raise NotImplementedError
     
-    @abstractmethod
     def predict(self, features: Dict[str, Any]) -> PredictionResult:
         """Make a prediction based on current features"""
-        pass
+        raise NotImplementedError
+    
+    def predict_batch(self, features_batch: List[Dict[str, Any]]) -> List[PredictionResult]:
+        """Predict for many feature dicts; override when a model can do it in one pass"""
+        return [self.predict(features) for features in features_batch]
     
     def get_info(self) -> Dict[str, Any]:
         """Get model information"""
@@ -55,6 +64,110 @@ class BasePredictor(ABC):
         }
 
 
+class _RollingWindow:
+    """Fixed-size ring buffer for one metric with O(1) running mean/std/min/max"""
+    
+    __slots__ = ("values", "size", "count", "min", "max", "_idx", "_shift", "_sum", "_sumsq", "_since_resync")
+    
+    def __init__(self, size: int):
+        self.values = np.empty(size, dtype=np.float64)
+        self.size = size
+        self.count = 0
+        self.min = self.max = 0.0
+        self._idx = 0
+        # Sums are kept relative to the first value to limit cancellation in sumsq
+        self._shift = 0.0
+        self._sum = self._sumsq = 0.0
+        self._since_resync = 0
+    
+    def push(self, value: float):
+        if self.count == 0:
+            self._shift = value
+        
+        evicted = None
+        if self.count == self.size:
+            evicted = float(self.values[self._idx])
+            d = evicted - self._shift
+            self._sum -= d
+            self._sumsq -= d * d
+        else:
+            self.count += 1
+        
+        self.values[self._idx] = value
+        self._idx = (self._idx + 1) % self.size
+        d = value - self._shift
+        self._sum += d
+        self._sumsq += d * d
+        
+        self._since_resync += 1
+        if self.count == 1:
+            self.min = self.max = value
+        elif evicted is not None and (evicted <= self.min or evicted >= self.max):
+            # The old extreme may have left the window: rescan, and rebuild the
+            # sums since the removed value can dwarf what is left
+            self.min = float(self.values.min())
+            self.max = float(self.values.max())
+            self._resync()
+        else:
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+        
+        # Rebuild the sums once per window anyway to stop float drift accumulating
+        if self._since_resync >= self.size:
+            self._resync()
+    
+    def extend(self, values: np.ndarray):
+        """Push many values at once; same end state as pushing them one by one"""
+        n = len(values)
+        if n == 0:
+            return
+        if n >= self.size:
+            self.values[:] = values[-self.size:]
+            self._idx = 0
+            self.count = self.size
+        else:
+            end = self._idx + n
+            if end <= self.size:
+                self.values[self._idx:end] = values
+            else:
+                split = self.size - self._idx
+                self.values[self._idx:] = values[:split]
+                self.values[:end - self.size] = values[split:]
+            self._idx = end % self.size
+            self.count = min(self.count + n, self.size)
+        
+        window = self.values[:self.count]
+        self.min = float(window.min())
+        self.max = float(window.max())
+        self._resync()
+    
+    def ordered_values(self) -> np.ndarray:
+        """Window contents oldest first"""
+        if self.count < self.size or self._idx == 0:
+            return self.values[:self.count]
+        return np.concatenate((self.values[self._idx:], self.values[:self._idx]))
+    
+    def _resync(self):
+        values = self.values[:self.count]
+        self._shift = float(values.mean())
+        d = values - self._shift
+        self._sum = float(d.sum())
+        self._sumsq = float(d @ d)
+        self._since_resync = 0
+    
+    def mean(self) -> float:
+        return self._shift + self._sum / self.count
+    
+    def std(self) -> float:
+        if self.min == self.max:
+            return 0.0
+        mean_d = self._sum / self.count
+        variance = self._sumsq / self.count - mean_d * mean_d
+        return math.sqrt(variance) if variance > 0.0 else 0.0
+
+
 class AnomalyDetector(BasePredictor):
     """
     Anomaly detection using Isolation Forest-inspired approach.
@@ -71,7 +184,7 @@ class AnomalyDetector(BasePredictor):
         
         # Rolling windows for each metric
         self.window_size = 100
-        self.metric_windows: Dict[str, deque] = {}
+        self.metric_windows: Dict[str, _RollingWindow] = {}
         
         # Anomaly thresholds (z-scores)
         self.anomaly_threshold = 3.0  # Standard deviations
@@ -92,20 +205,20 @@ class AnomalyDetector(BasePredictor):
     
     def _update_stats(self, metric_name: str, value: float):
         """Update running statistics for a metric"""
-        if metric_name not in self.metric_windows:
-            self.metric_windows[metric_name] = deque(maxlen=self.window_size)
+        window = self.metric_windows.get(metric_name)
+        if window is None:
+            window = self.metric_windows[metric_name] = _RollingWindow(self.window_size)
         
-        self.metric_windows[metric_name].append(value)
+        window.push(value)
         
         # Compute statistics
-        values = list(self.metric_windows[metric_name])
-        if len(values) >= 5:  # Need minimum samples
+        if window.count >= 5:  # Need minimum samples
             self.metric_stats[metric_name] = {
-                "mean": np.mean(values),
-                "std": np.std(values) or 0.001,  # Avoid division by zero
-                "min": np.min(values),
-                "max": np.max(values),
-                "samples": len(values),
+                "mean": window.mean(),
+                "std": window.std() or 0.001,  # Avoid division by zero
+                "min": window.min,
+                "max": window.max,
+                "samples": window.count,
             }
     
     def predict(self, features: Dict[str, Any]) -> PredictionResult:
@@ -118,16 +231,16 @@ class AnomalyDetector(BasePredictor):
             if not isinstance(value, (int, float)):
                 continue
             
-            # Update with new value
-            self._update_stats(metric_name, value)
-            
+            # Score against the stats from before this sample, then add it
             stats = self.metric_stats.get(metric_name)
+            self._update_stats(metric_name, value)
             if not stats or stats["samples"] < 10:
                 continue
             
             # Compute z-score
             z_score = abs(value - stats["mean"]) / stats["std"]
-            max_z_score = max(max_z_score, z_score)
+            if z_score > max_z_score:
+                max_z_score = z_score
             
             if z_score >= self.anomaly_threshold:
                 anomalies.append(metric_name)
@@ -139,27 +252,184 @@ class AnomalyDetector(BasePredictor):
                     f"{metric_name}={value:.2f} is elevated ({z_score:.1f}σ from normal)"
                 )
         
-        is_anomaly = len(anomalies) > 0
+        return self._result(len(anomalies) > 0, self._probability(max_z_score), evidence)
+    
+    def predict_batch(self, features_batch: List[Dict[str, Any]]) -> List[PredictionResult]:
+        """Detect anomalies for many feature dicts, vectorized per metric.
         
+        Equivalent to calling predict on each row in order: row j of a metric
+        is scored against the rolling window as it was just before that row
+        was pushed.
+        """
+        # Gather each metric's values as a column: (row, position in row, value)
+        columns: Dict[str, Tuple[List[int], List[int], List[float]]] = {}
+        for row, features in enumerate(features_batch):
+            for position, (metric_name, value) in enumerate(features.items()):
+                if isinstance(value, (int, float)):
+                    column = columns.get(metric_name)
+                    if column is None:
+                        column = columns[metric_name] = ([], [], [])
+                    column[0].append(row)
+                    column[1].append(position)
+                    column[2].append(value)
+        
+        n_rows = len(features_batch)
+        max_z = np.zeros(n_rows)
+        anomalous = np.zeros(n_rows, dtype=bool)
+        row_evidence: List[List[Tuple[int, str]]] = [[] for _ in range(n_rows)]
+        
+        size = self.window_size
+        for metric_name, (rows, positions, values) in columns.items():
+            window = self.metric_windows.get(metric_name)
+            if window is None:
+                window = self.metric_windows[metric_name] = _RollingWindow(size)
+            
+            batch = np.asarray(values, dtype=np.float64)
+            history = window.ordered_values()
+            n_history = len(history)
+            
+            # Samples already in the window when each batch value arrives
+            seen = np.arange(n_history, n_history + len(batch))
+            counts = np.minimum(seen, size)
+            scored = np.flatnonzero(counts >= 10)
+            
+            if len(scored):
+                # Window just before every scored value, zero-padded at the front
+                padded = np.concatenate((np.zeros(size), history, batch[:-1]))
+                windows = sliding_window_view(padded, size)[seen[scored]]
+                counts = counts[scored]
+                valid = np.arange(size) >= (size - seen[scored])[:, None]
+                
+                means = windows.sum(axis=1) / counts
+                deviations = np.where(valid, windows - means[:, None], 0.0)
+                stds = np.sqrt(np.einsum("ij,ij->i", deviations, deviations) / counts)
+                constant = np.where(valid, windows, np.inf).min(axis=1) == np.where(valid, windows, -np.inf).max(axis=1)
+                stds[constant | (stds == 0)] = 0.001
+                z_scores = np.abs(batch[scored] - means) / stds
+            
+            window.extend(batch)
+            if window.count >= 5:
+                self.metric_stats[metric_name] = {
+                    "mean": window.mean(),
+                    "std": window.std() or 0.001,
+                    "min": window.min,
+                    "max": window.max,
+                    "samples": window.count,
+                }
+            
+            if not len(scored):
+                continue
+            scored_rows = np.asarray(rows)[scored]
+            np.maximum.at(max_z, scored_rows, z_scores)
+            anomalous[scored_rows[z_scores >= self.anomaly_threshold]] = True
+            
+            for j in np.flatnonzero(z_scores >= self.warning_threshold):
+                i = scored[j]
+                value, z_score, mean = values[i], z_scores[j], means[j]
+                if z_score >= self.anomaly_threshold:
+                    text = f"{metric_name}={value:.2f} is {z_score:.1f}σ from mean {mean:.2f}"
+                else:
+                    text = f"{metric_name}={value:.2f} is elevated ({z_score:.1f}σ from normal)"
+                row_evidence[rows[i]].append((positions[i], text))
+        
+        # Probability based on how severe the anomaly is, for all rows at once
+        probabilities = np.select(
+            [max_z >= self.anomaly_threshold, max_z >= self.warning_threshold],
+            [
+                np.minimum(0.5 + (max_z - self.anomaly_threshold) * 0.15, 0.95),
+                0.3 + (max_z - self.warning_threshold) * 0.2,
+            ],
+            max_z * 0.15,
+        ).tolist()
+        return [
+            self._result(bool(anomalous[row]), probabilities[row], [text for _, text in sorted(row_evidence[row])])
+            for row in range(n_rows)
+        ]
+    
+    def _probability(self, max_z_score: float) -> float:
         # Probability based on how severe the anomaly is
         if max_z_score >= self.anomaly_threshold:
-            probability = min(0.95, 0.5 + (max_z_score - self.anomaly_threshold) * 0.15)
-        elif max_z_score >= self.warning_threshold:
-            probability = 0.3 + (max_z_score - self.warning_threshold) * 0.2
-        else:
-            probability = max_z_score * 0.15
-        
+            probability = 0.5 + (max_z_score - self.anomaly_threshold) * 0.15
+            return probability if probability < 0.95 else 0.95
+        if max_z_score >= self.warning_threshold:
+            return 0.3 + (max_z_score - self.warning_threshold) * 0.2
+        return max_z_score * 0.15
+    
+    def _result(self, is_anomaly: bool, probability: float, evidence: List[str]) -> PredictionResult:
+        confidence = self.training_samples / 100  # More training = more confidence
         return PredictionResult(
             predicted=is_anomaly,
             probability=probability,
             eta_seconds=300 if is_anomaly else None,  # 5 minute default
-            confidence=min(1.0, self.training_samples / 100),  # More training = more confidence
+            confidence=confidence if confidence < 1.0 else 1.0,
             evidence=evidence,
             model_name=self.name,
             model_version=self.version,
         )
 
 
+def _to_ns(timestamp: datetime) -> int:
+    return int(timestamp.timestamp() * 1e9)
+
+
+class _SeriesBuffer:
+    """Fixed-capacity ring buffer of (timestamp, value) samples stored column-wise"""
+    
+    __slots__ = ("timestamps_ns", "values", "count", "_head")
+    
+    def __init__(self, capacity: int):
+        self.timestamps_ns = np.empty(capacity, dtype=np.int64)
+        self.values = np.empty(capacity, dtype=np.float64)
+        self.count = 0
+        self._head = 0
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def append(self, timestamp_ns: int, value: float):
+        head = self._head
+        self.timestamps_ns[head] = timestamp_ns
+        self.values[head] = value
+        capacity = len(self.values)
+        self._head = (head + 1) % capacity
+        if self.count < capacity:
+            self.count += 1
+    
+    def ordered_values(self) -> np.ndarray:
+        """Values oldest first; a view unless the buffer has wrapped"""
+        if self.count < len(self.values) or self._head == 0:
+            return self.values[:self.count]
+        return _np_concatenate((self.values[self._head:], self.values[:self._head]))
+    
+    def last_value(self) -> float:
+        return float(self.values[self._head - 1])
+    
+    def span_seconds(self) -> float:
+        """Seconds between the oldest and newest sample"""
+        oldest = self._head if self.count == len(self.values) else 0
+        return (int(self.timestamps_ns[self._head - 1]) - int(self.timestamps_ns[oldest])) * 1e-9
+
+
+@functools.lru_cache(maxsize=8)
+def _holt_weights(alpha: float, beta: float, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Closed-form weights for the Holt linear trend recurrence.
+    
+    One smoothing step is linear in (level, trend): s' = A s + b v. After n
+    steps s_n = A^n s_0 + sum_t A^(n-1-t) b v_t, so keeping A^k and A^k b for
+    every k turns the smoothing loop into two dot products.
+    """
+    a = np.array([[1 - alpha, 1 - alpha], [-alpha * beta, 1 - alpha * beta]])
+    b = np.array([alpha, alpha * beta])
+    
+    powers = np.empty((max_points + 1, 2, 2))
+    powers[0] = np.eye(2)
+    responses = np.empty((max_points, 2))
+    for k in range(max_points):
+        responses[k] = powers[k] @ b
+        powers[k + 1] = a @ powers[k]
+    return powers, responses
+
+
 class TimeSeriesForecaster(BasePredictor):
     """
     Time series forecaster for resource usage prediction.
@@ -172,7 +442,7 @@ class TimeSeriesForecaster(BasePredictor):
         super().__init__("time_series_forecaster", "1.0.0")
         
         # Time series data for each resource
-        self.series: Dict[str, List[Tuple[datetime, float]]] = {}
+        self.series: Dict[str, _SeriesBuffer] = {}
         
         # Exponential smoothing parameters
         self.alpha = 0.3  # Level smoothing
@@ -188,12 +458,13 @@ class TimeSeriesForecaster(BasePredictor):
             timestamp = sample.get("timestamp", datetime.utcnow())
             if isinstance(timestamp, str):
                 timestamp = datetime.fromisoformat(timestamp)
+            timestamp_ns = _to_ns(timestamp)
             
             for metric_name, value in sample.items():
                 if metric_name == "timestamp":
                     continue
                 if isinstance(value, (int, float)):
-                    self._add_datapoint(metric_name, timestamp, value)
+                    self._add_datapoint(metric_name, timestamp_ns, value)
         
         self.is_trained = True
         self.last_trained_at = datetime.utcnow()
@@ -201,16 +472,18 @@ class TimeSeriesForecaster(BasePredictor):
         
         logger.info(f"TimeSeriesForecaster trained on {len(data)} samples")
     
-    def _add_datapoint(self, metric_name: str, timestamp: datetime, value: float):
+    def warmup(self):
+        """Build the smoothing weight table ahead of the first forecast"""
+        _holt_weights(self.alpha, self.beta, self.max_history_points)
+    
+    def _add_datapoint(self, metric_name: str, timestamp_ns: int, value: float):
         """Add a data point to the series"""
-        if metric_name not in self.series:
-            self.series[metric_name] = []
-        
-        self.series[metric_name].append((timestamp, value))
+        series = self.series.get(metric_name)
+        if series is None:
+            # Keeps only recent history
+            series = self.series[metric_name] = _SeriesBuffer(self.max_history_points)
         
-        # Keep only recent history
-        if len(self.series[metric_name]) > self.max_history_points:
-            self.series[metric_name] = self.series[metric_name][-self.max_history_points:]
+        series.append(timestamp_ns, value)
     
     def _forecast(
         self, 
@@ -225,45 +498,65 @@ class TimeSeriesForecaster(BasePredictor):
         if metric_name not in self.series:
             return (0.0, 0.0, 0.0)
         
-        data = self.series[metric_name]
-        if len(data) < self.min_points_for_forecast:
-            return (data[-1][1], data[-1][1], data[-1][1])
+        series = self.series[metric_name]
+        if len(series) < self.min_points_for_forecast:
+            last = series.last_value()
+            return (last, last, last)
         
         # Extract values
-        values = [v for _, v in data]
+        values = series.ordered_values()
+        level, trend, forecast = self._holt_forecast(series, values, horizon_seconds)
+        
+        # Compute prediction interval (simple approach)
+        recent = values[-20:]
+        std_error = float(np.mean(np.abs(recent - (level + trend * np.arange(len(recent))))))
+        lower = forecast - 1.96 * std_error
+        upper = forecast + 1.96 * std_error
+        
+        return (forecast, lower, upper)
+    
+    def _holt_forecast(
+        self,
+        series: _SeriesBuffer,
+        values: np.ndarray,
+        horizon_seconds: float,
+    ) -> Tuple[float, float, float]:
+        """Smooth the series; returns (level, trend, value in horizon_seconds)"""
+        n = len(values)
         
         # Initialize level and trend
-        level = values[0]
-        trend = (values[-1] - values[0]) / len(values) if len(values) > 1 else 0
+        initial = _np_array([values[0], (values[-1] - values[0]) / n])
         
         # Apply exponential smoothing
-        for value in values:
-            prev_level = level
-            level = self.alpha * value + (1 - self.alpha) * (level + trend)
-            trend = self.beta * (level - prev_level) + (1 - self.beta) * trend
+        powers, responses = _holt_weights(self.alpha, self.beta, len(series.values))
+        level, trend = (powers[n] @ initial + values @ responses[n - 1::-1]).tolist()
         
         # Estimate time interval between points
-        if len(data) >= 2:
-            total_seconds = (data[-1][0] - data[0][0]).total_seconds()
-            avg_interval = total_seconds / (len(data) - 1) if len(data) > 1 else 60
-        else:
-            avg_interval = 60
+        avg_interval = series.span_seconds() / (n - 1)
         
         # Forecast
         steps = horizon_seconds / avg_interval if avg_interval > 0 else 1
-        forecast = level + trend * steps
-        
-        # Compute prediction interval (simple approach)
-        residuals = [abs(v - (level + trend * i)) for i, (_, v) in enumerate(data[-20:])]
-        if residuals:
-            std_error = np.mean(residuals)
-            lower = forecast - 1.96 * std_error
-            upper = forecast + 1.96 * std_error
+        return level, trend, level + trend * steps
+    
+    def _analyze_metric(
+        self,
+        metric_name: str,
+        limit: float,
+        horizon_seconds: float,
+    ) -> Tuple[float, Optional[float]]:
+        """Forecast value and seconds until limit from a single read of the series"""
+        series = self.series.get(metric_name)
+        if series is None:
+            return 0.0, None
+        
+        values = series.ordered_values()
+        if len(values) < self.min_points_for_forecast:
+            forecast = float(values[-1])
         else:
-            lower = forecast * 0.9
-            upper = forecast * 1.1
+            _, _, forecast = self._holt_forecast(series, values, horizon_seconds)
         
-        return (forecast, lower, upper)
+        eta = self._breach_eta(series, values, limit) if len(values) >= 2 else None
+        return forecast, eta
     
     def predict(self, features: Dict[str, Any]) -> PredictionResult:
         """Predict if resource limits will be breached"""
@@ -271,10 +564,10 @@ class TimeSeriesForecaster(BasePredictor):
         breach_predictions = []
         
         # Add current values to series
-        timestamp = datetime.utcnow()
+        timestamp_ns = _to_ns(datetime.utcnow())
         for metric_name, value in features.items():
             if isinstance(value, (int, float)):
-                self._add_datapoint(metric_name, timestamp, value)
+                self._add_datapoint(metric_name, timestamp_ns, value)
         
         # Check for memory breach
         memory_usage = features.get("memory_usage_bytes", 0)
@@ -282,14 +575,14 @@ class TimeSeriesForecaster(BasePredictor):
         
         if memory_limit > 0:
             # Forecast memory usage in 30 minutes
-            forecast, lower, upper = self._forecast("memory_usage_bytes", 1800)
+            forecast, eta = self._analyze_metric("memory_usage_bytes", memory_limit, 1800)
             utilization_forecast = (forecast / memory_limit) * 100
             
             if utilization_forecast >= 95:
                 breach_predictions.append({
                     "type": "memory",
                     "probability": min(0.95, (utilization_forecast - 90) / 10),
-                    "eta_seconds": self._estimate_breach_time("memory_usage_bytes", memory_limit),
+                    "eta_seconds": eta,
                 })
                 evidence.append(
                     f"Memory forecast: {utilization_forecast:.1f}% in 30min (currently {(memory_usage/memory_limit)*100:.1f}%)"
@@ -300,14 +593,14 @@ class TimeSeriesForecaster(BasePredictor):
         cpu_limit = features.get("cpu_limit_cores", 0)
         
         if cpu_limit > 0:
-            forecast, _, _ = self._forecast("cpu_usage_cores", 1800)
+            forecast, eta = self._analyze_metric("cpu_usage_cores", cpu_limit, 1800)
             utilization_forecast = (forecast / cpu_limit) * 100
             
             if utilization_forecast >= 90:
                 breach_predictions.append({
                     "type": "cpu",
                     "probability": min(0.9, (utilization_forecast - 85) / 15),
-                    "eta_seconds": self._estimate_breach_time("cpu_usage_cores", cpu_limit),
+                    "eta_seconds": eta,
                 })
                 evidence.append(
                     f"CPU forecast: {utilization_forecast:.1f}% in 30min (currently {(cpu_usage/cpu_limit)*100:.1f}%)"
@@ -320,7 +613,7 @@ class TimeSeriesForecaster(BasePredictor):
                 predicted=True,
                 probability=max_breach["probability"],
                 eta_seconds=max_breach["eta_seconds"],
-                confidence=min(1.0, len(self.series.get("memory_usage_bytes", [])) / 50),
+                confidence=min(1.0, len(self.series.get("memory_usage_bytes", ())) / 50),
                 evidence=evidence,
                 model_name=self.name,
                 model_version=self.version,
@@ -341,21 +634,21 @@ class TimeSeriesForecaster(BasePredictor):
         if metric_name not in self.series or not self.series[metric_name]:
             return None
         
-        data = self.series[metric_name]
-        if len(data) < 2:
+        series = self.series[metric_name]
+        if len(series) < 2:
             return None
-        
+        return self._breach_eta(series, series.ordered_values(), limit)
+    
+    @staticmethod
+    def _breach_eta(series: _SeriesBuffer, values: np.ndarray, limit: float) -> Optional[float]:
         # Compute average growth rate
-        values = [v for _, v in data[-10:]]
-        if len(values) < 2:
-            return None
-        
-        growth_rate = (values[-1] - values[0]) / len(values)
+        values = values[-10:]
+        growth_rate = float(values[-1] - values[0]) / len(values)
         
         if growth_rate <= 0:
             return None  # Not growing
         
-        current = values[-1]
+        current = float(values[-1])
         remaining = limit - current
         
         if remaining <= 0:
@@ -365,11 +658,7 @@ class TimeSeriesForecaster(BasePredictor):
         intervals_to_breach = remaining / growth_rate
         
         # Estimate interval duration
-        if len(data) >= 2:
-            total_seconds = (data[-1][0] - data[0][0]).total_seconds()
-            avg_interval = total_seconds / (len(data) - 1)
-        else:
-            avg_interval = 60
+        avg_interval = series.span_seconds() / (len(series) - 1)
         
         return intervals_to_breach * avg_interval
 
@@ -387,14 +676,12 @@ class FailurePredictor(BasePredictor):
         
         self.anomaly_detector = AnomalyDetector()
         self.time_series_forecaster = TimeSeriesForecaster()
+        self.time_series_forecaster.warmup()
         self.knowledge_base = knowledge_base
         
         # Feature weights learned from historical performance
-        self.weights = {
-            "anomaly": 0.3,
-            "time_series": 0.4,
-            "pattern": 0.3,
-        }
+        self.signal_names = ("anomaly", "time_series", "pattern")
+        self.weights = np.array([0.3, 0.4, 0.3])
     
     def train(self, data: List[Dict[str, Any]]) -> None:
         """Train all sub-models"""
@@ -409,29 +696,40 @@ class FailurePredictor(BasePredictor):
     
     def predict(self, features: Dict[str, Any]) -> PredictionResult:
         """Make ensemble prediction"""
-        evidence = []
-        
-        # Get anomaly detection result
-        anomaly_result = self.anomaly_detector.predict(features)
-        evidence.extend([f"[Anomaly] {e}" for e in anomaly_result.evidence])
-        
-        # Get time series forecast
-        ts_result = self.time_series_forecaster.predict(features)
-        evidence.extend([f"[Forecast] {e}" for e in ts_result.evidence])
+        return self._combine(
+            features,
+            self.anomaly_detector.predict(features),
+            self.time_series_forecaster.predict(features),
+        )
+    
+    def predict_batch(self, features_batch: List[Dict[str, Any]]) -> List[PredictionResult]:
+        """Ensemble predictions for many feature dicts, one sub-model pass each"""
+        anomaly_results = self.anomaly_detector.predict_batch(features_batch)
+        ts_results = self.time_series_forecaster.predict_batch(features_batch)
+        return [
+            self._combine(features, anomaly_result, ts_result)
+            for features, anomaly_result, ts_result in zip(features_batch, anomaly_results, ts_results)
+        ]
+    
+    def _combine(
+        self,
+        features: Dict[str, Any],
+        anomaly_result: PredictionResult,
+        ts_result: PredictionResult,
+    ) -> PredictionResult:
+        evidence = [f"[Anomaly] {e}" for e in anomaly_result.evidence]
+        evidence.extend(f"[Forecast] {e}" for e in ts_result.evidence)
         
         # Get pattern-based prediction (if knowledge base available)
         pattern_probability = 0.0
         if self.knowledge_base:
             pattern_result = self._check_patterns(features)
             pattern_probability = pattern_result["probability"]
-            evidence.extend([f"[Pattern] {e}" for e in pattern_result["evidence"]])
+            evidence.extend(f"[Pattern] {e}" for e in pattern_result["evidence"])
         
         # Ensemble combination
-        weighted_probability = (
-            self.weights["anomaly"] * anomaly_result.probability +
-            self.weights["time_series"] * ts_result.probability +
-            self.weights["pattern"] * pattern_probability
-        )
+        signal_probabilities = (anomaly_result.probability, ts_result.probability, pattern_probability)
+        weighted_probability = float(_np_dot(self.weights, signal_probabilities))
         
         # Adjust for convergent evidence
         signals_triggered = sum([
@@ -460,6 +758,7 @@ class FailurePredictor(BasePredictor):
             evidence=evidence,
             model_name=self.name,
             model_version=self.version,
+            signal_probabilities=signal_probabilities,
         )
     
     def _check_patterns(self, features: Dict[str, Any]) -> Dict[str, Any]:
@@ -478,17 +777,25 @@ class FailurePredictor(BasePredictor):
         """
         Update ensemble weights based on prediction accuracy.
         
-        Uses simple online learning to adjust weights based on
-        which predictors were correct.
+        Uses simple online learning: one gradient step on the squared
+        error of the weighted probability, then renormalizes.
         """
         learning_rate = 0.05
         
-        # Determine which predictors were correct
-        correct = prediction_result.predicted == actual_outcome
+        signals = prediction_result.signal_probabilities
+        if signals is None:
+            return  # Not produced by this ensemble
         
-        if correct:
-            # Reinforce current weights
-            pass
+        error = float(actual_outcome) - prediction_result.probability
+        self.weights += learning_rate * error * np.asarray(signals)
+        np.clip(self.weights, 0.0, None, out=self.weights)
+        
+        total = self.weights.sum()
+        if total > 0:
+            self.weights /= total
         else:
-            # Adjust weights (simplified - in production, track per-predictor accuracy)
-            logger.info(f"Updating predictor weights after {correct if correct else incorrect} prediction")
+            self.weights[:] = 1.0 / len(self.weights)
+        
+        if prediction_result.predicted != actual_outcome:
+            weights = ", ".join(f"{n}={w:.3f}" for n, w in zip(self.signal_names, self.weights))
+            logger.info(f"Updated predictor weights after incorrect prediction: {weights}")
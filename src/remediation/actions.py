@@ -1,18 +1,107 @@
 """Action Library - Collection of remediation actions"""
 
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Awaitable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import functools
 import logging
 
+try:
+    from kubernetes.client import V1DeleteOptions
+except ImportError:  # only needed once a client is configured
+    V1DeleteOptions = None
+
 logger = logging.getLogger(__name__)
 
+# Owner recorded in managedFields for every field the actions patch
+_FIELD_MANAGER = "kratos-ai-remediation"
+
+_DEFAULT_GRACE_PERIOD = 30
+# Shared body for the common delete; the client only reads it to serialize
+_DEFAULT_DELETE_OPTIONS = (
+    V1DeleteOptions(grace_period_seconds=_DEFAULT_GRACE_PERIOD) if V1DeleteOptions else None
+)
+
+# urllib3's default per-host pool size when the client does not report one
+_DEFAULT_POOL_SIZE = 4
+
+
+def _pool_size(k8s_client) -> int:
+    """Keep-alive connections the client's urllib3 pool holds per host"""
+    configuration = getattr(getattr(k8s_client, "api_client", None), "configuration", None)
+    return getattr(configuration, "connection_pool_maxsize", None) or _DEFAULT_POOL_SIZE
+
+
+# Public actions that ActionLibrary replaces with _dry_run when it has no client
+_ACTIONS = (
+    "scale_memory",
+    "scale_replicas",
+    "delete_pod",
+    "rollback_deployment",
+    "cordon_node",
+    "uncordon_node",
+)
+
+
+async def _dry_run(*args, **kwargs) -> bool:
+    logger.warning("No K8s client - dry run mode")
+    return True
+
+
+def _k8s_safe(action: str):
+    """Wrap an async action so API errors are logged and reported as False"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs) -> bool:
+            try:
+                return await fn(self, *args, **kwargs)
+            except Exception as e:
+                logger.error("Failed to %s: %s", action, e)
+                return False
+        return wrapper
+    return decorator
+
 
 class ActionLibrary:
     """Library of remediation actions for Kubernetes resources"""
     
-    def __init__(self, k8s_client=None):
+    def __init__(self, k8s_client=None, rate_limiter=None):
         self.k8s_client = k8s_client
+        # Optional async context manager taken before every API call, e.g.
+        # api.rate_limit.AsyncRateLimiter, so bursts stay under apiserver limits
+        self.rate_limiter = rate_limiter
+        # Latest requested replica count per (namespace, deployment) not yet
+        # sent, with the future every request folded into that patch awaits
+        self._pending_replicas: Dict[Tuple[str, str], Tuple[int, asyncio.Future]] = {}
+        
+        # Decide dry-run once here instead of checking the client on every call
+        if not k8s_client:
+            for name in _ACTIONS:
+                setattr(self, name, _dry_run)
+        # Calls beyond the pool size would each open (and then discard) a
+        # fresh TCP+TLS connection, so concurrent calls wait for a slot instead
+        self._connection_slots = asyncio.Semaphore(_pool_size(k8s_client))
+    
+    async def _throttle(self):
+        if self.rate_limiter is not None:
+            async with self.rate_limiter:
+                pass
+    
+    async def _send(self, fn, **kwargs):
+        """Run a blocking kubernetes client call in a worker thread"""
+        async with self._connection_slots:
+            return await asyncio.to_thread(fn, **kwargs)
+    
+    async def _call(self, fn, **kwargs):
+        await self._throttle()
+        return await self._send(fn, **kwargs)
     
-    def scale_memory(
+    async def apply_many(self, actions: Iterable[Awaitable[bool]]) -> List[bool]:
+        """Run several actions concurrently, e.g. apply_many([lib.delete_pod(...), ...])"""
+        return list(await asyncio.gather(*actions))
+    
+    @_k8s_safe("scale memory")
+    async def scale_memory(
         self,
         namespace: str,
         deployment_name: str,
@@ -21,166 +110,127 @@ class ActionLibrary:
         new_memory_request: Optional[str] = None,
     ) -> bool:
         """Scale memory for a deployment container"""
-        if not self.k8s_client:
-            logger.warning("No K8s client - dry run mode")
-            return True
+        resources = {"limits": {"memory": new_memory_limit}}
+        if new_memory_request:
+            resources["requests"] = {"memory": new_memory_request}
         
-        try:
-            # Get current deployment
-            deployment = self.k8s_client.read_namespaced_deployment(
-                name=deployment_name,
-                namespace=namespace,
-            )
-            
-            # Find and update container
-            for container in deployment.spec.template.spec.containers:
-                if container.name == container_name:
-                    if container.resources is None:
-                        from kubernetes.client import V1ResourceRequirements
-                        container.resources = V1ResourceRequirements()
-                    
-                    if container.resources.limits is None:
-                        container.resources.limits = {}
-                    if container.resources.requests is None:
-                        container.resources.requests = {}
-                    
-                    container.resources.limits["memory"] = new_memory_limit
-                    if new_memory_request:
-                        container.resources.requests["memory"] = new_memory_request
-                    break
-            
-            # Apply update
-            self.k8s_client.patch_namespaced_deployment(
-                name=deployment_name,
-                namespace=namespace,
-                body=deployment,
-            )
-            
-            logger.info(f"Scaled memory for {namespace}/{deployment_name}/{container_name} to {new_memory_limit}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to scale memory: {e}")
-            return False
+        # Dict bodies go out as a strategic merge patch, which matches
+        # containers by name, so no read is needed to find the container
+        await self._call(
+            self.k8s_client.patch_namespaced_deployment,
+            name=deployment_name,
+            namespace=namespace,
+            body={"spec": {"template": {"spec": {"containers": [
+                {"name": container_name, "resources": resources},
+            ]}}}},
+            field_manager=_FIELD_MANAGER,
+        )
+        
+        logger.info("Scaled memory for %s/%s/%s to %s", namespace, deployment_name, container_name, new_memory_limit)
+        return True
     
-    def scale_replicas(
+    @_k8s_safe("scale replicas")
+    async def scale_replicas(
         self,
         namespace: str,
         deployment_name: str,
         replicas: int,
     ) -> bool:
         """Scale deployment replicas"""
-        if not self.k8s_client:
-            logger.warning("No K8s client - dry run mode")
-            return True
+        # Requests for the same deployment that queue up behind the rate
+        # limiter collapse into one patch carrying the latest count
+        key = (namespace, deployment_name)
+        pending = self._pending_replicas.get(key)
+        result = pending[1] if pending else asyncio.get_running_loop().create_future()
+        self._pending_replicas[key] = (replicas, result)
+        await self._throttle()
+        pending = self._pending_replicas.pop(key, None)
+        if pending is None:
+            logger.debug("Scale of %s/%s superseded by a newer request", namespace, deployment_name)
+            # shield: a cancelled waiter must not cancel the result others share
+            return await asyncio.shield(result)
         
+        replicas, result = pending
         try:
-            self.k8s_client.patch_namespaced_deployment_scale(
+            await self._send(
+                self.k8s_client.patch_namespaced_deployment_scale,
                 name=deployment_name,
                 namespace=namespace,
                 body={"spec": {"replicas": replicas}},
+                field_manager=_FIELD_MANAGER,
             )
-            
-            logger.info(f"Scaled {namespace}/{deployment_name} to {replicas} replicas")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to scale replicas: {e}")
-            return False
+        except BaseException:
+            result.set_result(False)
+            raise
+        result.set_result(True)
+        
+        logger.info("Scaled %s/%s to %s replicas", namespace, deployment_name, replicas)
+        return True
     
-    def delete_pod(
+    @_k8s_safe("delete pod")
+    async def delete_pod(
         self,
         namespace: str,
         pod_name: str,
-        grace_period: int = 30,
+        grace_period: int = _DEFAULT_GRACE_PERIOD,
     ) -> bool:
         """Delete a pod (triggers restart via controller)"""
-        if not self.k8s_client:
-            logger.warning("No K8s client - dry run mode")
-            return True
+        if grace_period == _DEFAULT_GRACE_PERIOD:
+            body = _DEFAULT_DELETE_OPTIONS
+        else:
+            body = V1DeleteOptions(grace_period_seconds=grace_period)
+        await self._call(
+            self.k8s_client.delete_namespaced_pod,
+            name=pod_name,
+            namespace=namespace,
+            body=body,
+        )
         
-        try:
-            from kubernetes.client import V1DeleteOptions
-            
-            self.k8s_client.delete_namespaced_pod(
-                name=pod_name,
-                namespace=namespace,
-                body=V1DeleteOptions(grace_period_seconds=grace_period),
-            )
-            
-            logger.info(f"Deleted pod {namespace}/{pod_name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to delete pod: {e}")
-            return False
+        logger.info("Deleted pod %s/%s", namespace, pod_name)
+        return True
     
-    def rollback_deployment(
+    @_k8s_safe("rollback")
+    async def rollback_deployment(
         self,
         namespace: str,
         deployment_name: str,
         revision: Optional[int] = None,
     ) -> bool:
         """Rollback a deployment to previous revision"""
-        if not self.k8s_client:
-            logger.warning("No K8s client - dry run mode")
-            return True
+        # Update revision annotation to trigger rollback
+        await self._call(
+            self.k8s_client.patch_namespaced_deployment,
+            name=deployment_name,
+            namespace=namespace,
+            body={"spec": {"template": {"metadata": {"annotations": {
+                "kubectl.kubernetes.io/restartedAt": datetime.utcnow().isoformat(),
+            }}}}},
+            field_manager=_FIELD_MANAGER,
+        )
         
-        try:
-            # Get deployment
-            deployment = self.k8s_client.read_namespaced_deployment(
-                name=deployment_name,
-                namespace=namespace,
-            )
-            
-            # Update revision annotation to trigger rollback
-            if deployment.spec.template.metadata.annotations is None:
-                deployment.spec.template.metadata.annotations = {}
-            
-            deployment.spec.template.metadata.annotations["kubectl.kubernetes.io/restartedAt"] = \
-                datetime.utcnow().isoformat()
-            
-            self.k8s_client.patch_namespaced_deployment(
-                name=deployment_name,
-                namespace=namespace,
-                body=deployment,
-            )
-            
-            logger.info(f"Triggered rollback for {namespace}/{deployment_name}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to rollback: {e}")
-            return False
+        logger.info("Triggered rollback for %s/%s", namespace, deployment_name)
+        return True
     
-    def cordon_node(self, node_name: str) -> bool:
+    @_k8s_safe("cordon node")
+    async def cordon_node(self, node_name: str) -> bool:
         """Mark node as unschedulable"""
-        if not self.k8s_client:
-            return True
-        
-        try:
-            self.k8s_client.patch_node(
-                name=node_name,
-                body={"spec": {"unschedulable": True}},
-            )
-            logger.info(f"Cordoned node {node_name}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to cordon node: {e}")
-            return False
+        await self._call(
+            self.k8s_client.patch_node,
+            name=node_name,
+            body={"spec": {"unschedulable": True}},
+            field_manager=_FIELD_MANAGER,
+        )
+        logger.info("Cordoned node %s", node_name)
+        return True
     
-    def uncordon_node(self, node_name: str) -> bool:
+    @_k8s_safe("uncordon node")
+    async def uncordon_node(self, node_name: str) -> bool:
         """Mark node as schedulable"""
-        if not self.k8s_client:
-            return True
-        
-        try:
-            self.k8s_client.patch_node(
-                name=node_name,
-                body={"spec": {"unschedulable": False}},
-            )
-            logger.info(f"Uncordoned node {node_name}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to uncordon node: {e}")
-            return False
+        await self._call(
+            self.k8s_client.patch_node,
+            name=node_name,
+            body={"spec": {"unschedulable": False}},
+            field_manager=_FIELD_MANAGER,
+        )
+        logger.info("Uncordoned node %s", node_name)
+        return True
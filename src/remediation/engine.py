@@ -1,10 +1,13 @@
 """Remediation Engine - Intelligent auto-remediation with explainability"""
 
+import asyncio
 import logging
+import time
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Callable
-import json
+from types import MappingProxyType
+from typing import Any, Deque, Dict, FrozenSet, List, Mapping, Optional, Tuple, Callable
 
 from remediation.safety import SafetyValidator, SafetyValidation
 from core.types import (
@@ -21,8 +24,146 @@ from core.types import (
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_HISTORY_MAX = 100_000
+_DEFAULT_APPROVAL_TTL_SECONDS = 24 * 3600
+_DEFAULT_MAX_INFLIGHT = 32
 
-@dataclass
+_MIB = 1 << 20
+_GIB = 1 << 30
+
+# Default mappings from incident type to action
+_DEFAULT_ACTIONS: Dict[IncidentType, RemediationAction] = {
+    IncidentType.OOM_KILL: RemediationAction.SCALE_MEMORY_UP,
+    IncidentType.CRASH_LOOP: RemediationAction.RESTART_POD,
+    IncidentType.READINESS_FAIL: RemediationAction.RESTART_POD,
+    IncidentType.LIVENESS_FAIL: RemediationAction.RESTART_POD,
+    IncidentType.NODE_NOT_READY: RemediationAction.CORDON_NODE,
+    IncidentType.NODE_MEMORY_PRESSURE: RemediationAction.NOTIFY_ONLY,
+    IncidentType.RESOURCE_EXHAUSTION: RemediationAction.SCALE_REPLICAS_UP,
+    IncidentType.EVICTION: RemediationAction.SCALE_MEMORY_UP,
+    IncidentType.DEPLOYMENT_FAIL: RemediationAction.ROLLBACK_DEPLOYMENT,
+}
+
+_PREEMPTIVE_ACTIONS: Dict[IncidentType, RemediationAction] = {
+    IncidentType.OOM_KILL: RemediationAction.SCALE_MEMORY_UP,
+    IncidentType.RESOURCE_EXHAUSTION: RemediationAction.SCALE_REPLICAS_UP,
+    IncidentType.NODE_MEMORY_PRESSURE: RemediationAction.NOTIFY_ONLY,
+}
+
+_RISKS: Dict[RemediationAction, str] = {
+    **dict.fromkeys((
+        RemediationAction.NOTIFY_ONLY,
+        RemediationAction.SCALE_MEMORY_UP,
+        RemediationAction.SCALE_CPU_UP,
+    ), "LOW - No service disruption expected"),
+    **dict.fromkeys((
+        RemediationAction.RESTART_POD,
+        RemediationAction.SCALE_REPLICAS_UP,
+        RemediationAction.SCALE_REPLICAS_DOWN,
+    ), "MEDIUM - Brief disruption possible, automatic recovery"),
+    **dict.fromkeys((
+        RemediationAction.DELETE_POD,
+        RemediationAction.ROLLBACK_DEPLOYMENT,
+        RemediationAction.CORDON_NODE,
+        RemediationAction.DRAIN_NODE,
+    ), "HIGH - Service disruption likely, manual verification recommended"),
+}
+
+# Inverse of each action that can be automatically rolled back
+_ROLLBACK_ACTIONS: Dict[RemediationAction, RemediationAction] = {
+    RemediationAction.SCALE_MEMORY_UP: RemediationAction.SCALE_MEMORY_DOWN,
+    RemediationAction.SCALE_MEMORY_DOWN: RemediationAction.SCALE_MEMORY_UP,
+    RemediationAction.SCALE_CPU_UP: RemediationAction.SCALE_CPU_DOWN,
+    RemediationAction.SCALE_CPU_DOWN: RemediationAction.SCALE_CPU_UP,
+    RemediationAction.SCALE_REPLICAS_UP: RemediationAction.SCALE_REPLICAS_DOWN,
+    RemediationAction.SCALE_REPLICAS_DOWN: RemediationAction.SCALE_REPLICAS_UP,
+}
+_ROLLBACKABLE_ACTIONS = frozenset(_ROLLBACK_ACTIONS)
+
+_IMPACTS: Dict[RemediationAction, str] = {
+    RemediationAction.NOTIFY_ONLY: "No impact - notification only",
+    RemediationAction.SCALE_MEMORY_UP: "Minimal - pod restart required to apply new limits",
+    RemediationAction.SCALE_CPU_UP: "Minimal - pod restart required to apply new limits",
+    RemediationAction.RESTART_POD: "Brief - single pod restart (~30 seconds)",
+    RemediationAction.DRAIN_NODE: "Significant - all pods on node will be evicted",
+}
+
+_DURATION_SECONDS: Dict[RemediationAction, int] = {
+    RemediationAction.NOTIFY_ONLY: 1,
+    RemediationAction.SCALE_MEMORY_UP: 60,
+    RemediationAction.SCALE_CPU_UP: 60,
+    RemediationAction.SCALE_REPLICAS_UP: 120,
+    RemediationAction.RESTART_POD: 30,
+    RemediationAction.ROLLBACK_DEPLOYMENT: 180,
+    RemediationAction.DRAIN_NODE: 300,
+}
+
+
+
+def _memory_up_parameters(incident: Optional[Incident]) -> Dict[str, Any]:
+    # Get current memory
+    current_memory = 512 * _MIB  # Default 512Mi
+    if incident and incident.metrics_snapshot:
+        current_memory = incident.metrics_snapshot.memory_limit_bytes
+    
+    # Increase by 50%
+    return {
+        "old_memory_bytes": current_memory,
+        "new_memory_bytes": int(current_memory * 1.5),
+        "max_allowed_memory_bytes": 4 * _GIB,  # 4GB cap
+    }
+
+
+def _describe_memory_up(params: Dict[str, Any]) -> str:
+    old_mb = params.get("old_memory_bytes", 0) / _MIB
+    new_mb = params.get("new_memory_bytes", 0) / _MIB
+    return f"Increase memory limit from {old_mb:.0f}Mi to {new_mb:.0f}Mi"
+
+
+# Per-action dispatch tables; actions without an entry fall back to a default
+_PARAMETER_BUILDERS: Dict[RemediationAction, Callable[[Optional[Incident]], Dict[str, Any]]] = {
+    RemediationAction.SCALE_MEMORY_UP: _memory_up_parameters,
+    RemediationAction.SCALE_REPLICAS_UP: lambda incident: {"increase_by": 1, "max_replicas": 10},
+    RemediationAction.SCALE_REPLICAS_DOWN: lambda incident: {"decrease_by": 1, "min_replicas": 1},
+}
+
+_DESCRIPTIONS: Dict[RemediationAction, Callable[[Dict[str, Any]], str]] = {
+    RemediationAction.SCALE_MEMORY_UP: _describe_memory_up,
+    RemediationAction.SCALE_REPLICAS_UP: lambda params: f"Increase replicas by {params.get('increase_by', 1)}",
+    RemediationAction.RESTART_POD: lambda params: "Delete pod to trigger restart (managed by ReplicaSet/Deployment)",
+    RemediationAction.ROLLBACK_DEPLOYMENT: lambda params: "Rollback deployment to previous revision",
+}
+
+_ROLLBACK_PLANS: Dict[RemediationAction, Callable[[Dict[str, Any]], str]] = {
+    RemediationAction.SCALE_MEMORY_UP: lambda params: (
+        f"Revert memory limit to {params.get('old_memory_bytes', 0) / _MIB:.0f}Mi"
+    ),
+    RemediationAction.SCALE_REPLICAS_UP: lambda params: f"Reduce replicas by {params.get('increase_by', 1)}",
+    RemediationAction.ROLLBACK_DEPLOYMENT: lambda params: "Roll forward to current revision",
+}
+
+# Safety-validator view of a remediation without a target resource
+_UNKNOWN_TARGET = MappingProxyType({
+    "kind": "Unknown",
+    "namespace": "default",
+    "name": "unknown",
+    "labels": MappingProxyType({}),
+})
+
+
+def _safety_target(resource: Optional[KubernetesResource]) -> Mapping[str, Any]:
+    """Resource fields the safety validator reads, as a plain mapping"""
+    if resource is None:
+        return _UNKNOWN_TARGET
+    return {
+        "kind": resource.kind,
+        "namespace": resource.namespace,
+        "name": resource.name,
+        "labels": resource.labels,
+    }
+
+
+@dataclass(slots=True)
 class RemediationPlan:
     """A planned remediation with full context"""
     remediation: Remediation
@@ -63,11 +204,17 @@ class RemediationEngine:
         self.action_handlers: Dict[RemediationAction, Callable] = {}
         self._register_default_handlers()
         
-        # Remediation history for rollback
-        self.history: List[Remediation] = []
+        # Remediation history for rollback, oldest entries dropped first
+        history_max = int(self.config.get("history_max", _DEFAULT_HISTORY_MAX))
+        if history_max < 1:
+            raise ValueError(f"history_max must be at least 1, got {history_max}")
+        self.history: Deque[Remediation] = deque(maxlen=history_max)
+        self._history_by_id: Dict[str, Remediation] = {}
         
-        # Pending approvals
+        # Pending approvals, expired after approval_ttl_seconds
         self.pending_approvals: Dict[str, RemediationPlan] = {}
+        self._approval_ttl_seconds = self.config.get("approval_ttl_seconds", _DEFAULT_APPROVAL_TTL_SECONDS)
+        self._pending_since: Dict[str, float] = {}  # id -> monotonic time, oldest first
     
     def _register_default_handlers(self):
         """Register default action handlers"""
@@ -105,11 +252,18 @@ class RemediationEngine:
         elif prediction and prediction.target_resource:
             target_resource = prediction.target_resource
         
+        # Fetch recommended actions once for both action selection and explanation
+        recommendations = None
+        if self.knowledge_base:
+            recommendations = self.knowledge_base.get_recommended_actions(
+                incident.type if incident else prediction.incident_type
+            )
+        
         # Determine action
         if suggested_action:
             action = suggested_action
         elif incident:
-            action = self._select_action_for_incident(incident)
+            action = self._select_action_for_incident(incident, recommendations)
         elif prediction:
             action = self._select_action_for_prediction(prediction)
         else:
@@ -124,6 +278,7 @@ class RemediationEngine:
             incident=incident,
             prediction=prediction,
             parameters=parameters,
+            recommendations=recommendations,
         )
         
         # Create remediation object
@@ -138,16 +293,9 @@ class RemediationEngine:
         )
         
         # Validate safety
-        target_dict = {
-            "kind": target_resource.kind if target_resource else "Unknown",
-            "namespace": target_resource.namespace if target_resource else "default",
-            "name": target_resource.name if target_resource else "unknown",
-            "labels": target_resource.labels if target_resource else {},
-        }
-        
         safety_validation = self.safety_validator.validate(
             action=action.value,
-            target_resource=target_dict,
+            target_resource=_safety_target(target_resource),
             parameters=parameters,
         )
         
@@ -161,7 +309,7 @@ class RemediationEngine:
             safety_validation=safety_validation,
             estimated_impact=self._estimate_impact(action, target_resource),
             estimated_duration_seconds=self._estimate_duration(action),
-            can_rollback=action in self._rollbackable_actions(),
+            can_rollback=action in _ROLLBACKABLE_ACTIONS,
             rollback_plan=explanation.rollback_plan,
         )
     
@@ -177,66 +325,125 @@ class RemediationEngine:
             The executed remediation with outcome
         """
         remediation = plan.remediation
+        if not self._admit(plan, approved_by):
+            return remediation
+        
+        try:
+            outcome = self._run_handler(remediation)
+            self._complete(remediation, outcome)
+        except Exception as e:
+            self._fail(remediation, e)
+        
+        return remediation
+    
+    async def execute_many(
+        self,
+        plans: List[RemediationPlan],
+        approved_by: Optional[str] = None,
+    ) -> List[Remediation]:
+        """
+        Execute several independent remediation plans concurrently.
+        
+        Safety and approval checks and all bookkeeping run on the event loop
+        in plan order; only the action handlers run in worker threads, at
+        most config max_inflight (default 32) at a time.
+        """
+        slots = asyncio.Semaphore(int(self.config.get("max_inflight", _DEFAULT_MAX_INFLIGHT)))
+        
+        async def run(plan: RemediationPlan) -> Remediation:
+            remediation = plan.remediation
+            if not self._admit(plan, approved_by):
+                return remediation
+            try:
+                async with slots:
+                    outcome = await asyncio.to_thread(self._run_handler, remediation)
+                self._complete(remediation, outcome)
+            except Exception as e:
+                self._fail(remediation, e)
+            return remediation
+        
+        return list(await asyncio.gather(*(run(plan) for plan in plans)))
+    
+    def _admit(self, plan: RemediationPlan, approved_by: Optional[str]) -> bool:
+        """Run the safety and approval gates; True if the plan may execute now"""
+        remediation = plan.remediation
+        self._evict_old_approvals(time.monotonic())
         
         # Check safety
         if not plan.safety_validation.safe:
             remediation.outcome = RemediationOutcome.SKIPPED
             remediation.error_message = plan.safety_validation.get_summary()
-            logger.warning(f"Remediation blocked by safety: {remediation.error_message}")
-            return remediation
+            logger.warning("Remediation blocked by safety: %s", remediation.error_message)
+            return False
         
         # Check approval
         if plan.safety_validation.requires_approval and not approved_by:
             remediation.outcome = RemediationOutcome.PENDING_APPROVAL
             self.pending_approvals[remediation.id] = plan
-            logger.info(f"Remediation {remediation.id} requires approval: {plan.safety_validation.approval_reason}")
-            return remediation
+            self._pending_since.pop(remediation.id, None)
+            self._pending_since[remediation.id] = time.monotonic()
+            logger.info("Remediation %s requires approval: %s", remediation.id, plan.safety_validation.approval_reason)
+            return False
         
         if approved_by:
             remediation.approved_by = approved_by
+            if self.pending_approvals.pop(remediation.id, None) is not None:
+                del self._pending_since[remediation.id]
         
-        # Execute
         remediation.executed_at = datetime.utcnow()
+        return True
+    
+    def _run_handler(self, remediation: Remediation) -> RemediationOutcome:
+        if self.dry_run:
+            logger.info("[DRY RUN] Would execute: %s", remediation.action.value)
+            return RemediationOutcome.DRY_RUN
+        
+        handler = self.action_handlers.get(remediation.action)
+        if not handler:
+            logger.warning("No handler for action: %s", remediation.action)
+            return RemediationOutcome.SKIPPED
+        return RemediationOutcome.SUCCESS if handler(remediation) else RemediationOutcome.FAILED
+    
+    def _complete(self, remediation: Remediation, outcome: RemediationOutcome):
+        remediation.outcome = outcome
+        remediation.completed_at = datetime.utcnow()
         
-        try:
-            if self.dry_run:
-                logger.info(f"[DRY RUN] Would execute: {remediation.action.value}")
-                remediation.outcome = RemediationOutcome.DRY_RUN
-            else:
-                handler = self.action_handlers.get(remediation.action)
-                if handler:
-                    success = handler(remediation)
-                    remediation.outcome = RemediationOutcome.SUCCESS if success else RemediationOutcome.FAILED
-                else:
-                    logger.warning(f"No handler for action: {remediation.action}")
-                    remediation.outcome = RemediationOutcome.SKIPPED
-            
-            remediation.completed_at = datetime.utcnow()
-            
-            # Record in history
-            self.history.append(remediation)
-            
-            # Record in knowledge base
-            if self.knowledge_base:
-                self.knowledge_base.record_remediation(remediation)
-            
-            # Record for rate limiting
-            if remediation.target_resource:
-                self.safety_validator.record_action({
-                    "kind": remediation.target_resource.kind,
-                    "namespace": remediation.target_resource.namespace,
-                    "name": remediation.target_resource.name,
-                })
-            
-            logger.info(f"Remediation {remediation.id} completed: {remediation.outcome.value}")
-            
-        except Exception as e:
-            remediation.outcome = RemediationOutcome.FAILED
-            remediation.error_message = str(e)
-            remediation.completed_at = datetime.utcnow()
-            logger.error(f"Remediation {remediation.id} failed: {e}")
+        # Record in history
+        self._record_history(remediation)
         
-        return remediation
+        # Record in knowledge base
+        if self.knowledge_base:
+            self.knowledge_base.record_remediation(remediation)
+        
+        # Record for rate limiting
+        if remediation.target_resource:
+            self.safety_validator.record_action(_safety_target(remediation.target_resource))
+        
+        logger.info("Remediation %s completed: %s", remediation.id, remediation.outcome.value)
+    
+    def _fail(self, remediation: Remediation, error: Exception):
+        remediation.outcome = RemediationOutcome.FAILED
+        remediation.error_message = str(error)
+        remediation.completed_at = datetime.utcnow()
+        logger.error("Remediation %s failed: %s", remediation.id, error)
+    
+    def _record_history(self, remediation: Remediation):
+        history = self.history
+        if len(history) == history.maxlen:
+            self._history_by_id.pop(history[0].id, None)
+        history.append(remediation)
+        self._history_by_id[remediation.id] = remediation
+    
+    def _evict_old_approvals(self, now: float):
+        """Drop pending approvals that have waited longer than the approval TTL"""
+        cutoff = now - self._approval_ttl_seconds
+        pending_since = self._pending_since
+        while pending_since:
+            remediation_id, since = next(iter(pending_since.items()))
+            if since > cutoff:
+                break
+            del pending_since[remediation_id]
+            self.pending_approvals.pop(remediation_id, None)
     
     def rollback(self, remediation_id: str) -> Optional[Remediation]:
         """
@@ -244,24 +451,19 @@ class RemediationEngine:
         
         Returns the rollback remediation if successful.
         """
-        original = None
-        for r in self.history:
-            if r.id == remediation_id:
-                original = r
-                break
-        
+        original = self._history_by_id.get(remediation_id)
         if not original:
-            logger.error(f"Cannot find remediation {remediation_id} for rollback")
+            logger.error("Cannot find remediation %s for rollback", remediation_id)
             return None
         
         if not original.is_successful:
-            logger.warning(f"Cannot rollback failed remediation {remediation_id}")
+            logger.warning("Cannot rollback failed remediation %s", remediation_id)
             return None
         
         # Create rollback action
         rollback_action = self._get_rollback_action(original.action)
         if not rollback_action:
-            logger.warning(f"No rollback available for {original.action}")
+            logger.warning("No rollback available for %s", original.action)
             return None
         
         # Generate rollback parameters
@@ -282,12 +484,7 @@ class RemediationEngine:
             remediation=rollback,
             safety_validation=self.safety_validator.validate(
                 action=rollback_action.value,
-                target_resource={
-                    "kind": original.target_resource.kind if original.target_resource else "Unknown",
-                    "namespace": original.target_resource.namespace if original.target_resource else "default",
-                    "name": original.target_resource.name if original.target_resource else "unknown",
-                    "labels": original.target_resource.labels if original.target_resource else {},
-                },
+                target_resource=_safety_target(original.target_resource),
                 parameters=rollback_params,
             ),
             estimated_impact="Reverting previous change",
@@ -303,38 +500,20 @@ class RemediationEngine:
         
         return result
     
-    def _select_action_for_incident(self, incident: Incident) -> RemediationAction:
-        """Select best action based on incident type and history"""
-        # Check knowledge base for recommended actions
-        if self.knowledge_base:
-            recommendations = self.knowledge_base.get_recommended_actions(incident.type)
-            if recommendations and recommendations[0][1] > 0.6:  # >60% success rate
-                return recommendations[0][0]
-        
-        # Default mappings
-        default_actions = {
-            IncidentType.OOM_KILL: RemediationAction.SCALE_MEMORY_UP,
-            IncidentType.CRASH_LOOP: RemediationAction.RESTART_POD,
-            IncidentType.READINESS_FAIL: RemediationAction.RESTART_POD,
-            IncidentType.LIVENESS_FAIL: RemediationAction.RESTART_POD,
-            IncidentType.NODE_NOT_READY: RemediationAction.CORDON_NODE,
-            IncidentType.NODE_MEMORY_PRESSURE: RemediationAction.NOTIFY_ONLY,
-            IncidentType.RESOURCE_EXHAUSTION: RemediationAction.SCALE_REPLICAS_UP,
-            IncidentType.EVICTION: RemediationAction.SCALE_MEMORY_UP,
-            IncidentType.DEPLOYMENT_FAIL: RemediationAction.ROLLBACK_DEPLOYMENT,
-        }
-        
-        return default_actions.get(incident.type, RemediationAction.NOTIFY_ONLY)
+    def _select_action_for_incident(
+        self,
+        incident: Incident,
+        recommendations: Optional[List[Tuple[RemediationAction, float]]] = None,
+    ) -> RemediationAction:
+        """Select best action based on incident type and the knowledge base's recommendations"""
+        if recommendations and recommendations[0][1] > 0.6:  # >60% success rate
+            return recommendations[0][0]
+        
+        return _DEFAULT_ACTIONS.get(incident.type, RemediationAction.NOTIFY_ONLY)
     
     def _select_action_for_prediction(self, prediction: Prediction) -> RemediationAction:
         """Select preemptive action based on prediction"""
-        preemptive_actions = {
-            IncidentType.OOM_KILL: RemediationAction.SCALE_MEMORY_UP,
-            IncidentType.RESOURCE_EXHAUSTION: RemediationAction.SCALE_REPLICAS_UP,
-            IncidentType.NODE_MEMORY_PRESSURE: RemediationAction.NOTIFY_ONLY,
-        }
-        
-        return preemptive_actions.get(prediction.incident_type, RemediationAction.NOTIFY_ONLY)
+        return _PREEMPTIVE_ACTIONS.get(prediction.incident_type, RemediationAction.NOTIFY_ONLY)
     
     def _generate_parameters(
         self,
@@ -343,28 +522,8 @@ class RemediationEngine:
         prediction: Optional[Prediction],
     ) -> Dict[str, Any]:
         """Generate parameters for the remediation action"""
-        params = {}
-        
-        if action == RemediationAction.SCALE_MEMORY_UP:
-            # Get current memory
-            current_memory = 512 * 1024**2  # Default 512Mi
-            if incident and incident.metrics_snapshot:
-                current_memory = incident.metrics_snapshot.memory_limit_bytes
-            
-            # Increase by 50%
-            params["old_memory_bytes"] = current_memory
-            params["new_memory_bytes"] = int(current_memory * 1.5)
-            params["max_allowed_memory_bytes"] = 4 * 1024**3  # 4GB cap
-        
-        elif action == RemediationAction.SCALE_REPLICAS_UP:
-            params["increase_by"] = 1
-            params["max_replicas"] = 10
-        
-        elif action == RemediationAction.SCALE_REPLICAS_DOWN:
-            params["decrease_by"] = 1
-            params["min_replicas"] = 1
-        
-        return params
+        build = _PARAMETER_BUILDERS.get(action)
+        return build(incident) if build else {}
     
     def _generate_explanation(
         self,
@@ -372,63 +531,35 @@ class RemediationEngine:
         incident: Optional[Incident],
         prediction: Optional[Prediction],
         parameters: Dict[str, Any],
+        recommendations: Optional[List[Tuple[RemediationAction, float]]] = None,
     ) -> Explanation:
         """Generate a full explanation for the remediation"""
-        steps = []
-        step_num = 1
-        
-        # Step 1: Observation
         if incident:
-            steps.append(ExplanationStep(
-                step_number=step_num,
-                category="observation",
-                content=f"Detected {incident.type.value} incident: {incident.message}",
-                evidence=[f"Incident ID: {incident.id}", f"Severity: {incident.severity.value}"],
-            ))
-        elif prediction:
-            steps.append(ExplanationStep(
-                step_number=step_num,
-                category="observation",
-                content=f"Predicted {prediction.incident_type.value} with {prediction.probability*100:.0f}% probability",
-                evidence=prediction.evidence,
-            ))
-        step_num += 1
-        
-        # Step 2: Analysis
-        analysis_content = self._generate_analysis(incident, prediction)
-        steps.append(ExplanationStep(
-            step_number=step_num,
-            category="analysis",
-            content=analysis_content,
-        ))
-        step_num += 1
-        
-        # Step 3: Decision
+            observation = (
+                f"Detected {incident.type.value} incident: {incident.message}",
+                [f"Incident ID: {incident.id}", f"Severity: {incident.severity.value}"],
+            )
+        else:
+            observation = (
+                f"Predicted {prediction.incident_type.value} with {prediction.probability*100:.0f}% probability",
+                prediction.evidence,
+            )
+        
         decision_content = f"Selected action: {action.value}"
-        if self.knowledge_base:
+        if recommendations:
             # Add historical context
-            recommendations = self.knowledge_base.get_recommended_actions(
-                incident.type if incident else prediction.incident_type
-            )
-            if recommendations:
-                top_action, success_rate = recommendations[0]
-                decision_content += f" (historically {success_rate*100:.0f}% successful)"
-        
-        steps.append(ExplanationStep(
-            step_number=step_num,
-            category="decision",
-            content=decision_content,
-        ))
-        step_num += 1
-        
-        # Step 4: Action details
-        action_detail = self._describe_action(action, parameters)
-        steps.append(ExplanationStep(
-            step_number=step_num,
-            category="action",
-            content=action_detail,
-        ))
-        step_num += 1
+            top_action, success_rate = recommendations[0]
+            decision_content += f" (historically {success_rate*100:.0f}% successful)"
+        
+        steps = [
+            ExplanationStep(step_number=number, category=category, content=content, evidence=evidence)
+            for number, (category, content, evidence) in enumerate((
+                ("observation", *observation),
+                ("analysis", self._generate_analysis(incident, prediction), []),
+                ("decision", decision_content, []),
+                ("action", self._describe_action(action, parameters), []),
+            ), start=1)
+        ]
         
         # Risk assessment
         risk_assessment = self._assess_risk(action, parameters)
@@ -462,82 +593,25 @@ class RemediationEngine:
     
     def _describe_action(self, action: RemediationAction, params: Dict[str, Any]) -> str:
         """Describe the action in human terms"""
-        if action == RemediationAction.SCALE_MEMORY_UP:
-            old_mb = params.get("old_memory_bytes", 0) / 1024**2
-            new_mb = params.get("new_memory_bytes", 0) / 1024**2
-            return f"Increase memory limit from {old_mb:.0f}Mi to {new_mb:.0f}Mi"
-        
-        elif action == RemediationAction.SCALE_REPLICAS_UP:
-            return f"Increase replicas by {params.get(increase_by, 1)}"
-        
-        elif action == RemediationAction.RESTART_POD:
-            return "Delete pod to trigger restart (managed by ReplicaSet/Deployment)"
-        
-        elif action == RemediationAction.ROLLBACK_DEPLOYMENT:
-            return "Rollback deployment to previous revision"
-        
-        return f"Execute {action.value}"
+        describe = _DESCRIPTIONS.get(action)
+        return describe(params) if describe else f"Execute {action.value}"
     
     def _assess_risk(self, action: RemediationAction, params: Dict[str, Any]) -> str:
         """Assess the risk of an action"""
-        low_risk = {
-            RemediationAction.NOTIFY_ONLY,
-            RemediationAction.SCALE_MEMORY_UP,
-            RemediationAction.SCALE_CPU_UP,
-        }
-        medium_risk = {
-            RemediationAction.RESTART_POD,
-            RemediationAction.SCALE_REPLICAS_UP,
-            RemediationAction.SCALE_REPLICAS_DOWN,
-        }
-        high_risk = {
-            RemediationAction.DELETE_POD,
-            RemediationAction.ROLLBACK_DEPLOYMENT,
-            RemediationAction.CORDON_NODE,
-            RemediationAction.DRAIN_NODE,
-        }
-        
-        if action in low_risk:
-            return "LOW - No service disruption expected"
-        elif action in medium_risk:
-            return "MEDIUM - Brief disruption possible, automatic recovery"
-        elif action in high_risk:
-            return "HIGH - Service disruption likely, manual verification recommended"
-        return "UNKNOWN - Review action carefully"
+        return _RISKS.get(action, "UNKNOWN - Review action carefully")
     
     def _generate_rollback_plan(self, action: RemediationAction, params: Dict[str, Any]) -> str:
         """Generate rollback plan for an action"""
-        if action == RemediationAction.SCALE_MEMORY_UP:
-            old_mb = params.get("old_memory_bytes", 0) / 1024**2
-            return f"Revert memory limit to {old_mb:.0f}Mi"
-        elif action == RemediationAction.SCALE_REPLICAS_UP:
-            return f"Reduce replicas by {params.get(increase_by, 1)}"
-        elif action == RemediationAction.ROLLBACK_DEPLOYMENT:
-            return "Roll forward to current revision"
-        return "Manual intervention may be required"
-    
-    def _rollbackable_actions(self) -> set:
+        plan = _ROLLBACK_PLANS.get(action)
+        return plan(params) if plan else "Manual intervention may be required"
+    
+    def _rollbackable_actions(self) -> FrozenSet[RemediationAction]:
         """Actions that can be automatically rolled back"""
-        return {
-            RemediationAction.SCALE_MEMORY_UP,
-            RemediationAction.SCALE_MEMORY_DOWN,
-            RemediationAction.SCALE_CPU_UP,
-            RemediationAction.SCALE_CPU_DOWN,
-            RemediationAction.SCALE_REPLICAS_UP,
-            RemediationAction.SCALE_REPLICAS_DOWN,
-        }
+        return _ROLLBACKABLE_ACTIONS
     
     def _get_rollback_action(self, action: RemediationAction) -> Optional[RemediationAction]:
         """Get the inverse action for rollback"""
-        rollback_map = {
-            RemediationAction.SCALE_MEMORY_UP: RemediationAction.SCALE_MEMORY_DOWN,
-            RemediationAction.SCALE_MEMORY_DOWN: RemediationAction.SCALE_MEMORY_UP,
-            RemediationAction.SCALE_CPU_UP: RemediationAction.SCALE_CPU_DOWN,
-            RemediationAction.SCALE_CPU_DOWN: RemediationAction.SCALE_CPU_UP,
-            RemediationAction.SCALE_REPLICAS_UP: RemediationAction.SCALE_REPLICAS_DOWN,
-            RemediationAction.SCALE_REPLICAS_DOWN: RemediationAction.SCALE_REPLICAS_UP,
-        }
-        return rollback_map.get(action)
+        return _ROLLBACK_ACTIONS.get(action)
     
     def _get_rollback_parameters(self, remediation: Remediation) -> Dict[str, Any]:
         """Generate parameters for rollback"""
@@ -552,33 +626,16 @@ class RemediationEngine:
     
     def _estimate_impact(self, action: RemediationAction, resource: Optional[KubernetesResource]) -> str:
         """Estimate the impact of an action"""
-        if action == RemediationAction.NOTIFY_ONLY:
-            return "No impact - notification only"
-        elif action in (RemediationAction.SCALE_MEMORY_UP, RemediationAction.SCALE_CPU_UP):
-            return "Minimal - pod restart required to apply new limits"
-        elif action == RemediationAction.RESTART_POD:
-            return "Brief - single pod restart (~30 seconds)"
-        elif action == RemediationAction.DRAIN_NODE:
-            return "Significant - all pods on node will be evicted"
-        return "Unknown - review action impact"
+        return _IMPACTS.get(action, "Unknown - review action impact")
     
     def _estimate_duration(self, action: RemediationAction) -> int:
         """Estimate duration in seconds"""
-        durations = {
-            RemediationAction.NOTIFY_ONLY: 1,
-            RemediationAction.SCALE_MEMORY_UP: 60,
-            RemediationAction.SCALE_CPU_UP: 60,
-            RemediationAction.SCALE_REPLICAS_UP: 120,
-            RemediationAction.RESTART_POD: 30,
-            RemediationAction.ROLLBACK_DEPLOYMENT: 180,
-            RemediationAction.DRAIN_NODE: 300,
-        }
-        return durations.get(action, 60)
+        return _DURATION_SECONDS.get(action, 60)
     
     # Action Handlers
     def _handle_scale_memory_up(self, remediation: Remediation) -> bool:
         """Handle memory scaling"""
-        logger.info(f"Scaling memory up for {remediation.target_resource}")
+        logger.info("Scaling memory up for %s", remediation.target_resource)
         # Implementation would use k8s_client to patch the deployment
         return True
     
@@ -604,5 +661,5 @@ class RemediationEngine:
         return True
     
     def _handle_notify_only(self, remediation: Remediation) -> bool:
-        logger.info(f"Notification: {remediation.explanation.summary if remediation.explanation else Alert}")
+        logger.info("Notification: %s", remediation.explanation.summary if remediation.explanation else "Alert")
         return True
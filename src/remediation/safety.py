@@ -1,13 +1,48 @@
 """Safety Validator - Ensures remediation actions are safe"""
 
 import logging
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+import time
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple
 from enum import Enum
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+# Actions that take a whole node (and every pod on it) out of service
+_NODE_ACTIONS = frozenset({"drain_node", "cordon_node"})
+
+# Span of the max_actions_per_hour limit
+_RATE_LIMIT_WINDOW_SECONDS = 3600.0
+
+# Default safety limits, overridden key by key from the validator config
+_DEFAULTS = {
+    "max_pods_affected_percent": 25,
+    "max_nodes_affected_percent": 10,
+    "max_actions_per_hour": 20,
+    "cooldown_seconds": 60,
+}
+
+# High-risk actions that always require approval
+_HIGH_RISK_ACTIONS = frozenset({
+    "drain_node",
+    "rollback_deployment",
+    "delete_pod",
+    "update_secret",
+    "cordon_node",
+})
+
+# Protected namespaces
+_PROTECTED_NAMESPACES = frozenset({
+    "kube-system",
+    "kube-public",
+    "kube-node-lease",
+    "monitoring",
+    "istio-system",
+})
+
 
 class RiskLevel(str, Enum):
     """Risk levels for remediation actions"""
@@ -18,7 +53,18 @@ class RiskLevel(str, Enum):
     CRITICAL = "critical"
 
 
-@dataclass
+# Severity order; RiskLevel values are strings, so they don't compare by severity themselves
+_RISK_RANK = {level: rank for rank, level in enumerate(RiskLevel)}
+
+ResourceKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def _resource_key(target_resource: Mapping[str, Any]) -> ResourceKey:
+    """Cooldown key for a resource: (kind, namespace, name)"""
+    return target_resource.get("kind"), target_resource.get("namespace"), target_resource.get("name")
+
+
+@dataclass(frozen=True, slots=True)
 class SafetyCheck:
     """Result of a safety check"""
     name: str
@@ -28,28 +74,57 @@ class SafetyCheck:
     blocking: bool = False  # If True, action must not proceed
 
 
-@dataclass
+# Shared results for checks that pass with nothing to report
+_RATE_LIMIT_OK = SafetyCheck("rate_limit", True, RiskLevel.NONE, "Rate limit OK")
+_COOLDOWN_OK = SafetyCheck("cooldown", True, RiskLevel.NONE, "No cooldown in effect")
+_NAMESPACE_OK = SafetyCheck("protected_namespace", True, RiskLevel.NONE, "Namespace is not protected")
+_WORKLOAD_OK = SafetyCheck("protected_workload", True, RiskLevel.NONE, "Workload is not protected")
+_RESOURCE_LIMITS_OK = SafetyCheck("resource_limits", True, RiskLevel.NONE, "Resource parameters within limits")
+_BLAST_RADIUS_OK = SafetyCheck("blast_radius", True, RiskLevel.NONE, "Blast radius acceptable")
+
+
+@dataclass(frozen=True, slots=True)
 class SafetyValidation:
     """Complete safety validation result"""
     safe: bool
     overall_risk: RiskLevel
-    checks: List[SafetyCheck] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
+    # Tuples, so a shared result can't be changed through one caller
+    checks: Sequence[SafetyCheck] = ()
+    warnings: Sequence[str] = ()
     requires_approval: bool = False
     approval_reason: Optional[str] = None
+    # Counted over every check run, including ones left out of `checks`
+    passed_count: int = 0
+    check_count: int = 0
     
     def get_summary(self) -> str:
         """Get human-readable summary"""
-        passed = sum(1 for c in self.checks if c.passed)
-        total = len(self.checks)
-        
         if self.safe:
-            return f"SAFE ({passed}/{total} checks passed, risk: {self.overall_risk.value})"
+            return f"SAFE ({self.passed_count}/{self.check_count} checks passed, risk: {self.overall_risk.value})"
         else:
             failed = [c.name for c in self.checks if not c.passed and c.blocking]
             return f"BLOCKED by: " + ", ".join(failed)
 
 
+# Shared results for non-verbose validations where nothing failed or carried
+# risk, keyed by how many checks ran
+_ALL_CLEAR: Dict[int, SafetyValidation] = {}
+
+
+def _all_clear(check_count: int) -> SafetyValidation:
+    result = _ALL_CLEAR.get(check_count)
+    if result is None:
+        result = _ALL_CLEAR[check_count] = SafetyValidation(
+            safe=True,
+            overall_risk=RiskLevel.NONE,
+            checks=(),
+            warnings=(),
+            passed_count=check_count,
+            check_count=check_count,
+        )
+    return result
+
+
 class SafetyValidator:
     """
     Validates remediation actions for safety before execution.
@@ -60,47 +135,48 @@ class SafetyValidator:
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         self.config = config or {}
         
-        # Default safety limits
-        self.max_pods_affected_percent = self.config.get("max_pods_affected_percent", 25)
-        self.max_nodes_affected_percent = self.config.get("max_nodes_affected_percent", 10)
-        self.max_actions_per_hour = self.config.get("max_actions_per_hour", 20)
-        self.cooldown_seconds = self.config.get("cooldown_seconds", 60)
-        
-        # High-risk actions that always require approval
-        self.high_risk_actions: Set[str] = {
-            "drain_node",
-            "rollback_deployment",
-            "delete_pod",
-            "update_secret",
-            "cordon_node",
-        }
+        limits = {**_DEFAULTS, **self.config}
+        self.max_pods_affected_percent = limits["max_pods_affected_percent"]
+        self.max_nodes_affected_percent = limits["max_nodes_affected_percent"]
+        self.max_actions_per_hour = limits["max_actions_per_hour"]
+        self.cooldown_seconds = limits["cooldown_seconds"]
         
-        # Protected namespaces
-        self.protected_namespaces: Set[str] = {
-            "kube-system",
-            "kube-public",
-            "kube-node-lease",
-            "monitoring",
-            "istio-system",
-        }
+        # Shared defaults; assign a new set to customise a validator
+        self.high_risk_actions: FrozenSet[str] = _HIGH_RISK_ACTIONS
+        self.protected_namespaces: FrozenSet[str] = _PROTECTED_NAMESPACES
         
         # Protected label selectors (workloads with these labels need approval)
-        self.protected_labels: Dict[str, Set[str]] = {
+        self.protected_labels = {
             "app": {"database", "postgres", "mysql", "redis", "elasticsearch"},
             "tier": {"data", "database"},
             "critical": {"true", "yes"},
         }
         
-        # Action tracking for rate limiting
-        self.action_history: List[datetime] = []
-        self.recent_targets: Dict[str, datetime] = {}
+        # Action tracking for rate limiting (time.monotonic() seconds, oldest first)
+        self.action_history: Deque[float] = deque()
+        self.recent_targets: Dict[ResourceKey, float] = {}
+    
+    @property
+    def protected_labels(self) -> Mapping[str, FrozenSet[str]]:
+        """Read-only; assign a new mapping to change the protected labels"""
+        return self._protected_labels
+    
+    @protected_labels.setter
+    def protected_labels(self, labels: Mapping[str, Iterable[str]]):
+        self._protected_labels = MappingProxyType({key: frozenset(values) for key, values in labels.items()})
+        # Precomputed so the workload check is one set probe per label
+        self._protected_label_keys = frozenset(self._protected_labels)
+        self._protected_label_pairs = frozenset(
+            (key, value) for key, values in self._protected_labels.items() for value in values
+        )
     
     def validate(
         self,
         action: str,
-        target_resource: Dict[str, Any],
+        target_resource: Mapping[str, Any],
         parameters: Dict[str, Any],
         cluster_state: Optional[Dict[str, Any]] = None,
+        verbose: bool = False,
     ) -> SafetyValidation:
         """
         Validate a remediation action for safety.
@@ -110,36 +186,38 @@ class SafetyValidator:
             target_resource: The Kubernetes resource being acted upon
             parameters: Action parameters
             cluster_state: Current cluster state for context
+            verbose: Also report checks that passed with no risk
         
         Returns:
             SafetyValidation result
         """
         checks = []
         warnings = []
-        requires_approval = False
-        approval_reason = None
+        approval_reasons = []
         
         # Check 1: Rate limiting
         rate_check = self._check_rate_limit()
         checks.append(rate_check)
+        if not rate_check.passed:
+            # Rejected regardless of what the remaining checks find
+            return SafetyValidation(safe=False, overall_risk=RiskLevel.HIGH, checks=(rate_check,), check_count=1)
         
         # Check 2: Cooldown period
-        cooldown_check = self._check_cooldown(target_resource)
+        cooldown_check = self._check_cooldown(_resource_key(target_resource))
         checks.append(cooldown_check)
         
         # Check 3: Protected namespace
-        namespace_check = self._check_protected_namespace(target_resource)
+        namespace = target_resource.get("namespace") or "default"
+        namespace_check = self._check_protected_namespace(namespace)
         checks.append(namespace_check)
         if not namespace_check.passed:
-            requires_approval = True
-            approval_reason = f"Target is in protected namespace: {target_resource.get('namespace')}"
+            approval_reasons.append(f"Target is in protected namespace: {namespace}")
         
         # Check 4: Protected workload
         workload_check = self._check_protected_workload(target_resource)
         checks.append(workload_check)
         if not workload_check.passed:
-            requires_approval = True
-            approval_reason = workload_check.message
+            approval_reasons.append(workload_check.message)
         
         # Check 5: High-risk action
         if action in self.high_risk_actions:
@@ -150,80 +228,79 @@ class SafetyValidator:
                 message=f"Action {action} is classified as high-risk",
                 blocking=False,
             ))
-            requires_approval = True
-            approval_reason = f"High-risk action: {action}"
+            approval_reasons.append(f"High-risk action: {action}")
         
         # Check 6: Blast radius (if cluster state provided)
         if cluster_state:
             blast_check = self._check_blast_radius(action, target_resource, cluster_state)
             checks.append(blast_check)
             if blast_check.risk_level == RiskLevel.HIGH:
-                requires_approval = True
-                approval_reason = blast_check.message
+                approval_reasons.append(blast_check.message)
         
         # Check 7: Resource limits
         resource_check = self._check_resource_limits(action, parameters)
         checks.append(resource_check)
-        if resource_check.risk_level >= RiskLevel.MEDIUM:
+        if _RISK_RANK[resource_check.risk_level] >= _RISK_RANK[RiskLevel.MEDIUM]:
             warnings.append(resource_check.message)
         
         # Determine overall safety
-        blocking_failures = [c for c in checks if not c.passed and c.blocking]
-        is_safe = len(blocking_failures) == 0
+        passed_count = 0
+        is_safe = True
+        for c in checks:
+            if c.passed:
+                passed_count += 1
+            elif c.blocking:
+                is_safe = False
         
         # Determine overall risk
-        risk_levels = [c.risk_level for c in checks]
-        if RiskLevel.CRITICAL in risk_levels:
-            overall_risk = RiskLevel.CRITICAL
-        elif RiskLevel.HIGH in risk_levels:
-            overall_risk = RiskLevel.HIGH
-        elif RiskLevel.MEDIUM in risk_levels:
-            overall_risk = RiskLevel.MEDIUM
-        elif RiskLevel.LOW in risk_levels:
-            overall_risk = RiskLevel.LOW
-        else:
-            overall_risk = RiskLevel.NONE
+        overall_risk = max(
+            (c.risk_level for c in checks), key=_RISK_RANK.__getitem__, default=RiskLevel.NONE
+        )
+        
+        check_count = len(checks)
+        reported = tuple(checks)
+        if not verbose:
+            reported = tuple(c for c in checks if not c.passed or c.risk_level is not RiskLevel.NONE)
+            if not reported:
+                # Nothing to report means no warnings and no approval either
+                return _all_clear(check_count)
         
         return SafetyValidation(
             safe=is_safe,
             overall_risk=overall_risk,
-            checks=checks,
-            warnings=warnings,
-            requires_approval=requires_approval,
-            approval_reason=approval_reason,
+            checks=reported,
+            warnings=tuple(warnings),
+            requires_approval=bool(approval_reasons),
+            approval_reason="; ".join(approval_reasons) or None,
+            passed_count=passed_count,
+            check_count=check_count,
         )
     
     def _check_rate_limit(self) -> SafetyCheck:
         """Check if rate limit has been exceeded"""
-        now = datetime.utcnow()
-        hour_ago = now - timedelta(hours=1)
-        
-        # Clean old entries
-        self.action_history = [t for t in self.action_history if t > hour_ago]
+        recent = self._actions_since(time.monotonic() - _RATE_LIMIT_WINDOW_SECONDS)
         
-        if len(self.action_history) >= self.max_actions_per_hour:
+        if recent >= self.max_actions_per_hour:
             return SafetyCheck(
                 name="rate_limit",
                 passed=False,
                 risk_level=RiskLevel.HIGH,
-                message=f"Rate limit exceeded: {len(self.action_history)}/{self.max_actions_per_hour} actions in last hour",
+                message=f"Rate limit exceeded: {recent}/{self.max_actions_per_hour} actions in last hour",
                 blocking=True,
             )
         
-        return SafetyCheck(
-            name="rate_limit",
-            passed=True,
-            risk_level=RiskLevel.NONE,
-            message=f"Rate limit OK: {len(self.action_history)}/{self.max_actions_per_hour}",
-        )
+        return _RATE_LIMIT_OK
     
-    def _check_cooldown(self, target_resource: Dict[str, Any]) -> SafetyCheck:
+    def _actions_since(self, cutoff: float) -> int:
+        """Number of recorded actions after `cutoff` (a time.monotonic() value)"""
+        # action_history is in ascending order, so the count is a binary search away
+        return len(self.action_history) - bisect_right(self.action_history, cutoff)
+    
+    def _check_cooldown(self, resource_key: ResourceKey) -> SafetyCheck:
         """Check if target is in cooldown period"""
-        resource_key = f"{target_resource.get('kind')}/{target_resource.get('namespace')}/{target_resource.get('name')}"
-        
-        if resource_key in self.recent_targets:
-            last_action = self.recent_targets[resource_key]
-            elapsed = (datetime.utcnow() - last_action).total_seconds()
+        last_action = self.recent_targets.get(resource_key)
+        if last_action is not None:
+            elapsed = time.monotonic() - last_action
             
             if elapsed < self.cooldown_seconds:
                 remaining = int(self.cooldown_seconds - elapsed)
@@ -235,17 +312,10 @@ class SafetyValidator:
                     blocking=True,
                 )
         
-        return SafetyCheck(
-            name="cooldown",
-            passed=True,
-            risk_level=RiskLevel.NONE,
-            message="No cooldown in effect",
-        )
+        return _COOLDOWN_OK
     
-    def _check_protected_namespace(self, target_resource: Dict[str, Any]) -> SafetyCheck:
+    def _check_protected_namespace(self, namespace: str) -> SafetyCheck:
         """Check if target is in a protected namespace"""
-        namespace = target_resource.get("namespace", "default")
-        
         if namespace in self.protected_namespaces:
             return SafetyCheck(
                 name="protected_namespace",
@@ -255,20 +325,17 @@ class SafetyValidator:
                 blocking=False,  # Allow with approval
             )
         
-        return SafetyCheck(
-            name="protected_namespace",
-            passed=True,
-            risk_level=RiskLevel.NONE,
-            message="Namespace is not protected",
-        )
+        return _NAMESPACE_OK
     
-    def _check_protected_workload(self, target_resource: Dict[str, Any]) -> SafetyCheck:
+    def _check_protected_workload(self, target_resource: Mapping[str, Any]) -> SafetyCheck:
         """Check if target is a protected workload"""
         labels = target_resource.get("labels", {})
         
-        for label_key, protected_values in self.protected_labels.items():
-            label_value = labels.get(label_key, "").lower()
-            if label_value in protected_values:
+        for label_key, label_value in labels.items():
+            if label_key not in self._protected_label_keys:
+                continue
+            label_value = label_value.lower()
+            if (label_key, label_value) in self._protected_label_pairs:
                 return SafetyCheck(
                     name="protected_workload",
                     passed=False,
@@ -277,17 +344,12 @@ class SafetyValidator:
                     blocking=False,  # Allow with approval
                 )
         
-        return SafetyCheck(
-            name="protected_workload",
-            passed=True,
-            risk_level=RiskLevel.NONE,
-            message="Workload is not protected",
-        )
+        return _WORKLOAD_OK
     
     def _check_blast_radius(
         self,
         action: str,
-        target_resource: Dict[str, Any],
+        target_resource: Mapping[str, Any],
         cluster_state: Dict[str, Any],
     ) -> SafetyCheck:
         """Check blast radius of the action"""
@@ -295,15 +357,14 @@ class SafetyValidator:
         total_nodes = cluster_state.get("total_nodes", 3)
         
         affected_pods = 1  # Most actions affect 1 pod
-        affected_nodes = 0
+        node_percent = 0
         
-        if action in ("drain_node", "cordon_node"):
-            affected_nodes = 1
+        if action in _NODE_ACTIONS:
             # Estimate pods on node
             affected_pods = total_pods // total_nodes if total_nodes > 0 else total_pods
+            node_percent = (100 / total_nodes) if total_nodes > 0 else 0
         
         pod_percent = (affected_pods / total_pods * 100) if total_pods > 0 else 0
-        node_percent = (affected_nodes / total_nodes * 100) if total_nodes > 0 else 0
         
         if pod_percent > self.max_pods_affected_percent:
             return SafetyCheck(
@@ -323,10 +384,13 @@ class SafetyValidator:
                 blocking=False,
             )
         
+        if pod_percent <= 5:
+            return _BLAST_RADIUS_OK
+        
         return SafetyCheck(
             name="blast_radius",
             passed=True,
-            risk_level=RiskLevel.LOW if pod_percent > 5 else RiskLevel.NONE,
+            risk_level=RiskLevel.LOW,
             message=f"Blast radius acceptable: ~{pod_percent:.1f}% pods",
         )
     
@@ -362,19 +426,19 @@ class SafetyValidator:
                     blocking=True,
                 )
         
-        return SafetyCheck(
-            name="resource_limits",
-            passed=True,
-            risk_level=RiskLevel.NONE,
-            message="Resource parameters within limits",
-        )
+        return _RESOURCE_LIMITS_OK
     
-    def record_action(self, target_resource: Dict[str, Any]):
+    def record_action(self, target_resource: Mapping[str, Any]):
         """Record an executed action for rate limiting and cooldown"""
-        now = datetime.utcnow()
+        now = time.monotonic()
         self.action_history.append(now)
         
-        resource_key = f"{target_resource.get('kind')}/{target_resource.get('namespace')}/{target_resource.get('name')}"
+        # Drop entries that have left the rate-limit window, oldest first
+        hour_ago = now - _RATE_LIMIT_WINDOW_SECONDS
+        while self.action_history[0] <= hour_ago:
+            self.action_history.popleft()
+        
+        resource_key = _resource_key(target_resource)
         self.recent_targets[resource_key] = now
         
-        logger.info(f"Recorded action on {resource_key}")
+        logger.info("Recorded action on %s/%s/%s", *resource_key)
@@ -1,12 +1,23 @@
 """Tests for Kratos AI core components"""
 
+import asyncio
+import dataclasses
+import hashlib
+import threading
+import numpy as np
+import orjson
 import pytest
-from datetime import datetime
+from collections import deque
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 
-import sys
-sys.path.insert(0, "../src")
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
 
 from core.types import (
+    Explanation,
+    ExplanationStep,
     Incident,
     IncidentType,
     IncidentSeverity,
@@ -18,6 +29,38 @@ from core.types import (
     ResourceMetrics,
 )
 from core.knowledge_base import KnowledgeBase
+from remediation.actions import ActionLibrary
+from remediation.engine import RemediationEngine
+from remediation.safety import SafetyValidator
+import remediation.engine
+from ml.predictors import AnomalyDetector, TimeSeriesForecaster, _RollingWindow
+import core.brain
+import api.kube_cache
+import api.routes
+from api.kube_cache import ApiException, WatchCache
+from api.rate_limit import AsyncRateLimiter
+from api.response_cache import ResponseCache
+import api.rate_limit
+from api.routes import router, MetricsInput, _to_resource_and_metrics
+
+
+@pytest.fixture
+def make_brain(tmp_path, monkeypatch):
+    """Build fresh brains whose knowledge base lives in tmp_path"""
+    monkeypatch.setattr(core.brain, "KnowledgeBase", lambda: KnowledgeBase(storage_path=tmp_path / "knowledge"))
+    return core.brain.KratosBrain
+
+
+@pytest.fixture
+def make_client(make_brain):
+    """Build API clients, each over a fresh brain and serving every request on one event loop"""
+    with ExitStack() as stack:
+        def make():
+            app = FastAPI()
+            app.include_router(router)
+            app.state.brain = make_brain()
+            return stack.enter_context(TestClient(app))
+        yield make
 
 
 class TestIncident:
@@ -47,6 +90,16 @@ class TestIncident:
         assert incident.duration_seconds is not None
 
 
+class TestKubernetesResource:
+    def test_equal_labels_are_not_shared(self):
+        first = KubernetesResource(kind="Pod", name="a", namespace="default", labels={"app": "api"})
+        second = KubernetesResource(kind="Pod", name="b", namespace="default", labels={"app": "api"})
+        
+        first.labels["tier"] = "db"
+        
+        assert second.labels == {"app": "api"}
+
+
 class TestResourceMetrics:
     def test_utilization_calculation(self):
         metrics = ResourceMetrics(
@@ -73,6 +126,35 @@ class TestResourceMetrics:
         
         assert metrics.cpu_utilization == 0.0
         assert metrics.memory_utilization == 0.0
+    
+    def test_snapshot_is_frozen(self):
+        metrics = ResourceMetrics(
+            cpu_usage_cores=0.5,
+            cpu_limit_cores=1.0,
+            cpu_request_cores=0.25,
+            memory_usage_bytes=512 * 1024**2,
+            memory_limit_bytes=1024 * 1024**2,
+            memory_request_bytes=256 * 1024**2,
+        )
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            metrics.cpu_usage_cores = 0.9
+        
+        assert dataclasses.replace(metrics, cpu_usage_cores=0.9).cpu_utilization == pytest.approx(90.0)
+
+
+class TestExplanation:
+    def test_rendering_leaves_steps_untouched(self):
+        steps = [
+            ExplanationStep(step_number=2, category="decision", content="Scale up"),
+            ExplanationStep(step_number=1, category="observation", content="Memory at 95%"),
+        ]
+        explanation = Explanation(summary="Scale memory", steps=list(steps))
+        
+        text = explanation.to_human_readable()
+        
+        assert text.index("1. [OBSERVATION]") < text.index("2. [DECISION]")
+        assert explanation.steps == steps
 
 
 class TestKnowledgeBase:
@@ -141,6 +223,30 @@ class TestKnowledgeBase:
         
         # Should have detected a pattern
         assert len(kb.patterns) > 0
+    
+    def test_legacy_pattern_names_are_migrated(self, tmp_path):
+        storage = tmp_path / "knowledge"
+        kb = KnowledgeBase(storage_path=storage)
+        kb.min_occurrences_for_pattern = 3
+        
+        resource = KubernetesResource(kind="Pod", name="test-pod", namespace="default", labels={"app": "api"})
+        for _ in range(3):
+            kb.record_incident(Incident(type=IncidentType.CRASH_LOOP, resource=resource, message="CrashLoopBackOff"))
+        kb.close()
+        [pattern] = kb.patterns.values()
+        
+        # Name the pattern the way releases before BLAKE2b fingerprints did
+        label_hash = hashlib.md5(b"app=api").hexdigest()[:8]
+        legacy_hash = hashlib.sha256(f"crash_loop:Pod:default:{label_hash}:crashloopbackoff".encode()).hexdigest()[:16]
+        patterns_file = storage / "patterns.json"
+        patterns_file.write_bytes(patterns_file.read_bytes().replace(pattern.name.encode(), f"crash_loop_{legacy_hash}".encode()))
+        
+        reloaded = KnowledgeBase(storage_path=storage)
+        reloaded.min_occurrences_for_pattern = 3
+        reloaded.record_incident(Incident(type=IncidentType.CRASH_LOOP, resource=resource, message="CrashLoopBackOff"))
+        
+        assert [p.name for p in reloaded.patterns.values()] == [pattern.name]
+        assert reloaded.patterns[pattern.id].occurrence_count == 4
 
 
 class TestRemediation:
@@ -166,5 +272,518 @@ class TestRemediation:
         assert remediation.is_successful
 
 
+class TestRemediationEngine:
+    @staticmethod
+    def plan(engine, action, name="api"):
+        resource = KubernetesResource(kind="Deployment", name=name, namespace="default")
+        incident = Incident(type=IncidentType.OOM_KILL, resource=resource, message="OOMKilled")
+        return engine.plan_remediation(incident=incident, suggested_action=action)
+    
+    def test_history_keeps_the_newest_entries(self):
+        engine = RemediationEngine(dry_run=True, config={"history_max": 3})
+        plans = [self.plan(engine, RemediationAction.NOTIFY_ONLY, f"api-{i}") for i in range(5)]
+        
+        executed = [engine.execute(plan) for plan in plans]
+        
+        assert [r.id for r in engine.history] == [r.id for r in executed[2:]]
+        assert set(engine._history_by_id) == {r.id for r in executed[2:]}
+    
+    def test_history_max_below_one_is_rejected(self):
+        with pytest.raises(ValueError):
+            RemediationEngine(config={"history_max": 0})
+    
+    def test_pending_approvals_expire(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(remediation.engine, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        engine = RemediationEngine(dry_run=True, config={"approval_ttl_seconds": 60})
+        stale = self.plan(engine, RemediationAction.DELETE_POD, "api-0")
+        fresh = self.plan(engine, RemediationAction.DELETE_POD, "api-1")
+        
+        engine.execute(stale)
+        clock[0] += 50
+        engine.execute(fresh)
+        clock[0] += 20
+        engine.execute(self.plan(engine, RemediationAction.NOTIFY_ONLY))
+        
+        assert set(engine.pending_approvals) == {fresh.remediation.id}
+        assert engine.execute(fresh, approved_by="oncall").outcome == RemediationOutcome.DRY_RUN
+        assert engine.pending_approvals == {}
+
+
+class TestSafetyValidator:
+    TARGET = {"kind": "Deployment", "name": "api", "namespace": "default", "labels": {}}
+    
+    def test_all_clear_result_is_shared(self):
+        validator = SafetyValidator()
+        
+        first = validator.validate("notify_only", self.TARGET, {})
+        second = validator.validate("restart_pod", self.TARGET, {})
+        
+        assert first is second
+        assert first.checks == ()
+        assert first.get_summary() == "SAFE (5/5 checks passed, risk: none)"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            first.safe = False
+    
+    def test_verbose_and_risky_results_are_not_shared(self):
+        validator = SafetyValidator()
+        
+        verbose = validator.validate("notify_only", self.TARGET, {}, verbose=True)
+        risky = validator.validate("delete_pod", self.TARGET, {})
+        
+        assert len(verbose.checks) == verbose.check_count == 5
+        assert risky.requires_approval
+        assert risky.checks
+        assert risky.check_count == 6
+
+
+class _Gate:
+    """Rate limiter stand-in that holds every caller until opened"""
+    
+    def __init__(self):
+        self.opened = asyncio.Event()
+    
+    async def __aenter__(self):
+        await self.opened.wait()
+    
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestActionLibrary:
+    def scale_concurrently(self, patch):
+        calls = []
+        
+        def patch_namespaced_deployment_scale(**kwargs):
+            calls.append(kwargs["body"]["spec"]["replicas"])
+            patch()
+        
+        async def run():
+            gate = _Gate()
+            library = ActionLibrary(
+                SimpleNamespace(patch_namespaced_deployment_scale=patch_namespaced_deployment_scale),
+                rate_limiter=gate,
+            )
+            pending = [asyncio.ensure_future(library.scale_replicas("default", "api", n)) for n in (2, 3, 5)]
+            await asyncio.sleep(0)
+            gate.opened.set()
+            return await asyncio.gather(*pending)
+        
+        return asyncio.run(run()), calls
+    
+    def test_queued_scales_coalesce_into_the_latest(self):
+        results, calls = self.scale_concurrently(lambda: None)
+        
+        assert calls == [5]
+        assert results == [True, True, True]
+    
+    def test_superseded_scales_report_the_failed_patch(self):
+        def fail():
+            raise RuntimeError("conflict")
+        
+        results, calls = self.scale_concurrently(fail)
+        
+        assert calls == [5]
+        assert results == [False, False, False]
+
+
+class TestPredictAPI:
+    # Fewer points than the forecaster needs for a trend, so results do not depend on timing
+    PAYLOADS = [
+        {
+            "resource_name": f"pod-{i}",
+            "namespace": "default",
+            "cpu_usage_cores": 0.1 * (i + 1),
+            "cpu_limit_cores": 1.0,
+            "memory_usage_bytes": (100 + 90 * i) * 1024**2,
+            "memory_limit_bytes": 1024 * 1024**2,
+        }
+        for i in range(8)
+    ]
+    
+    def test_batch_matches_scalar_predictor(self, make_brain, make_client):
+        brain = make_brain()
+        expected = [
+            brain.predict_for_resource(*_to_resource_and_metrics(MetricsInput(**p)))
+            for p in self.PAYLOADS
+        ]
+        
+        response = make_client().post("/api/v1/kratos/predict/batch", json=self.PAYLOADS)
+        
+        assert response.status_code == 200
+        for item, prediction in zip(response.json(), expected, strict=True):
+            assert item["probability"] == pytest.approx(prediction.probability)
+            assert item["incident_type"] == prediction.incident_type.value
+            assert item["confidence"] == prediction.confidence.value
+            assert item["evidence"] == prediction.evidence
+    
+    def test_batch_matches_single_predictions(self, make_client):
+        single = make_client()
+        expected = [single.post("/api/v1/kratos/predict", json=p).json() for p in self.PAYLOADS]
+        
+        response = make_client().post("/api/v1/kratos/predict/batch", json=self.PAYLOADS)
+        
+        assert response.status_code == 200
+        for item, single_item in zip(response.json(), expected, strict=True):
+            # ETAs come from wall-clock sample spacing
+            item.pop("eta_minutes")
+            single_item.pop("eta_minutes")
+            assert item == single_item
+    
+    def test_empty_batch(self, make_client):
+        response = make_client().post("/api/v1/kratos/predict/batch", json=[])
+        
+        assert response.status_code == 200
+        assert response.json() == []
+
+
+class TestIncidentsAPI:
+    def test_similar_incidents_after_recording(self, make_client):
+        client = make_client()
+        payload = {
+            "type": "oom_kill",
+            "severity": "high",
+            "resource_kind": "Pod",
+            "resource_name": "api-0",
+            "namespace": "default",
+            "message": "OOMKilled",
+        }
+        
+        first = client.post("/api/v1/kratos/incidents", json=payload).json()["incident_id"]
+        second = client.post("/api/v1/kratos/incidents", json=payload).json()["incident_id"]
+        
+        assert client.app.state.brain.similar_incidents[second] == [first]
+        response = client.get(f"/api/v1/kratos/incidents/{second}/similar")
+        assert response.json()["similar_incidents"] == [first]
+    
+    def test_similar_incidents_unknown_id(self, make_client):
+        response = make_client().get("/api/v1/kratos/incidents/missing/similar")
+        
+        assert response.status_code == 404
+
+
+class TestBrainPredict:
+    def test_predict_across_event_loops(self, make_brain):
+        brain = make_brain()
+        resource, metrics = _to_resource_and_metrics(MetricsInput(**{
+            "resource_name": "pod-0",
+            "namespace": "default",
+            "cpu_usage_cores": 0.1,
+            "cpu_limit_cores": 1.0,
+            "memory_usage_bytes": 100 * 1024**2,
+            "memory_limit_bytes": 1024 * 1024**2,
+        }))
+        
+        first = asyncio.run(asyncio.wait_for(brain.predict(resource, metrics), 5))
+        second = asyncio.run(asyncio.wait_for(brain.predict(resource, metrics), 5))
+        
+        assert first.probability == second.probability
+    
+    def test_stop_fails_queued_predictions(self, make_brain):
+        brain = make_brain()
+        resource, metrics = _to_resource_and_metrics(MetricsInput(**{
+            "resource_name": "pod-0",
+            "namespace": "default",
+            "cpu_usage_cores": 0.1,
+            "cpu_limit_cores": 1.0,
+            "memory_usage_bytes": 100 * 1024**2,
+            "memory_limit_bytes": 1024 * 1024**2,
+        }))
+        
+        async def run():
+            pending = asyncio.ensure_future(brain.predict(resource, metrics))
+            await asyncio.sleep(0)
+            await brain.stop()
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(pending, 5)
+        
+        asyncio.run(run())
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point the learning logs at an empty tmp_path/data, which does not exist yet"""
+    data = tmp_path / "data"
+    files = {name: data / path.name for name, path in (
+        ("_INCIDENTS_FILE", api.routes._INCIDENTS_FILE),
+        ("_REMEDIATIONS_FILE", api.routes._REMEDIATIONS_FILE),
+        ("_PATTERNS_FILE", api.routes._PATTERNS_FILE),
+        ("_LEGACY_DATA_FILE", api.routes._LEGACY_DATA_FILE),
+    )}
+    for name, path in files.items():
+        monkeypatch.setattr(api.routes, name, path)
+    logs = (files["_INCIDENTS_FILE"], files["_REMEDIATIONS_FILE"])
+    monkeypatch.setattr(api.routes, "_pending_lines", {path: [] for path in logs})
+    monkeypatch.setattr(api.routes, "_log_line_counts", {path: 0 for path in logs})
+    monkeypatch.setattr(api.routes, "_MAX_LOG_ENTRIES", 2)
+    monkeypatch.setattr(api.routes, "_incidents_log", deque(maxlen=2))
+    monkeypatch.setattr(api.routes, "_remediations_log", deque(maxlen=2))
+    monkeypatch.setattr(api.routes, "_patterns", {})
+    return data
+
+
+class TestLearningLogs:
+    def test_failed_write_keeps_records_pending(self, data_dir):
+        api.routes._record_remediation("restart_pod", "api-0", "default", "success")
+        
+        assert len(api.routes._pending_lines[data_dir / "remediations.jsonl"]) == 1
+        assert api.routes._log_line_counts[data_dir / "remediations.jsonl"] == 0
+        
+        data_dir.mkdir()
+        api.routes._save_data()
+        
+        assert (data_dir / "remediations.jsonl").read_bytes().count(b"\n") == 1
+        assert api.routes._pending_lines[data_dir / "remediations.jsonl"] == []
+        assert api.routes._log_line_counts[data_dir / "remediations.jsonl"] == 1
+    
+    def test_log_is_compacted_past_twice_the_cap(self, data_dir):
+        data_dir.mkdir()
+        for i in range(5):
+            api.routes._record_remediation("restart_pod", f"api-{i}", "default", "success")
+        
+        lines = (data_dir / "remediations.jsonl").read_bytes().splitlines()
+        
+        assert [orjson.loads(line)["target"] for line in lines] == ["api-3", "api-4"]
+        assert api.routes._log_line_counts[data_dir / "remediations.jsonl"] == 2
+    
+    def test_legacy_data_json_is_migrated(self, data_dir):
+        data_dir.mkdir()
+        incident = {"type": "oom_kill", "target": "api-0", "namespace": "default"}
+        (data_dir / "data.json").write_bytes(orjson.dumps({
+            "incidents": [incident],
+            "remediations": [],
+            "patterns": {"oom_kill:default": {"count": 1, "last_seen": None, "targets": ["api-0"]}},
+        }))
+        
+        api.routes._load_data()
+        
+        assert list(api.routes._incidents_log) == [incident]
+        assert api.routes._patterns["oom_kill:default"]["targets"] == {"api-0"}
+        assert orjson.loads((data_dir / "incidents.jsonl").read_bytes()) == incident
+        assert (data_dir / "patterns.json").exists()
+        assert api.routes._pending_lines[data_dir / "incidents.jsonl"] == []
+
+
+
+class TestBrainCallbacks:
+    def test_sync_callbacks_run_on_the_loop(self, make_brain):
+        brain = make_brain()
+        seen = []
+        
+        async def hook(arg):
+            seen.append(("async", arg))
+        
+        brain.on_incident = [lambda arg: seen.append(("sync", threading.get_ident())), hook]
+        asyncio.run(brain._dispatch(brain.on_incident, "incident"))
+        
+        assert seen == [("sync", threading.get_ident()), ("async", "incident")]
+
+
+class _FakeListResponse:
+    def __init__(self, data):
+        self.data = orjson.dumps(data)
+
+
+class _FakeWatch:
+    """Stands in for kubernetes.watch.Watch; each stream() call plays the next scripted step"""
+    
+    def __init__(self, steps):
+        self.steps = steps
+    
+    def __call__(self):
+        return self
+    
+    def stream(self, list_fn, **kwargs):
+        step = self.steps.pop(0) if self.steps else []
+        if isinstance(step, Exception):
+            raise step
+        yield from step
+
+
+class TestWatchCache:
+    def make_cache(self, monkeypatch, steps, retry_delay_seconds=60.0):
+        lists = []
+        
+        def list_fn(**kwargs):
+            lists.append(kwargs)
+            if not steps:
+                cache.stop()
+            pod = {"metadata": {"namespace": "default", "name": f"pod-{len(lists)}", "resourceVersion": "1"}}
+            return _FakeListResponse({"items": [pod], "metadata": {"resourceVersion": str(len(lists))}})
+        
+        monkeypatch.setattr(api.kube_cache, "watch", SimpleNamespace(Watch=_FakeWatch(steps)))
+        cache = WatchCache("pods", list_fn, retry_delay_seconds=retry_delay_seconds)
+        return cache, lists
+    
+    def test_relists_on_expired_watch(self, monkeypatch):
+        cache, lists = self.make_cache(monkeypatch, [ApiException(status=410)])
+        
+        cache._run()
+        
+        assert len(lists) == 2
+        assert [pod["metadata"]["name"] for pod in cache.snapshot()] == ["pod-2"]
+    
+    def test_relists_on_error_event(self, monkeypatch):
+        cache, lists = self.make_cache(monkeypatch, [[{"type": "ERROR", "object": {"code": 410, "message": "Gone"}}]])
+        
+        cache._run()
+        
+        assert len(lists) == 2
+    
+    def test_relists_on_unexpected_error(self, monkeypatch):
+        cache, lists = self.make_cache(monkeypatch, [KeyError("raw_object")], retry_delay_seconds=0)
+        
+        cache._run()
+        
+        assert len(lists) == 2
+
+
+class TestResponseCache:
+    def test_concurrent_misses_share_one_fetch(self):
+        cache = ResponseCache(ttl_seconds=60)
+        fetches = []
+        
+        async def fetch():
+            fetches.append(1)
+            await asyncio.sleep(0.01)
+            return {"count": len(fetches)}
+        
+        async def run():
+            results = await asyncio.gather(*(cache.get_or_fetch("pods", fetch) for _ in range(5)))
+            return results, await cache.get_or_fetch("pods", fetch)
+        
+        results, cached = asyncio.run(run())
+        
+        assert fetches == [1]
+        assert results == [{"count": 1}] * 5
+        assert cached == {"count": 1}
+    
+    def test_failures_are_not_cached(self):
+        cache = ResponseCache(ttl_seconds=60)
+        calls = []
+        
+        async def fetch():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("apiserver unavailable")
+            return "ok"
+        
+        async def run():
+            with pytest.raises(RuntimeError):
+                await cache.get_or_fetch("pods", fetch)
+            return await cache.get_or_fetch("pods", fetch)
+        
+        assert asyncio.run(run()) == "ok"
+        assert len(calls) == 2
+
+
+class TestAsyncRateLimiter:
+    def test_bursts_then_throttles_to_rate(self, monkeypatch):
+        clock = [0.0]
+        
+        async def fake_sleep(seconds):
+            clock[0] += seconds
+        
+        monkeypatch.setattr(api.rate_limit, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+        monkeypatch.setattr(api.rate_limit, "asyncio", SimpleNamespace(sleep=fake_sleep))
+        limiter = AsyncRateLimiter(rate=10, burst=3)
+        
+        async def run():
+            times = []
+            for _ in range(5):
+                async with limiter:
+                    times.append(clock[0])
+            return times
+        
+        assert asyncio.run(run()) == pytest.approx([0.0, 0.0, 0.0, 0.1, 0.2])
+
+
+class TestRollingWindow:
+    def test_matches_numpy_over_the_window(self):
+        rng = np.random.default_rng(0)
+        values = np.concatenate((rng.normal(1e6, 5, 250), [1e9], rng.normal(1e6, 5, 120)))
+        window = _RollingWindow(50)
+        
+        for i, value in enumerate(values, 1):
+            window.push(float(value))
+            expected = values[max(0, i - 50):i]
+            assert window.mean() == pytest.approx(expected.mean())
+            assert window.std() == pytest.approx(expected.std(), rel=1e-6, abs=1e-6)
+            assert (window.min, window.max) == (expected.min(), expected.max())
+    
+    def test_extend_matches_pushes(self):
+        values = np.arange(130, dtype=np.float64) ** 1.5
+        pushed, extended = _RollingWindow(50), _RollingWindow(50)
+        for value in values:
+            pushed.push(float(value))
+        for chunk in (values[:7], values[7:90], values[90:]):
+            extended.extend(chunk)
+        
+        assert np.array_equal(extended.ordered_values(), pushed.ordered_values())
+        assert extended.mean() == pytest.approx(pushed.mean())
+        assert extended.std() == pytest.approx(pushed.std())
+
+
+class TestTimeSeriesForecaster:
+    def test_holt_weights_match_the_recurrence(self):
+        forecaster = TimeSeriesForecaster()
+        start = datetime(2024, 1, 1)
+        values = [100 + 3 * i + (i % 4) for i in range(40)]
+        forecaster.train([
+            {"timestamp": start + timedelta(minutes=i), "memory_usage_bytes": value}
+            for i, value in enumerate(values)
+        ])
+        
+        level, trend = values[0], (values[-1] - values[0]) / len(values)
+        for value in values:
+            prev_level = level
+            level = forecaster.alpha * value + (1 - forecaster.alpha) * (level + trend)
+            trend = forecaster.beta * (level - prev_level) + (1 - forecaster.beta) * trend
+        
+        series = forecaster.series["memory_usage_bytes"]
+        assert forecaster._holt_forecast(series, series.ordered_values(), 1800) == pytest.approx(
+            (level, trend, level + trend * 30)
+        )
+
+
+class TestAnomalyDetector:
+    def test_batch_matches_row_by_row(self):
+        rng = np.random.default_rng(1)
+        rows = [
+            {"cpu_usage_cores": float(rng.normal(0.5, 0.05)), "memory_usage_bytes": float(rng.normal(5e8, 1e6))}
+            for _ in range(150)
+        ]
+        rows[120]["cpu_usage_cores"] = 5.0
+        single, batched = AnomalyDetector(), AnomalyDetector()
+        
+        expected = [single.predict(row) for row in rows]
+        results = batched.predict_batch(rows[:60]) + batched.predict_batch(rows[60:])
+        
+        for result, single_result in zip(results, expected, strict=True):
+            assert result.predicted == single_result.predicted
+            assert result.probability == pytest.approx(single_result.probability)
+            assert len(result.evidence) == len(single_result.evidence)
+        assert expected[120].predicted
+
+
+class TestDataFlusher:
+    def test_flushes_in_each_lifespan(self, monkeypatch):
+        writes = []
+        monkeypatch.setattr(api.routes, "_write_data", writes.append)
+        monkeypatch.setattr(api.routes, "_SAVE_DEBOUNCE_SECONDS", 0)
+        
+        async def lifespan():
+            api.routes.start_data_flusher()
+            try:
+                api.routes._mark_dirty()
+                await asyncio.sleep(0.05)
+                return len(writes)
+            finally:
+                await api.routes.stop_data_flusher()
+        
+        assert asyncio.run(lifespan()) == 1
+        assert asyncio.run(lifespan()) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])